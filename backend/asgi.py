@@ -0,0 +1,83 @@
+# backend/asgi.py
+"""
+ASGI entry point for the backend (Starlette), served by uvicorn workers.
+
+One event loop per worker accepts and holds every connection (including idle
+keep-alive ones and slow clients), and playlist requests are built on that
+loop by career_playlist_async: every provider lookup is a task awaiting the
+shared async HTTP client, so a worker waits on hundreds of upstream calls at
+once instead of one per thread. The remaining routes (stats, batch, ...) run
+the sync career_playlist on a bounded thread pool (ASGI_THREADS, default 64).
+
+    uvicorn asgi:app --port 8080 --workers 2
+    SERVER_WORKER_CLASS=asgi gunicorn -c gunicorn.conf.py
+"""
+import asyncio
+import contextlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from async_http_client import close_client
+from main import career_playlist_async, server_warm_up, shutdown
+
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", "64"))
+
+
+class PlaylistRequest:
+    """The parts of a Flask request that career_playlist reads."""
+
+    def __init__(self, request: Request, body: bytes):
+        self.method = request.method
+        self.path = request.url.path
+        self.args = request.query_params
+        self.headers = request.headers
+        self._body = body
+
+    def get_json(self, silent: bool = False):
+        try:
+            return json.loads(self._body) if self._body else None
+        except ValueError:
+            if silent:
+                return None
+            raise
+
+
+async def handle_request(request: Request) -> Response:
+    """Run career_playlist_async and send its (body, status, headers)."""
+    body = await request.body()
+    content, status, headers = await career_playlist_async(PlaylistRequest(request, body))
+    if isinstance(content, (str, bytes)):
+        return Response(content, status_code=status, headers=headers)
+    if not hasattr(content, "__aiter__"):
+        content = iterate_in_threadpool(content)
+    return StreamingResponse(content, status_code=status, headers=headers)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # asyncio.to_thread() (sync routes, Vertex generation) runs on this pool
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(ASGI_THREADS, thread_name_prefix="asgi"))
+    await run_in_threadpool(server_warm_up)
+    yield
+    await close_client()
+    await run_in_threadpool(shutdown)
+
+
+app = Starlette(
+    routes=[
+        Route("/", handle_request, methods=["GET", "POST", "OPTIONS"]),
+        Route("/batch", handle_request, methods=["POST", "OPTIONS"]),
+        Route("/stats", handle_request, methods=["GET"]),
+        Route("/ready", handle_request, methods=["GET"]),
+        Route("/breakers", handle_request, methods=["GET"]),
+        Route("/metrics", handle_request, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,127 @@
+# backend/async_http_client.py
+"""
+Shared async HTTP client for provider calls made from an event loop.
+
+The async counterpart of http_client.py: one httpx.AsyncClient per event loop
+keeps connections to googleapis.com alive across skills and requests, sized by
+the same HTTP_POOL_MAXSIZE setting, and retries connect errors and 429/5xx
+answers within the same call budget as http_get (HTTP_MAX_RETRIES,
+HTTP_BACKOFF_FACTOR, HTTP_CALL_BUDGET_SECONDS).
+Hundreds of lookups can be in flight on one loop without a thread each.
+
+httpx timeouts and transport errors are re-raised as the requests exceptions
+the provider code already handles, so both paths fall back the same way.
+httpx is imported on first use; without it installed, async_http_get runs the
+pooled sync http_get on a worker thread instead.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+
+import requests
+
+from http_client import DEFAULT_TIMEOUT, RETRY_STATUSES, http_get, retry_delay, retry_policy
+
+_client = None
+_client_loop = None
+_lock = threading.Lock()
+_requests = 0
+_retries = 0
+
+
+def async_client_available() -> bool:
+    """True if httpx is installed (without importing it)."""
+    return importlib.util.find_spec("httpx") is not None
+
+
+AVAILABLE = async_client_available()
+
+
+def build_client():
+    """Create an AsyncClient configured from the same variables as the sync session."""
+    import httpx
+    maxsize = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", str(maxsize * 10))),
+        max_keepalive_connections=maxsize * 5,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    return httpx.AsyncClient(transport=transport, timeout=DEFAULT_TIMEOUT)
+
+
+def get_client():
+    """Return the client for the running event loop, building it on first use.
+    A client is bound to the loop it was created on, so a new loop gets a new one.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if _client is None or _client_loop is not loop:
+            _client, _client_loop = build_client(), loop
+        return _client
+
+
+async def async_http_get(url: str, params=None, timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared async pool, retrying connect errors and 429/5xx within the call budget."""
+    global _requests, _retries
+    if not AVAILABLE:
+        return await asyncio.to_thread(http_get, url, params=params, timeout=timeout)
+
+    import httpx
+    client = get_client()
+    retries, backoff, budget = retry_policy()
+    deadline = time.monotonic() + budget
+    attempt = 0
+    while True:
+        _requests += 1
+        remaining = deadline - time.monotonic()
+        try:
+            response = await client.get(url, params=params, timeout=min(timeout, remaining))
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            # Nothing was sent yet, so these are retried like 5xx answers
+            delay = retry_delay(attempt, retries, backoff, deadline)
+            if delay is None:
+                error = requests.exceptions.ConnectTimeout if isinstance(e, httpx.TimeoutException) \
+                    else requests.exceptions.ConnectionError
+                raise error(str(e) or "Connection failed") from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e) or "Request timeout") from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e) or "Connection failed") from e
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            delay = retry_delay(attempt, retries, backoff, deadline, response.headers.get("Retry-After", ""))
+            if delay is None:
+                return response
+        attempt += 1
+        _retries += 1
+        await asyncio.sleep(delay)
+
+
+def _forget_client():
+    """In a forked child: the parent's client (and its loop) can't be used here."""
+    global _client, _client_loop, _lock
+    _client, _client_loop, _lock = None, None, threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_client)
+
+
+async def close_client():
+    """Close the pooled connections of the current loop's client."""
+    global _client, _client_loop
+    with _lock:
+        client, _client, _client_loop = _client, None, None
+    if client is not None:
+        await client.aclose()
+
+
+def async_pool_stats() -> dict:
+    return {
+        "available": AVAILABLE,
+        "requests": _requests,
+        "retries": _retries,
+    }
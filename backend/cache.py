@@ -0,0 +1,272 @@
+# backend/cache.py
+"""
+Tiered cache for provider lookups.
+
+The memory tier is a thread-safe LRU with per-entry TTLs. The optional disk
+tier is a small SQLite table so a restarted instance comes back warm. Values
+must be JSON-serialisable (they are stored as JSON on disk).
+
+With `stale_ttl`, expired entries are kept that much longer: get() no longer
+returns them, but get_entry() does (with a negative remaining TTL), so callers
+can serve a stale value while they refresh it.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from structured_logging import get_logger
+
+LOG = get_logger("cache")
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after their TTL."""
+
+    def __init__(self, max_entries: int = 1024, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        entry = self.get_entry(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key, allow_stale: bool = True):
+        """Return (value, remaining_ttl), or None if missing or past the stale window.
+        A remaining_ttl <= 0 means the value is stale.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            remaining = expires_at - time.time()
+            if remaining <= -self.stale_ttl:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if remaining <= 0 and not allow_stale:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            if remaining > 0:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return value, remaining
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SQLiteCache:
+    """On-disk cache tier backed by a single SQLite file.
+
+    Several namespaces (one per provider) can share the same file. Each
+    namespace is bounded to `max_entries`; the least recently written rows are
+    pruned first.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 50000, stale_ttl: float = 0):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " written_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key, allow_stale: bool = False):
+        """Return (value, remaining_ttl) or None if missing or expired.
+        With allow_stale, entries within the stale window are returned too.
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            LOG.warning("Cache disk tier error: %s", e)
+            return None
+        if row is None or row[1] <= now - (self.stale_ttl if allow_stale else 0):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), row[1] - now
+
+    def set(self, key, value, ttl: float):
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, written_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value), now + ttl, now),
+                )
+                self._prune()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.errors += 1
+            LOG.warning("Cache disk tier error: %s", e)
+
+    def _prune(self):
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ?"
+                " ORDER BY expires_at <= ? DESC, written_at ASC LIMIT ?)",
+                (self.namespace, self.namespace, time.time() - self.stale_ttl, count - self.max_entries),
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "errors": self.errors,
+        }
+
+
+class TieredCache:
+    """Memory tier in front of an optional disk tier, with one default TTL."""
+
+    def __init__(self, ttl: float, memory: TTLCache, disk: SQLiteCache = None):
+        self.ttl = ttl
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            found = self.disk.get(key)
+            if found is not None:
+                value, remaining = found
+                self.memory.set(key, value, remaining)
+                return value
+        return None
+
+    def get_entry(self, key):
+        """Return (value, remaining_ttl) including stale entries, or None."""
+        entry = self.memory.get_entry(key)
+        if entry is not None and entry[1] > 0:
+            return entry
+        if self.disk is not None:
+            # Another instance may have refreshed it since
+            found = self.disk.get(key, allow_stale=True)
+            if found is not None and (entry is None or found[1] > entry[1]):
+                self.memory.set(key, *found)
+                return found
+        return entry
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        disk = self.disk.stats() if self.disk is not None else None
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + (disk["hits"] if disk else 0)
+        return {
+            "ttl": self.ttl,
+            # Totals across tiers: a memory miss answered from disk is a hit, a miss is one in every tier
+            "hits": hits,
+            "stale_hits": memory["stale_hits"],
+            "misses": disk["misses"] if disk else memory["misses"],
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "memory": memory,
+            "disk": disk,
+        }
+
+
+def normalize_skill(skill: str) -> str:
+    """Case- and whitespace-insensitive form of a skill name used in cache keys."""
+    return " ".join(skill.casefold().split())
@@ -0,0 +1,192 @@
+# backend/career_index.py
+"""
+Precompiled career resolution index.
+
+Built once from the career table and alias table, then answers "which known
+career did the user mean?" without scanning the table:
+
+1. exact map        - normalized career name
+2. alias map        - alias -> career (alias targets are resolved at build time)
+3. contained career - Aho-Corasick automaton over career names finds every
+                      known career inside the input ("senior data scientist")
+4. partial input    - trie of every word-aligned suffix of every career name
+                      matches inputs that are part of a career ("data sci");
+                      inputs shorter than MIN_PARTIAL_LENGTH are too vague
+5. token index      - inverted index; every input word must appear in the
+                      career, in any order ("engineer machine learning")
+
+Ties are broken by fixed rules (see the step helpers), with table order only as
+the last resort, so the result never depends on which key happens to come first.
+Results are memoised, so repeat lookups are a single dict hit.
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Shortest input matched as part of a career name ("dev" is, "a" or "e" are not)
+MIN_PARTIAL_LENGTH = 3
+
+
+def normalize_career(text: str) -> str:
+    """Case-folded input with runs of whitespace collapsed to one space."""
+    return " ".join(text.casefold().split())
+
+
+def token_starts(name: str) -> List[int]:
+    """Indexes where a word (run of letters/digits) starts in `name`."""
+    return [i for i, ch in enumerate(name) if ch.isalnum() and (i == 0 or not name[i - 1].isalnum())]
+
+
+def tokens(name: str) -> List[str]:
+    return "".join(ch if ch.isalnum() else " " for ch in name).split()
+
+
+class CareerIndex:
+    """Deterministic career resolution over a fixed career/alias table."""
+
+    def __init__(self, careers: Iterable[str], aliases: Dict[str, str] = None, memo_size: int = 4096):
+        self.careers = [normalize_career(c) for c in careers]
+        self.exact = {name: name for name in self.careers}
+        self._order = {name: i for i, name in enumerate(self.careers)}
+
+        self._build_automaton()
+        self._build_suffix_trie()
+        self._build_token_index()
+
+        # Alias targets may themselves need resolving ("dev" -> "developer" -> "web developer")
+        self.aliases = {}
+        for alias, target in (aliases or {}).items():
+            resolved = self._resolve_name(normalize_career(target))
+            if resolved is not None:
+                self.aliases[normalize_career(alias)] = resolved
+
+        self.resolve = lru_cache(maxsize=memo_size)(self._resolve)
+
+    def __len__(self):
+        return len(self.careers)
+
+    # -- build ---------------------------------------------------------------
+
+    def _build_automaton(self):
+        """Aho-Corasick goto/fail/output tables over the career names."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for name in self.careers:
+            node = 0
+            for ch in name:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(name)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _build_suffix_trie(self):
+        """Trie of word-aligned suffixes; every node keeps its best-ranked career.
+
+        Rank: a match at the start of the career name wins, then the shortest
+        career name (fewest unmatched characters), then table order.
+        """
+        self._trie = [{}]
+        self._trie_best = [None]
+        for name in self.careers:
+            for start in token_starts(name):
+                rank = (start != 0, len(name), self._order[name])
+                node = 0
+                for ch in name[start:]:
+                    nxt = self._trie[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self._trie)
+                        self._trie[node][ch] = nxt
+                        self._trie.append({})
+                        self._trie_best.append(None)
+                    node = nxt
+                    best = self._trie_best[node]
+                    if best is None or rank < best[0]:
+                        self._trie_best[node] = (rank, name)
+
+    def _build_token_index(self):
+        self._token_index = {}
+        self._token_counts = {}
+        for name in self.careers:
+            words = set(tokens(name))
+            self._token_counts[name] = len(words)
+            for word in words:
+                self._token_index.setdefault(word, set()).add(name)
+
+    # -- lookup --------------------------------------------------------------
+
+    def _contained_career(self, text: str) -> Optional[str]:
+        """Longest known career appearing as whole words inside `text`."""
+        best = None
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for name in self._out[node]:
+                start = end - len(name)
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                rank = (-len(name), self._order[name])
+                if best is None or rank < best[0]:
+                    best = (rank, name)
+        return best[1] if best else None
+
+    def _partial_career(self, text: str) -> Optional[str]:
+        """Best career that contains `text` starting at a word boundary."""
+        if len(text) < MIN_PARTIAL_LENGTH:
+            return None
+        node = 0
+        for ch in text:
+            node = self._trie[node].get(ch)
+            if node is None:
+                return None
+        best = self._trie_best[node]
+        return best[1] if best else None
+
+    def _token_career(self, text: str) -> Optional[str]:
+        """Career containing every word of `text`, preferring the fewest extra words."""
+        words = set(tokens(text))
+        if not words:
+            return None
+        matches = None
+        for word in words:
+            names = self._token_index.get(word)
+            if not names:
+                return None
+            matches = names if matches is None else matches & names
+            if not matches:
+                return None
+        return min(matches, key=lambda name: (self._token_counts[name], self._order[name]))
+
+    def _resolve_name(self, text: str) -> Optional[str]:
+        if not text:
+            return None
+        if text in self.exact:
+            return text
+        return self._contained_career(text) or self._partial_career(text) or self._token_career(text)
+
+    def _resolve(self, career: str) -> Optional[str]:
+        text = normalize_career(career)
+        alias = self.aliases.get(text)
+        if alias is not None:
+            return alias
+        return self._resolve_name(text)
@@ -0,0 +1,130 @@
+# backend/circuit_breaker.py
+"""
+Circuit breakers for the upstream providers.
+
+closed    - calls go through; the outcome of the last `window` calls is kept
+open      - tripped because too many recent calls failed or were slow; calls are
+            refused immediately so callers go straight to the fallback links
+half_open - after `open_seconds`, a single probe call is let through; success
+            closes the breaker, failure (or a slow probe) opens it again
+"""
+import threading
+import time
+from collections import deque
+
+from structured_logging import get_logger
+
+LOG = get_logger("circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate and latency based breaker for one provider."""
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 4.0, slow_call_rate: float = 0.8, open_seconds: float = 30.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # (failed, slow) per call
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.trips = 0
+        self.short_circuited = 0
+        self.last_trip_reason = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """May a call go upstream now? In half-open state only one probe is allowed."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def cancel(self):
+        """An allowed call was not made or never finished (refused by the quota budget, cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self, seconds: float):
+        self._record(False, seconds)
+
+    def record_failure(self, seconds: float):
+        self._record(True, seconds)
+
+    def _record(self, failed: bool, seconds: float):
+        slow = seconds >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    self._trip("probe failed" if failed else f"probe took {seconds:.1f}s")
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    LOG.info("Circuit breaker: %s recovered - closing", self.name, provider=self.name)
+                return
+            if self._state == OPEN:
+                return
+
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f) / len(self._outcomes)
+            slow_calls = sum(1 for _, s in self._outcomes if s) / len(self._outcomes)
+            if failures >= self.failure_rate:
+                self._trip(f"{failures:.0%} of recent calls failed")
+            elif slow_calls >= self.slow_call_rate:
+                self._trip(f"{slow_calls:.0%} of recent calls slower than {self.slow_call_seconds}s")
+
+    def _trip(self, reason: str):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._probe_in_flight = False
+        self._outcomes.clear()
+        self.trips += 1
+        self.last_trip_reason = reason
+        LOG.warning("Circuit breaker: %s opened (%s) - using fallback links for %ss", self.name, reason, self.open_seconds,
+                    provider=self.name)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            outcomes = list(self._outcomes)
+            return {
+                "state": self._state,
+                "recent_calls": len(outcomes),
+                "recent_failures": sum(1 for f, _ in outcomes if f),
+                "recent_slow_calls": sum(1 for _, s in outcomes if s),
+                "open_for_seconds": round(max(self.open_seconds - (self.clock() - self._opened_at), 0), 1)
+                if self._state == OPEN else 0,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+                "last_trip_reason": self.last_trip_reason,
+            }
@@ -0,0 +1,187 @@
+# backend/fuzzy_match.py
+"""
+Typo-tolerant career matching.
+
+Used after the exact/alias/substring index (career_index.py) gives up, so
+inputs like "data scienist" or "machne learning engr" are answered locally
+instead of falling through to Vertex.
+
+Each input word is corrected against the vocabulary of career/alias words with
+a SymSpell-style deletion dictionary (edit distance 1 for short words, 2 for
+longer ones), plus prefix ("dev" -> "developer") and abbreviation
+("engr" -> "engineer") matches. Candidate careers come from intersecting the
+inverted-index postings of the corrected words, so the work per lookup depends
+on how many careers share those words, not on the size of the table. Each
+candidate gets a confidence in [0, 1]; below the threshold nothing is returned.
+"""
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from career_index import normalize_career, tokens
+
+# Similarity credited to a word matched by prefix or by abbreviation
+PREFIX_SIMILARITY = 0.9
+ABBREVIATION_SIMILARITY = 0.8
+# Penalty weight for career words the input did not mention
+EXTRA_WORD_WEIGHT = 0.5
+# Upper bound on candidates scored per lookup (keeps the worst case bounded)
+MAX_CANDIDATES = 2000
+
+
+def max_edit_distance(word: str) -> int:
+    return 1 if len(word) <= 5 else 2
+
+
+def deletes(word: str, distance: int) -> set:
+    """Every string obtainable by deleting up to `distance` characters from `word`."""
+    result = {word}
+    for n in range(1, min(distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), n):
+            result.add("".join(ch for i, ch in enumerate(word) if i not in positions))
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def is_abbreviation(short: str, word: str) -> bool:
+    """True if `short` keeps the first letter of `word` and the rest in order ("engr")."""
+    if len(short) < 3 or len(short) >= len(word) or short[0] != word[0]:
+        return False
+    it = iter(word[1:])
+    return all(ch in it for ch in short[1:])
+
+
+class FuzzyCareerMatcher:
+    """Approximate career lookup with a confidence score."""
+
+    def __init__(self, careers: Iterable[str], aliases: Dict[str, str] = None,
+                 resolve=None, threshold: float = 0.75, memo_size: int = 4096):
+        """`resolve` maps alias targets to careers (e.g. CareerIndex.resolve)."""
+        self.threshold = threshold
+        self.entries = []       # (words, career) for every career name and alias
+        for career in careers:
+            name = normalize_career(career)
+            self.entries.append((tokens(name), name))
+        for alias, target in (aliases or {}).items():
+            career = resolve(target) if resolve else normalize_career(target)
+            if career:
+                self.entries.append((tokens(normalize_career(alias)), career))
+
+        self.postings = {}      # word -> set of entry ids
+        for entry_id, (words, _) in enumerate(self.entries):
+            for word in words:
+                self.postings.setdefault(word, set()).add(entry_id)
+
+        self.deletes = {}       # deletion variant -> vocabulary words
+        self.prefixes = {}      # 2..8 character prefix -> vocabulary words
+        for word in self.postings:
+            for variant in deletes(word, max_edit_distance(word)):
+                self.deletes.setdefault(variant, set()).add(word)
+            for n in range(2, min(len(word), 8) + 1):
+                self.prefixes.setdefault(word[:n], set()).add(word)
+
+        self.match = lru_cache(maxsize=memo_size)(self._match)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def word_candidates(self, token: str) -> Dict[str, float]:
+        """Vocabulary words `token` may stand for, with a similarity in (0, 1]."""
+        if token in self.postings:
+            return {token: 1.0}
+
+        found = {}
+        limit = max_edit_distance(token)
+        for variant in deletes(token, limit):
+            for word in self.deletes.get(variant, ()):
+                if word in found:
+                    continue
+                distance = edit_distance(token, word, limit)
+                if distance <= limit:
+                    found[word] = 1.0 - distance / max(len(token), len(word))
+        if found:
+            return found
+
+        if len(token) >= 3:
+            for word in self.prefixes.get(token[:8], ()):
+                if word.startswith(token):
+                    found[word] = PREFIX_SIMILARITY
+            if not found:
+                for word in self.prefixes.get(token[:2], ()):
+                    if is_abbreviation(token, word):
+                        found[word] = ABBREVIATION_SIMILARITY
+        return found
+
+    def _score(self, entry_id: int, matches: List[Dict[str, float]]) -> float:
+        words = self.entries[entry_id][0]
+        total = 0.0
+        used = set()
+        for options in matches:
+            best, best_word = 0.0, None
+            for word in words:
+                similarity = options.get(word, 0.0)
+                if similarity > best and word not in used:
+                    best, best_word = similarity, word
+            if best_word is not None:
+                used.add(best_word)
+            total += best
+        extra = len(words) - len(used)
+        return total / (len(matches) + EXTRA_WORD_WEIGHT * extra)
+
+    def _match(self, text: str) -> Optional[Tuple[str, float]]:
+        """Best (career, confidence) for `text`, or None if nothing clears the threshold."""
+        words = tokens(normalize_career(text))
+        if not words:
+            return None
+        matches = [self.word_candidates(word) for word in words]
+
+        # Posting sets per input word, smallest first; unmatched words don't constrain
+        groups = []
+        for options in matches:
+            if len(options) == 1:
+                groups.append(self.postings[next(iter(options))])
+            elif options:
+                groups.append(set().union(*(self.postings[word] for word in options)))
+        if not groups:
+            return None
+        groups.sort(key=len)
+
+        candidates = groups[0]
+        for ids in groups[1:]:
+            narrowed = candidates & ids
+            if narrowed:
+                candidates = narrowed
+        if len(candidates) > MAX_CANDIDATES:
+            candidates = sorted(candidates)[:MAX_CANDIDATES]
+
+        best = None
+        for entry_id in candidates:
+            score = self._score(entry_id, matches)
+            if best is None or score > best[0] or (score == best[0] and entry_id < best[1]):
+                best = (score, entry_id)
+
+        score, entry_id = best
+        if score < self.threshold:
+            return None
+        return self.entries[entry_id][1], round(score, 3)
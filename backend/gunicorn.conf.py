@@ -0,0 +1,60 @@
+# backend/gunicorn.conf.py
+"""
+Production serving settings for backend/server.py (gunicorn).
+
+    gunicorn -c gunicorn.conf.py                              # ASGI: asgi:app on uvicorn workers
+    SERVER_WORKER_CLASS=gthread gunicorn -c gunicorn.conf.py  # WSGI: server:app on gthread workers
+
+Everything is configured from the environment:
+
+PORT                 - listen port (default 8080)
+WEB_CONCURRENCY      - worker processes (default: 2 per CPU, at most 8)
+SERVER_THREADS       - threads per gthread worker (default 16); ASGI workers
+                       use ASGI_THREADS for their blocking-call pool instead
+SERVER_WORKER_CLASS  - "asgi" (default) or "gthread"
+KEEP_ALIVE           - seconds an idle keep-alive connection is held (default 75,
+                       longer than the 60s idle timeout of Google's load balancers)
+GRACEFUL_TIMEOUT     - seconds in-flight requests get to finish on SIGTERM (default 30)
+REQUEST_TIMEOUT      - seconds before a silent worker is killed and replaced (default 60)
+MAX_REQUESTS         - recycle a worker after this many requests, 0 = never (default 0)
+
+The app is not preloaded: the fan-out pool threads and pooled HTTPS sockets
+must not be shared across fork(), so each worker imports main.py itself and
+runs the warm-up before it accepts requests.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(2 * multiprocessing.cpu_count(), 8))))
+threads = int(os.getenv("SERVER_THREADS", "16"))
+keepalive = int(os.getenv("KEEP_ALIVE", "75"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("REQUEST_TIMEOUT", "60"))
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+if os.getenv("SERVER_WORKER_CLASS", "asgi").lower() == "asgi":
+    wsgi_app = "asgi:app"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "server:app"
+    worker_class = "gthread"
+
+preload_app = False
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+
+
+def post_worker_init(worker):
+    """Warm each worker up before it is handed connections."""
+    if worker_class == "gthread":
+        from main import server_warm_up
+        server_warm_up()
+
+
+def worker_exit(server, worker):
+    """Stop background refreshes and close pooled upstream connections."""
+    if worker_class == "gthread":
+        from main import shutdown
+        shutdown()
@@ -0,0 +1,223 @@
+# backend/http_client.py
+"""
+Shared HTTP client for all outbound provider calls.
+
+One long-lived requests.Session is used for YouTube, Google Books and the
+Knowledge Graph so TCP+TLS connections to googleapis.com are kept alive and
+reused across skills and across requests. Pool sizes and the retry policy are
+configured from the environment the first time the session is built. At most
+HTTP_POOL_MAXSIZE calls per host are in flight at once; further calls wait for a
+free connection within their time budget instead of opening extra sockets.
+
+Retries of connect errors and 429/5xx answers happen in http_get, inside a
+time budget for the whole call (HTTP_CALL_BUDGET_SECONDS): each attempt's
+timeout is cut to the time left and no retry starts once it is spent, so one
+provider call can't hold a fan-out thread past the playlist deadline.
+
+requests/urllib3 only speak HTTP/1.1, so keep-alive pooling is what saves the
+handshakes here; HTTP/2 would need a different client library.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 8
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+# Host -> semaphore of its HTTP_POOL_MAXSIZE connections, so a call can wait for one with a timeout
+_host_slots = {}
+
+
+def pool_maxsize() -> int:
+    return int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+
+
+def build_session() -> requests.Session:
+    """Create a pooled session configured from environment variables.
+
+    HTTP_POOL_CONNECTIONS - number of per-host pools kept (default 10)
+    HTTP_POOL_MAXSIZE     - max connections per host (default 20); the pool blocks
+                            rather than opening more
+
+    The adapter itself never retries; see http_get.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=int(os.getenv("HTTP_POOL_CONNECTIONS", "10")),
+        pool_maxsize=pool_maxsize(),
+        pool_block=True,
+        max_retries=0,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, building it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def retry_policy() -> tuple:
+    """(max retries, backoff factor, call budget in seconds) from the environment.
+
+    HTTP_MAX_RETRIES         - retries for connect errors and 5xx/429 (default 1)
+    HTTP_BACKOFF_FACTOR      - exponential backoff base in seconds (default 0.3)
+    HTTP_CALL_BUDGET_SECONDS - total time for one call, retries included (default 8,
+                               one attempt's timeout, below PLAYLIST_DEADLINE_SECONDS)
+    """
+    return (int(os.getenv("HTTP_MAX_RETRIES", "1")),
+            float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3")),
+            float(os.getenv("HTTP_CALL_BUDGET_SECONDS", str(DEFAULT_TIMEOUT))))
+
+
+def retry_delay(attempt: int, retries: int, backoff: float, deadline: float, retry_after: str = ""):
+    """Seconds to wait before retrying, or None if the retries or the call's budget are used up.
+    A Retry-After longer than the time left ends the call instead of being waited out.
+    """
+    if attempt >= retries:
+        return None
+    delay = float(retry_after) if retry_after.isdigit() else backoff * (2 ** attempt)
+    return delay if time.monotonic() + delay < deadline else None
+
+
+def http_get(url: str, params=None, timeout: float = DEFAULT_TIMEOUT) -> requests.Response:
+    """GET through the shared connection pool, retrying connect errors and 429/5xx within the call budget."""
+    session = get_session()
+    retries, backoff, budget = retry_policy()
+    deadline = time.monotonic() + budget
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            response = pooled_get(session, url, params, min(timeout, remaining))
+        except requests.exceptions.ConnectionError:
+            delay = retry_delay(attempt, retries, backoff, deadline)
+            if delay is None:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            delay = retry_delay(attempt, retries, backoff, deadline, response.headers.get("Retry-After", ""))
+            if delay is None:
+                return response
+            response.close()
+        attempt += 1
+        time.sleep(delay)
+
+
+def pooled_get(session: requests.Session, url: str, params, timeout: float) -> requests.Response:
+    """session.get holding one of the host's connection slots.
+    requests gives urllib3 no pool timeout, so a blocking pool would wait forever
+    for a free connection; the slot is waited for at most `timeout` instead.
+    """
+    slots = host_slots(url)
+    start = time.monotonic()
+    if not slots.acquire(timeout=max(timeout, 0)):
+        raise requests.exceptions.Timeout(f"No free connection to {urlsplit(url).netloc} within {timeout:.1f}s")
+    try:
+        return session.get(url, params=params, timeout=max(timeout - (time.monotonic() - start), 0.001))
+    finally:
+        slots.release()
+
+
+def host_slots(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    slots = _host_slots.get(host)
+    if slots is None:
+        with _session_lock:
+            slots = _host_slots.setdefault(host, threading.BoundedSemaphore(pool_maxsize()))
+    return slots
+
+
+def http_post(url: str, json=None, timeout: float = DEFAULT_TIMEOUT) -> requests.Response:
+    """POST a JSON body through the shared connection pool (not retried)."""
+    return get_session().post(url, json=json, timeout=timeout)
+
+
+def preconnect(urls, timeout: float = 3.0) -> dict:
+    """Open a pooled keep-alive connection to each URL's host ahead of time.
+
+    Sends one HEAD per host (no API key, so no quota is spent) so the TCP+TLS
+    handshake is paid during warm-up instead of by the first user request.
+    Returns {host: seconds} or {host: error message}.
+    """
+    session = get_session()
+    results = {}
+    for url in urls:
+        host = url.split("/")[2]
+        if host in results:
+            continue
+        start = time.perf_counter()
+        try:
+            session.head(url, timeout=timeout)
+            results[host] = round(time.perf_counter() - start, 3)
+        except requests.RequestException as e:
+            results[host] = f"failed: {e.__class__.__name__}"
+    return results
+
+
+def _forget_session():
+    """In a forked child: drop the parent's session without closing its sockets, which
+    the parent still uses; the child's first call builds its own."""
+    global _session, _session_lock, _host_slots
+    _session, _session_lock, _host_slots = None, threading.Lock(), {}
+
+
+os.register_at_fork(after_in_child=_forget_session)
+
+
+def close_session():
+    """Close all pooled connections (the next call builds a fresh session)."""
+    global _session, _host_slots
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        _host_slots = {}
+
+
+def pool_stats() -> dict:
+    """Connection reuse counters for every host pool currently held.
+
+    `new_connections` are pool misses (a TCP+TLS handshake was paid);
+    `reused_connections` are requests served over an existing keep-alive socket.
+    """
+    hosts = {}
+    session = _session
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                requests_made = pool.num_requests
+                connections = pool.num_connections
+                hosts[host] = {
+                    "requests": requests_made,
+                    "new_connections": connections,
+                    "reused_connections": max(requests_made - connections, 0),
+                }
+
+    total_requests = sum(h["requests"] for h in hosts.values())
+    total_new = sum(h["new_connections"] for h in hosts.values())
+    return {
+        "requests": total_requests,
+        "new_connections": total_new,
+        "reused_connections": max(total_requests - total_new, 0),
+        "reuse_ratio": round((total_requests - total_new) / total_requests, 3) if total_requests else 0.0,
+        "hosts": hosts,
+    }
@@ -1,25 +1,50 @@
 # backend/main.py
 import os
 import json
+import hashlib
+import time
+import asyncio
+import contextvars
+import logging
 import requests
 import functions_framework
-from typing import List
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from threading import Barrier
+from typing import List, Optional
 from dotenv import load_dotenv
 
+from cache import SQLiteCache, TTLCache, TieredCache
+from career_index import CareerIndex, normalize_career
+from fuzzy_match import FuzzyCareerMatcher
+from circuit_breaker import CircuitBreaker
+from metrics import Metrics
+from structured_logging import (get_logger, logging_stats, new_request_id, reset_request_id,
+                                set_request_id, stop_logging)
+from precompute import PrecomputedResources, load_precomputed
+from quota import ProviderBudget, QuotaManager, build_quota_ledger, resolve_timezone
+from refresher import BackgroundRefresher
+from singleflight import AsyncSingleFlight, SingleFlight
+from skill_index import SkillIndex
+from skills_store import LearnedSkills, build_skills_store
+from snapshot import DEFAULT_SNAPSHOT, DEFAULT_SOURCE, load_catalog
+from vertex_client import RestTextModel, VertexModelHolder, vertex_sdk_installed
+from warmup import WarmUp
+from http_client import close_session, http_get, pool_stats, preconnect
+from async_http_client import async_http_get, async_pool_stats
+
 # Load environment variables from root .env file
 load_dotenv('../.env')
 
-# Vertex AI imports (used if available)
-try:
-    from google.cloud import aiplatform
-    VERTEX_AVAILABLE = True
-    print("Vertex AI available")
-except ImportError as e:
-    VERTEX_AVAILABLE = False
-    print(f"Vertex AI not available: {e}")
-except Exception as e:
-    VERTEX_AVAILABLE = False
-    print(f"Vertex AI error: {e}")
+LOG = get_logger("main")
+
+# Vertex AI (used if available). The SDK is heavy (grpc, protobuf), so it is only
+# imported when the model is first needed - most requests are served from the catalog.
+VERTEX_AVAILABLE = vertex_sdk_installed()
+if VERTEX_AVAILABLE:
+    LOG.info("Vertex AI available (SDK loaded on first use)")
+else:
+    LOG.info("Vertex AI not available: google-cloud-aiplatform is not installed")
 
 # Config from environment
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
@@ -28,157 +53,209 @@ GOOGLE_KNOWLEDGE_GRAPH_API_KEY = os.getenv("GOOGLE_KNOWLEDGE_GRAPH_API_KEY")
 GCP_PROJECT = os.getenv("GCP_PROJECT")
 LOCATION = os.getenv("LOCATION", "us-central1")
 
-# Simple fallback skill database when Vertex isn't reachable
-FALLBACK_SKILLS = {
-    "data scientist": ["Python", "Statistics", "Machine Learning", "SQL", "Data Visualization"],
-    "web developer": ["HTML/CSS", "JavaScript", "React", "APIs", "Git"],
-    "machine learning engineer": ["Python", "Deep Learning", "Model Deployment", "Data Engineering", "MLOps"],
-    "ui/ux designer": ["Design Fundamentals", "Figma", "User Research", "Prototyping", "Accessibility"],
-    "software engineer": ["Programming", "Data Structures", "Algorithms", "System Design", "Testing"],
-    "devops engineer": ["Linux", "Docker", "Kubernetes", "CI/CD", "Cloud Platforms"],
-    "product manager": ["Product Strategy", "User Research", "Data Analysis", "Roadmapping", "Stakeholder Management"],
-    "cybersecurity analyst": ["Network Security", "Incident Response", "Risk Assessment", "Security Tools", "Compliance"],
-    "mobile developer": ["Mobile Frameworks", "UI/UX Design", "APIs", "App Store Optimization", "Testing"],
-    "cloud architect": ["Cloud Platforms", "Architecture Design", "Security", "Cost Optimization", "Migration Strategies"],
-    # Tech roles
-    "full stack developer": ["Frontend", "Backend", "Databases", "APIs", "Version Control"],
-    "frontend developer": ["HTML/CSS", "JavaScript", "React/Vue/Angular", "Responsive Design", "Performance Optimization"],
-    "backend developer": ["Server Languages", "Databases", "API Design", "Security", "Performance"],
-    "qa engineer": ["Test Automation", "Manual Testing", "Bug Tracking", "Test Planning", "Quality Assurance"],
-    "database administrator": ["SQL", "Database Design", "Performance Tuning", "Backup & Recovery", "Security"],
-    "system administrator": ["Linux/Windows", "Networking", "Monitoring", "Troubleshooting", "Automation"],
-    "network engineer": ["Networking Protocols", "Router/Switch Config", "Security", "Troubleshooting", "Network Design"],
-    "security engineer": ["Security Architecture", "Penetration Testing", "Incident Response", "Compliance", "Risk Management"],
-    "game developer": ["Game Engines", "Programming", "3D Graphics", "Game Design", "Performance Optimization"],
-    "blockchain developer": ["Smart Contracts", "Cryptocurrency", "Distributed Systems", "Cryptography", "Web3"],
-    "ai engineer": ["Machine Learning", "Deep Learning", "Neural Networks", "Data Processing", "Model Deployment"],
-    "data engineer": ["ETL Pipelines", "Big Data", "Data Warehousing", "SQL", "Cloud Platforms"],
-    "data analyst": ["SQL", "Excel", "Data Visualization", "Statistics", "Business Intelligence"],
-    "business analyst": ["Requirements Analysis", "Process Mapping", "Data Analysis", "Documentation", "Stakeholder Management"],
-    # Creative roles
-    "graphic designer": ["Adobe Creative Suite", "Typography", "Color Theory", "Brand Design", "Print Design"],
-    "web designer": ["UI Design", "Responsive Design", "CSS", "Design Tools", "User Experience"],
-    "video editor": ["Video Editing Software", "Color Grading", "Audio Editing", "Motion Graphics", "Storytelling"],
-    "3d artist": ["3D Modeling", "Texturing", "Lighting", "Animation", "Rendering"],
-    "photographer": ["Camera Operation", "Lighting", "Photo Editing", "Composition", "Portfolio Development"],
-    "content creator": ["Content Strategy", "Video Production", "Social Media", "SEO", "Analytics"],
-    "copywriter": ["Writing Skills", "SEO Writing", "Brand Voice", "Content Strategy", "Research"],
-    "social media manager": ["Social Media Strategy", "Content Creation", "Analytics", "Community Management", "Advertising"],
-    # Business roles
-    "digital marketer": ["SEO/SEM", "Social Media Marketing", "Analytics", "Content Marketing", "Email Marketing"],
-    "sales manager": ["Sales Strategy", "CRM Systems", "Lead Generation", "Negotiation", "Team Management"],
-    "project manager": ["Project Planning", "Risk Management", "Team Leadership", "Agile/Scrum", "Communication"],
-    "scrum master": ["Agile Methodologies", "Team Facilitation", "Sprint Planning", "Stakeholder Management", "Continuous Improvement"],
-    "hr manager": ["Recruitment", "Employee Relations", "Performance Management", "HR Policies", "Training & Development"],
-    "financial analyst": ["Financial Modeling", "Excel", "Data Analysis", "Forecasting", "Investment Analysis"],
-    "accountant": ["Accounting Principles", "Tax Preparation", "Financial Reporting", "Auditing", "Software Proficiency"],
-    "operations manager": ["Process Optimization", "Supply Chain", "Quality Control", "Team Management", "Cost Analysis"],
-    "consultant": ["Problem Solving", "Client Management", "Industry Knowledge", "Presentation Skills", "Research"],
-    # Healthcare
-    "nurse": ["Patient Care", "Medical Knowledge", "Communication", "Critical Thinking", "Empathy"],
-    "doctor": ["Medical Diagnosis", "Patient Care", "Medical Knowledge", "Communication", "Decision Making"],
-    "pharmacist": ["Pharmaceutical Knowledge", "Patient Counseling", "Drug Interactions", "Precision", "Communication"],
-    "physical therapist": ["Anatomy Knowledge", "Treatment Planning", "Patient Assessment", "Manual Therapy", "Communication"],
-    # Education
-    "teacher": ["Curriculum Development", "Classroom Management", "Student Assessment", "Communication", "Subject Expertise"],
-    "professor": ["Research", "Teaching", "Academic Writing", "Grant Writing", "Subject Expertise"],
-    "instructional designer": ["Learning Theory", "Curriculum Design", "E-learning Tools", "Assessment Design", "Research"],
-    # Other fields
-    "chef": ["Culinary Skills", "Food Safety", "Menu Planning", "Kitchen Management", "Creativity"],
-    "architect": ["Design Software", "Building Codes", "Project Management", "3D Visualization", "Structural Knowledge"],
-    "civil engineer": ["Structural Analysis", "CAD Software", "Project Management", "Construction Knowledge", "Problem Solving"],
-    "mechanical engineer": ["CAD Design", "Thermodynamics", "Materials Science", "Problem Solving", "Project Management"],
-    "electrical engineer": ["Circuit Design", "Programming", "Signal Processing", "Problem Solving", "Testing"],
-    "lawyer": ["Legal Research", "Writing", "Critical Thinking", "Negotiation", "Case Analysis"],
-    "journalist": ["Writing", "Research", "Interviewing", "Fact Checking", "Storytelling"],
-    "translator": ["Language Proficiency", "Cultural Knowledge", "Writing Skills", "Research", "Attention to Detail"]
-}
+# Concurrency settings for the per-skill provider fan-out
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "16"))
+PLAYLIST_DEADLINE_SECONDS = float(os.getenv("PLAYLIST_DEADLINE_SECONDS", "9"))
 
-# Career aliases for flexible matching
-CAREER_ALIASES = {
-    "dev": "developer",
-    "devops": "devops engineer", 
-    "frontend": "frontend developer",
-    "backend": "backend developer",
-    "fullstack": "full stack developer",
-    "full-stack": "full stack developer",
-    "ml": "machine learning engineer",
-    "ai": "ai engineer",
-    "qa": "qa engineer",
-    "tester": "qa engineer",
-    "dba": "database administrator",
-    "sysadmin": "system administrator",
-    "netadmin": "network engineer",
-    "security": "security engineer",
-    "infosec": "security engineer",
-    "cybersec": "cybersecurity analyst",
-    "gamedev": "game developer",
-    "blockchain": "blockchain developer",
-    "crypto": "blockchain developer",
-    "designer": "graphic designer",
-    "ux": "ui/ux designer",
-    "ui": "ui/ux designer",
-    "pm": "product manager",
-    "scrum": "scrum master",
-    "marketing": "digital marketer",
-    "sales": "sales manager",
-    "hr": "hr manager",
-    "finance": "financial analyst",
-    "accounting": "accountant",
-    "ops": "operations manager",
-    "nurse": "nurse",
-    "doctor": "doctor",
-    "md": "doctor",
-    "teacher": "teacher",
-    "prof": "professor",
-    "chef": "chef",
-    "cook": "chef",
-    "architect": "architect",
-    "lawyer": "lawyer",
-    "attorney": "lawyer",
-    "journalist": "journalist",
-    "reporter": "journalist",
-    "translator": "translator"
+# Provider response cache: in-process LRU+TTL tier, plus an optional SQLite tier
+# (set PROVIDER_CACHE_DB to a file path) that survives restarts
+PROVIDER_CACHE_MAX_ENTRIES = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "2048"))
+PROVIDER_CACHE_DB = os.getenv("PROVIDER_CACHE_DB")
+PROVIDER_CACHE_TTLS = {
+    "youtube": float(os.getenv("YOUTUBE_CACHE_TTL", str(6 * 3600))),
+    "books": float(os.getenv("BOOKS_CACHE_TTL", str(24 * 3600))),
+    "certifications": float(os.getenv("CERTIFICATIONS_CACHE_TTL", str(24 * 3600))),
 }
 
+# Stale-while-revalidate: expired provider results are still served for up to
+# PROVIDER_STALE_TTL seconds while a background refresh (REFRESH_MAX_WORKERS at a time,
+# skipped once less than REFRESH_QUOTA_RESERVE of the day's budget is left) replaces them
+PROVIDER_STALE_TTL = float(os.getenv("PROVIDER_STALE_TTL", str(7 * 24 * 3600)))
+REFRESH_MAX_WORKERS = int(os.getenv("REFRESH_MAX_WORKERS", "2"))
+REFRESH_MAX_PENDING = int(os.getenv("REFRESH_MAX_PENDING", "64"))
+REFRESH_RETRY_SECONDS = float(os.getenv("REFRESH_RETRY_SECONDS", "60"))
+REFRESH_QUOTA_RESERVE = float(os.getenv("REFRESH_QUOTA_RESERVE", "0.2"))
+
+# Daily API quotas (the project's units, shared through the QUOTA_STORE ledger) and how
+# much of them may be spent. Past QUOTA_SOFT_LIMIT, lookups are served from cache/fallback links.
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+BOOKS_DAILY_QUOTA = int(os.getenv("BOOKS_DAILY_QUOTA", "1000"))
+KNOWLEDGE_GRAPH_DAILY_QUOTA = int(os.getenv("KNOWLEDGE_GRAPH_DAILY_QUOTA", "100000"))
+QUOTA_SOFT_LIMIT = float(os.getenv("QUOTA_SOFT_LIMIT", "0.9"))
+QUOTA_BURST_CALLS = int(os.getenv("QUOTA_BURST_CALLS", "20"))
+QUOTA_TZ = resolve_timezone(os.getenv("QUOTA_RESET_TIMEZONE", "America/Los_Angeles"))
+
+# Circuit breakers: trip when, over the last BREAKER_WINDOW calls (at least BREAKER_MIN_CALLS),
+# the failure rate or slow-call rate passes its threshold; probe again after BREAKER_OPEN_SECONDS
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "4"))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.8"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+
+# Precomputed provider results for the catalog (built by precompute.py, or a catalog.snap
+# with embedded resources); older than PRECOMPUTED_MAX_AGE seconds (0 = no limit) and it is ignored
+PRECOMPUTED_PATH = os.getenv("PRECOMPUTED_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "precomputed.json.gz"))
+PRECOMPUTED_MAX_AGE = float(os.getenv("PRECOMPUTED_MAX_AGE", str(14 * 24 * 3600)))
+
+# Batch endpoint: most careers accepted per request, and the batch fan-out's own
+# deadline and threads (a batch looks up hundreds of skills; it mustn't be cut off at the
+# single-playlist deadline or take the threads single playlists are waiting for)
+BATCH_MAX_CAREERS = int(os.getenv("BATCH_MAX_CAREERS", "100"))
+BATCH_DEADLINE_SECONDS = float(os.getenv("BATCH_DEADLINE_SECONDS", "25"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "32"))
+
+# Whole-response cache for career_playlist, keyed by (resolved career, known skills).
+# Responses that had to use fallback links are kept for a shorter time.
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "600"))
+RESPONSE_CACHE_DEGRADED_TTL = float(os.getenv("RESPONSE_CACHE_DEGRADED_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+# text-bison@001 is a common Vertex text model alias — adjust if needed.
+VERTEX_MODEL_NAME = os.getenv("VERTEX_MODEL_NAME", "text-bison@001")
+# A Vertex-style REST :predict URL called without credentials instead of the SDK
+# (the local mock upstream in benchmarks/mock_upstream.py, or an authenticating proxy)
+VERTEX_PREDICT_URL = os.getenv("VERTEX_PREDICT_URL")
+# Build the Vertex model in the background at import instead of on the first request
+VERTEX_WARM_START = os.getenv("VERTEX_WARM_START", "").lower() in ("1", "true", "yes")
+
+# Where skills generated by Vertex for unknown careers are kept: firestore, sqlite or memory.
+# On Cloud Run / Cloud Functions (K_SERVICE is set) instances share Firestore; locally a SQLite file.
+SKILLS_STORE = os.getenv("SKILLS_STORE", "firestore" if os.getenv("K_SERVICE") else "sqlite").lower()
+SKILLS_STORE_PATH = os.getenv("SKILLS_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "learned_skills.db"))
+SKILLS_STORE_COLLECTION = os.getenv("SKILLS_STORE_COLLECTION", "learned_skills")
+# Where the quota ledger (units spent, exhausted flags) is shared: same backends, same default
+QUOTA_STORE = os.getenv("QUOTA_STORE", SKILLS_STORE).lower()
+QUOTA_STORE_PATH = os.getenv("QUOTA_STORE_PATH", SKILLS_STORE_PATH)
+QUOTA_STORE_COLLECTION = os.getenv("QUOTA_STORE_COLLECTION", "quota_ledger")
+LEARNED_SKILLS_TTL = float(os.getenv("LEARNED_SKILLS_TTL", str(30 * 24 * 3600)))
+
+# Startup warm-up (indexes, pooled connections, precomputed artifact, Vertex with
+# VERTEX_WARM_START). The servers run it in each worker before accepting requests;
+# "blocking" also runs it on the first request of a process that nobody warmed up (Cloud
+# Functions), "background" starts it in a thread then. Never at import: functions_framework
+# forks its workers after importing this module. "off" skips it, for cold-start measurements.
+WARM_UP_MODE = os.getenv("WARM_UP", "").lower()
+WARM_UP_OFF = WARM_UP_MODE in ("0", "false", "no", "off")
+
+# Metrics: GET /metrics (Prometheus text format) and a Server-Timing header on
+# playlist responses. METRICS=0 turns the instrumentation off.
+METRICS_ENABLED = os.getenv("METRICS", "1").lower() not in ("0", "false", "no")
+
+# Career catalog: JSON source and the compiled snapshot served from
+CATALOG_SOURCE_PATH = os.getenv("CATALOG_SOURCE_PATH", DEFAULT_SOURCE)
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", DEFAULT_SNAPSHOT)
+
+# Minimum confidence (0-1) for accepting a typo-tolerant career match
+FUZZY_MATCH_THRESHOLD = float(os.getenv("FUZZY_MATCH_THRESHOLD", "0.75"))
+
+# Stage and upstream latency histograms, upstream status and fallback counters
+METRICS = Metrics(enabled=METRICS_ENABLED)
+STAGE_SECONDS = METRICS.histogram("playlist_stage_seconds", "Time spent in each playlist pipeline stage", ("stage",))
+UPSTREAM_SECONDS = METRICS.histogram("upstream_request_seconds", "Upstream API call latency", ("provider",))
+UPSTREAM_RESPONSES = METRICS.counter("upstream_responses_total",
+                                     "Upstream API answers by HTTP status, timeout or connection_error",
+                                     ("provider", "status"))
+PROVIDER_FALLBACKS = METRICS.counter("provider_fallbacks_total", "Lookups answered with fallback links",
+                                     ("provider", "reason"))
+PLAYLIST_SECONDS = METRICS.histogram("playlist_request_seconds", "Playlist request latency by response cache result",
+                                     ("cache",))
+
+# Simple fallback skill database when Vertex isn't reachable, plus career aliases for
+# flexible matching. Edited in catalog.json and compiled to catalog.snap (python snapshot.py),
+# which every worker memory-maps read-only; both tables are read-only mappings.
+CATALOG = load_catalog(CATALOG_SNAPSHOT_PATH, CATALOG_SOURCE_PATH)
+FALLBACK_SKILLS = CATALOG.careers
+CAREER_ALIASES = CATALOG.aliases
+
+
+# Precompiled lookup structures for career resolution (exact, alias, substring, token)
+CAREER_INDEX = CareerIndex(FALLBACK_SKILLS, CAREER_ALIASES)
+# Typo-tolerant matcher consulted when the index finds nothing ("data scienist")
+CAREER_FUZZY = FuzzyCareerMatcher(FALLBACK_SKILLS, CAREER_ALIASES, resolve=CAREER_INDEX.resolve,
+                                  threshold=FUZZY_MATCH_THRESHOLD)
+# Canonical skill IDs: catalog skills plus skill aliases ("ML" -> "Machine Learning"), case-folded
+SKILL_INDEX = SkillIndex((skill for skills in FALLBACK_SKILLS.values() for skill in skills), CATALOG.skill_aliases)
+
+
+# Shared Vertex model handle (initialised lazily, once per process)
+VERTEX_MODEL = VertexModelHolder(GCP_PROJECT, LOCATION, VERTEX_MODEL_NAME, library_available=VERTEX_AVAILABLE)
+if VERTEX_PREDICT_URL:
+    VERTEX_MODEL.set_factory(lambda: RestTextModel(VERTEX_PREDICT_URL))
+
+
+# Vertex-generated skills for careers outside FALLBACK_SKILLS, persisted between requests
+LEARNED_SKILLS = LearnedSkills(
+    build_skills_store(SKILLS_STORE, SKILLS_STORE_PATH, SKILLS_STORE_COLLECTION, GCP_PROJECT),
+    ttl=LEARNED_SKILLS_TTL,
+    # Playlists built from a career's previous skills must not outlive them
+    on_write=lambda career: invalidate_response_cache(),
+)
+
+
+def resolve_career(career: str) -> str:
+    """Map user input to a FALLBACK_SKILLS key where possible.
+    Returns the normalized input unchanged when no known career matches.
+    """
+    resolved = CAREER_INDEX.resolve(career)
+    if resolved is None:
+        fuzzy = CAREER_FUZZY.match(career)
+        if fuzzy is not None:
+            resolved = fuzzy[0]
+    return resolved or normalize_career(career)
+
 
 def call_vertex_extract_skills(career: str) -> List[str]:
     """
     Try to call Vertex AI Text generation to extract skills.
     Returns a list of skill strings. If Vertex fails, return fallback.
     """
-    career_key = career.strip().lower()
-    
-    # Check for aliases first (e.g., "devops" -> "devops engineer")
-    if career_key in CAREER_ALIASES:
-        career_key = CAREER_ALIASES[career_key]
-    
-    # Check for partial matches (e.g., "devops" in "devops engineer")
-    if career_key not in FALLBACK_SKILLS:
-        for full_career in FALLBACK_SKILLS.keys():
-            if career_key in full_career or full_career in career_key:
-                career_key = full_career
-                break
+    with METRICS.span(STAGE_SECONDS, "resolve"):
+        career_key = resolve_career(career)
     
     # Quick deterministic fallback
-    if career_key in FALLBACK_SKILLS:
-        return FALLBACK_SKILLS[career_key]
+    known = FALLBACK_SKILLS.get(career_key)
+    if known is not None:
+        return known
 
-    if not VERTEX_AVAILABLE:
+    if not VERTEX_MODEL.available:
         # No Vertex library installed or import failed
         return ["Research Skill 1", "Research Skill 2", "Research Skill 3"]
 
-    try:
-        aiplatform.init(project=GCP_PROJECT, location=LOCATION)
-        # text-bison@001 is a common Vertex text model alias — adjust if needed.
-        model = aiplatform.TextGenerationModel.from_pretrained("text-bison@001")
+    # Skills generated earlier (by any instance) are reused; only the first request generates.
+    # Identical requests already in flight in this process share that lookup.
+    skills = VERTEX_FLIGHTS.do(career_key, LEARNED_SKILLS.get, career_key,
+                               lambda: generate_skills_with_vertex(career))
+    if skills:
+        return skills
+
+    # final fallback
+    return ["Research Skill 1", "Research Skill 2", "Research Skill 3"]
+
+
+async def call_vertex_extract_skills_async(career: str) -> List[str]:
+    """call_vertex_extract_skills for the event loop: catalog careers are answered
+    in place; generating skills (Vertex SDK, learned-skills store) runs on a thread.
+    """
+    with METRICS.span(STAGE_SECONDS, "resolve"):
+        known = FALLBACK_SKILLS.get(resolve_career(career))
+    if known is not None:
+        return known
+    return await asyncio.to_thread(call_vertex_extract_skills, career)
 
+
+def generate_skills_with_vertex(career: str) -> Optional[List[str]]:
+    """Ask the Vertex text model for the skills a career needs. Returns None if it fails."""
+    try:
         prompt = (
             f"List 5 essential skills required to become a {career}. "
             "Return only a JSON array of skill names, for example: [\"Python\", \"SQL\"]"
         )
 
-        response = model.predict(prompt, max_output_tokens=256)
+        # The model handle is built once per process and shared between requests
+        with METRICS.span(STAGE_SECONDS, "vertex"):
+            response = VERTEX_MODEL.predict(prompt, max_output_tokens=256)
 
         # response may be a simple object with .text or str; try to parse JSON inside
         text = None
@@ -205,81 +282,433 @@ def call_vertex_extract_skills(career: str) -> List[str]:
             return [l for l in lines][:5]
 
     except Exception as e:
-        print("Vertex error:", e)
+        LOG.warning("Vertex error: %s", e, provider="vertex")
+
+    return None
+
+
+class ProviderError(Exception):
+    """Raised by the fetch_* functions when an upstream API call can't be used.
+    `reason` labels the fallback it causes: "error" for a failed call, "breaker_open"
+    or "quota_budget" for one refused before it was made.
+    """
+
+    def __init__(self, provider: str, message: str, status: int = None, quota_exceeded: bool = False,
+                 reason: str = "error"):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+        self.quota_exceeded = quota_exceeded
+        self.reason = reason
+
+
+def build_provider_cache(provider: str) -> TieredCache:
+    """Create the cache used for one provider's lookups."""
+    disk = None
+    if PROVIDER_CACHE_DB:
+        try:
+            disk = SQLiteCache(PROVIDER_CACHE_DB, provider, stale_ttl=PROVIDER_STALE_TTL)
+        except Exception as e:
+            LOG.warning("Provider cache: disk tier unavailable (%s) - using memory only", e, provider=provider)
+    memory = TTLCache(PROVIDER_CACHE_MAX_ENTRIES, stale_ttl=PROVIDER_STALE_TTL)
+    return TieredCache(PROVIDER_CACHE_TTLS[provider], memory, disk)
+
+
+PROVIDER_CACHES = {provider: build_provider_cache(provider) for provider in PROVIDER_CACHE_TTLS}
+# With a warm-up configured, the artifact is loaded by it instead
+if WARM_UP_MODE and not WARM_UP_OFF:
+    PRECOMPUTED = PrecomputedResources()
+else:
+    PRECOMPUTED = load_precomputed(PRECOMPUTED_PATH, PRECOMPUTED_MAX_AGE)
+
+# Daily quota accounting; search.list costs 100 units, Books and Knowledge Graph 1 per request
+QUOTA_LEDGER = build_quota_ledger(QUOTA_STORE, QUOTA_STORE_PATH, QUOTA_STORE_COLLECTION, GCP_PROJECT)
+QUOTA = QuotaManager([
+    ProviderBudget("youtube", YOUTUBE_DAILY_QUOTA, 100, QUOTA_SOFT_LIMIT, QUOTA_BURST_CALLS, QUOTA_TZ,
+                   ledger=QUOTA_LEDGER),
+    ProviderBudget("books", BOOKS_DAILY_QUOTA, 1, QUOTA_SOFT_LIMIT, QUOTA_BURST_CALLS, QUOTA_TZ,
+                   ledger=QUOTA_LEDGER),
+    ProviderBudget("certifications", KNOWLEDGE_GRAPH_DAILY_QUOTA, 1, QUOTA_SOFT_LIMIT, QUOTA_BURST_CALLS, QUOTA_TZ,
+                   ledger=QUOTA_LEDGER),
+])
+
+# Lookup steps the async path runs on a thread: they read or write SQLite/Firestore
+CACHE_IO_BLOCKS = bool(PROVIDER_CACHE_DB)
+QUOTA_IO_BLOCKS = QUOTA_LEDGER.name != "memory"
+
+# One circuit breaker per upstream provider
+BREAKERS = {
+    provider: CircuitBreaker(
+        provider,
+        window=BREAKER_WINDOW,
+        min_calls=BREAKER_MIN_CALLS,
+        failure_rate=BREAKER_FAILURE_RATE,
+        slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate=BREAKER_SLOW_CALL_RATE,
+        open_seconds=BREAKER_OPEN_SECONDS,
+    )
+    for provider in PROVIDER_CACHE_TTLS
+}
+
+# In-flight request coalescing (identical concurrent lookups share one call)
+PROVIDER_FLIGHTS = SingleFlight()
+VERTEX_FLIGHTS = SingleFlight()
+RESPONSE_FLIGHTS = SingleFlight()
+# The same for lookups awaited on an event loop (asgi.py)
+ASYNC_PROVIDER_FLIGHTS = AsyncSingleFlight()
+ASYNC_RESPONSE_FLIGHTS = AsyncSingleFlight()
+
+# Background refreshes of stale provider results
+REFRESHER = BackgroundRefresher(REFRESH_MAX_WORKERS, REFRESH_MAX_PENDING, REFRESH_RETRY_SECONDS)
+
+
+# Upstream endpoints (overridable to point load tests at a local mock)
+YOUTUBE_SEARCH_URL = os.getenv("YOUTUBE_SEARCH_URL", "https://www.googleapis.com/youtube/v3/search")
+BOOKS_VOLUMES_URL = os.getenv("BOOKS_VOLUMES_URL", "https://www.googleapis.com/books/v1/volumes")
+KNOWLEDGE_GRAPH_SEARCH_URL = os.getenv("KNOWLEDGE_GRAPH_SEARCH_URL", "https://kgsearch.googleapis.com/v1/entities:search")
+PROVIDER_URLS = {
+    "youtube": YOUTUBE_SEARCH_URL,
+    "books": BOOKS_VOLUMES_URL,
+    "certifications": KNOWLEDGE_GRAPH_SEARCH_URL,
+}
+
+
+def provider_cache_key(skill: str, max_results: int) -> str:
+    return f"{SKILL_INDEX.canonical(skill)}|{max_results}"
+
+
+def lookup_resources(provider: str, fetch, fallback, skill: str, max_results: int = 3):
+    """Serve a provider lookup from the precomputed artifact or cache, else fetch it upstream.
+    Successful upstream results are cached; failures and empty results use the fallback links.
+    Stale cached results are served as-is while a background refresh replaces them.
+    """
+    results = local_resources(provider, fetch, fallback, skill, max_results)
+    if results is not None:
+        return results
+
+    cache = PROVIDER_CACHES[provider]
+    key = provider_cache_key(skill, max_results)
+    try:
+        # Concurrent misses for the same lookup share one upstream call
+        results = PROVIDER_FLIGHTS.do((provider, key), fetch_and_cache, cache, key, provider, fetch, skill, max_results)
+    except ProviderError as e:
+        return upstream_or_fallback(provider, fallback, skill, max_results, error=e)
+    return upstream_or_fallback(provider, fallback, skill, max_results, results)
+
+
+async def lookup_resources_async(provider: str, fetch_async, fetch, fallback, skill: str, max_results: int = 3):
+    """lookup_resources with the upstream call awaited on the event loop.
+    `fetch` (sync) is still used for background refreshes of stale entries.
+    """
+    results = await off_loop(CACHE_IO_BLOCKS, local_resources, provider, fetch, fallback, skill, max_results)
+    if results is not None:
+        return results
+
+    cache = PROVIDER_CACHES[provider]
+    key = provider_cache_key(skill, max_results)
+    try:
+        results = await ASYNC_PROVIDER_FLIGHTS.do((provider, key), fetch_and_cache_async,
+                                                  cache, key, provider, fetch_async, skill, max_results)
+    except ProviderError as e:
+        return upstream_or_fallback(provider, fallback, skill, max_results, error=e)
+    return upstream_or_fallback(provider, fallback, skill, max_results, results)
+
+
+async def off_loop(blocking: bool, step, *args):
+    """Run a lookup step from the event loop: on a thread if it reads or writes
+    SQLite/Firestore (`blocking`), in place otherwise."""
+    if blocking:
+        return await asyncio.to_thread(step, *args)
+    return step(*args)
+
+
+def local_resources(provider: str, fetch, fallback, skill: str, max_results: int):
+    """The answer to a lookup that needs no upstream call - precomputed or cached
+    results, or the fallback links once the quota is exhausted - else None."""
+    results = cached_resources(provider, fetch, skill, max_results)
+    if results is None and QUOTA.is_exhausted(provider):
+        # The API already answered with a quota 403 today: no flight, breaker or budget check needed
+        results = use_fallback(provider, fallback, skill, max_results, "quota")
+    return results
+
+
+def upstream_or_fallback(provider: str, fallback, skill: str, max_results: int, results=None,
+                         error: ProviderError = None):
+    """The result of an upstream lookup, or the fallback links if it failed or found nothing."""
+    if error is not None:
+        return use_fallback(provider, fallback, skill, max_results, error.reason)
+    return results if results else use_fallback(provider, fallback, skill, max_results, "empty")
+
+
+def use_fallback(provider: str, fallback, skill: str, max_results: int, reason: str = "error"):
+    """Fallback links for a lookup, counted by reason (no API key, exhausted quota, open breaker,
+    quota budget reached, failed call, no results)."""
+    if reason == "error" and not provider_configured(provider):
+        reason = "unconfigured"
+    PROVIDER_FALLBACKS.inc(provider, reason)
+    return fallback(skill, max_results)
+
+
+def cached_resources(provider: str, fetch, skill: str, max_results: int):
+    """Precomputed or cached results for a lookup (refreshing stale ones in the background), else None."""
+    precomputed = PRECOMPUTED.get(provider, SKILL_INDEX.canonical(skill), max_results)
+    if precomputed is not None:
+        return precomputed
+
+    cache = PROVIDER_CACHES[provider]
+    key = provider_cache_key(skill, max_results)
+    entry = cache.get_entry(key)
+    if entry is None:
+        return None
+    cached, remaining = entry
+    if remaining <= 0:
+        schedule_refresh(cache, key, provider, fetch, skill, max_results)
+    return cached
+
+
+def schedule_refresh(cache, key: str, provider: str, fetch, skill: str, max_results: int):
+    """Refresh a stale entry in the background, unless the quota is running low."""
+    if not provider_configured(provider) or QUOTA.headroom(provider) < REFRESH_QUOTA_RESERVE:
+        return
+    REFRESHER.submit((provider, key), PROVIDER_FLIGHTS.do, (provider, key), fetch_and_cache,
+                     cache, key, provider, fetch, skill, max_results)
+
+
+def fetch_and_cache(cache, key: str, provider: str, fetch, skill: str, max_results: int):
+    """Call the upstream API (if its breaker and quota budget allow) and cache a non-empty result."""
+    if not provider_configured(provider):
+        return fetch(skill, max_results)
+
+    acquire_upstream(provider)
+    with upstream_call(provider):
+        results = fetch(skill, max_results)
+    if results:
+        cache.set(key, results)
+    return results
+
+
+async def fetch_and_cache_async(cache, key: str, provider: str, fetch_async, skill: str, max_results: int):
+    """fetch_and_cache for an async fetch."""
+    if not provider_configured(provider):
+        return await fetch_async(skill, max_results)
+
+    await off_loop(QUOTA_IO_BLOCKS, acquire_upstream, provider)
+    with upstream_call(provider):
+        results = await fetch_async(skill, max_results)
+    if results:
+        await off_loop(CACHE_IO_BLOCKS, cache.set, key, results)
+    return results
+
+
+def acquire_upstream(provider: str):
+    """Raise ProviderError unless the provider's breaker and quota budget allow a call."""
+    breaker = BREAKERS[provider]
+    if not breaker.allow():
+        raise ProviderError(provider, "Circuit open", reason="breaker_open")
+    if not QUOTA.try_acquire(provider):
+        breaker.cancel()
+        raise ProviderError(provider, "Daily quota budget reached", reason="quota_budget")
+
+
+@contextmanager
+def upstream_call(provider: str):
+    """Time the upstream call made in the block and feed its outcome to the provider's breaker."""
+    start = time.perf_counter()
+    try:
+        with METRICS.span(UPSTREAM_SECONDS, provider):
+            yield
+    except ProviderError as e:
+        record_upstream(provider, time.perf_counter() - start, e)
+        raise
+    except BaseException:
+        # Cancelled or torn down mid-call: no outcome to record, but a half-open probe must be released
+        BREAKERS[provider].cancel()
+        raise
+    record_upstream(provider, time.perf_counter() - start)
 
-    # final fallback
-    return ["Research Skill 1", "Research Skill 2", "Research Skill 3"]
 
+def record_upstream(provider: str, seconds: float, error: ProviderError = None):
+    """Feed an upstream call's outcome to the provider's breaker (and quota, on a quota error)."""
+    breaker = BREAKERS[provider]
+    if error is None:
+        breaker.record_success(seconds)
+        return
+    if error.quota_exceeded:
+        # Also written to the quota ledger, from the event loop too: it happens once a day per provider
+        QUOTA.mark_exhausted(provider)
+    if is_upstream_failure(error):
+        breaker.record_failure(seconds)
+    else:
+        breaker.record_success(seconds)
+
+
+def is_upstream_failure(error: ProviderError) -> bool:
+    """Timeouts, connection errors and 5xx count against a breaker; 4xx answers don't."""
+    return error.status is None or error.status >= 500
+
+
+def http_status(error: Exception):
+    """HTTP status carried by a requests exception, if any."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+PROVIDER_LABELS = {
+    "youtube": "YouTube API",
+    "books": "Google Books API",
+    "certifications": "Knowledge Graph API",
+}
+
+
+def provider_error(provider: str, error: Exception) -> ProviderError:
+    """Turn a transport or parsing error from a fetch into a ProviderError (and log it)."""
+    label = PROVIDER_LABELS[provider]
+    if isinstance(error, requests.exceptions.Timeout):
+        UPSTREAM_RESPONSES.inc(provider, "timeout")
+        LOG.warning("%s error: Request timeout - using fallback links", label, provider=provider, error="timeout")
+        return ProviderError(provider, "Request timeout")
+    if isinstance(error, requests.exceptions.ConnectionError):
+        UPSTREAM_RESPONSES.inc(provider, "connection_error")
+        LOG.warning("%s error: Connection failed - using fallback links", label, provider=provider, error="connection")
+        return ProviderError(provider, "Connection failed")
+    LOG.warning("%s error: %s - using fallback links", label, error, provider=provider)
+    return ProviderError(provider, str(error), status=http_status(error))
+
+
+@contextmanager
+def provider_errors(provider: str):
+    """Turn transport and parsing errors raised in the block into ProviderError."""
+    try:
+        yield
+    except ProviderError:
+        raise
+    except Exception as e:
+        raise provider_error(provider, e) from e
+
+
+def provider_configured(provider: str) -> bool:
+    """True if the provider has an API key (calls without one never reach Google)."""
+    return bool({
+        "youtube": YOUTUBE_API_KEY,
+        "books": GOOGLE_BOOKS_API_KEY,
+        "certifications": GOOGLE_KNOWLEDGE_GRAPH_API_KEY,
+    }.get(provider))
 
 
 def get_youtube_links(skill: str, max_results: int = 3):
-    """Return a list of video objects: {title, url, thumbnail} from YouTube Data API."""
+    """Return a list of video objects: {title, url, thumbnail} for a skill (cached, with fallback links)."""
+    return lookup_resources("youtube", fetch_youtube_links, get_youtube_fallback, skill, max_results)
+
+
+def get_google_books(skill: str, max_results: int = 3):
+    """Return a list of book objects for a skill (cached, with fallback links)."""
+    return lookup_resources("books", fetch_google_books, get_books_fallback, skill, max_results)
+
+
+def get_certifications(skill: str, max_results: int = 3):
+    """Return a list of certification objects for a skill (cached, with fallback links)."""
+    return lookup_resources("certifications", fetch_certifications, get_certifications_fallback, skill, max_results)
+
+
+async def get_youtube_links_async(skill: str, max_results: int = 3):
+    """Async get_youtube_links: same results and fallback links, no thread per call."""
+    return await lookup_resources_async("youtube", fetch_youtube_links_async, fetch_youtube_links,
+                                        get_youtube_fallback, skill, max_results)
+
+
+async def get_google_books_async(skill: str, max_results: int = 3):
+    """Async get_google_books."""
+    return await lookup_resources_async("books", fetch_google_books_async, fetch_google_books,
+                                        get_books_fallback, skill, max_results)
+
+
+async def get_certifications_async(skill: str, max_results: int = 3):
+    """Async get_certifications."""
+    return await lookup_resources_async("certifications", fetch_certifications_async, fetch_certifications,
+                                        get_certifications_fallback, skill, max_results)
+
+
+def youtube_params(skill: str, max_results: int) -> dict:
     if not YOUTUBE_API_KEY:
-        print("YouTube API error: No API key configured")
-        return get_youtube_fallback(skill, max_results)
+        LOG.sampled("youtube.unconfigured", "YouTube API error: No API key configured", provider="youtube")
+        raise ProviderError("youtube", "No API key configured")
 
-    params = {
+    return {
         "part": "snippet",
         "q": f"{skill} tutorial for beginners",
         "type": "video",
         "maxResults": max_results,
         "key": YOUTUBE_API_KEY
     }
-    url = "https://www.googleapis.com/youtube/v3/search"
+
+
+def parse_youtube_response(r, skill: str):
+    """Video objects from a YouTube search response (requests or httpx)."""
+    UPSTREAM_RESPONSES.inc("youtube", r.status_code)
+    LOG.sampled("youtube.status", "YouTube API: Response status %d", r.status_code, level=logging.DEBUG,
+                provider="youtube", status=r.status_code)
     
-    try:
-        print(f"YouTube API: Searching for '{skill}' tutorials...")
-        r = requests.get(url, params=params, timeout=8)
-        
-        # Log response status for debugging
-        print(f"YouTube API: Response status {r.status_code}")
-        
-        if r.status_code == 403:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"YouTube API error 403: {error_msg}")
-            if "quota" in error_msg.lower():
-                print("YouTube API: Quota exceeded - using fallback links")
-            elif "key" in error_msg.lower():
-                print("YouTube API: Invalid API key - using fallback links")
-            return get_youtube_fallback(skill, max_results)
-        elif r.status_code == 400:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"YouTube API error 400: {error_msg} - using fallback links")
-            return get_youtube_fallback(skill, max_results)
-        
-        r.raise_for_status()
-        data = r.json()
-        items = data.get("items", [])
-        
-        print(f"YouTube API: Found {len(items)} videos for '{skill}'")
-        
-        results = []
-        for item in items:
-            vid = item["id"].get("videoId")
-            snippet = item.get("snippet", {})
-            title = snippet.get("title")
-            thumb = snippet.get("thumbnails", {}).get("default", {}).get("url")
-            
-            if vid and title:  # Ensure we have valid data
-                results.append({
-                    "title": title,
-                    "url": f"https://www.youtube.com/watch?v={vid}",
-                    "thumbnail": thumb
-                })
-        
-        return results if results else get_youtube_fallback(skill, max_results)
+    if r.status_code == 403:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        if "quota" in error_msg.lower():
+            LOG.warning("YouTube API: Quota exceeded - using fallback links (%s)", error_msg,
+                        provider="youtube", status=403)
+        elif "key" in error_msg.lower():
+            LOG.warning("YouTube API: Invalid API key - using fallback links (%s)", error_msg,
+                        provider="youtube", status=403)
+        else:
+            LOG.warning("YouTube API error 403: %s - using fallback links", error_msg, provider="youtube", status=403)
+        raise ProviderError("youtube", error_msg, status=403,
+                            quota_exceeded="quota" in error_msg.lower())
+    elif r.status_code == 400:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        LOG.warning("YouTube API error 400: %s - using fallback links", error_msg, provider="youtube", status=400)
+        raise ProviderError("youtube", error_msg, status=400)
+    
+    r.raise_for_status()
+    data = r.json()
+    items = data.get("items", [])
+    
+    LOG.sampled("youtube.found", "YouTube API: Found %d videos for '%s'", len(items), skill,
+                provider="youtube", skill=skill, results=len(items))
+    
+    results = []
+    for item in items:
+        vid = item["id"].get("videoId")
+        snippet = item.get("snippet", {})
+        title = snippet.get("title")
+        thumb = snippet.get("thumbnails", {}).get("default", {}).get("url")
         
-    except requests.exceptions.Timeout:
-        print("YouTube API error: Request timeout - using fallback links")
-        return get_youtube_fallback(skill, max_results)
-    except requests.exceptions.ConnectionError:
-        print("YouTube API error: Connection failed - using fallback links")
-        return get_youtube_fallback(skill, max_results)
-    except Exception as e:
-        print(f"YouTube API error: {e} - using fallback links")
-        return get_youtube_fallback(skill, max_results)
+        if vid and title:  # Ensure we have valid data
+            results.append({
+                "title": title,
+                "url": f"https://www.youtube.com/watch?v={vid}",
+                "thumbnail": thumb
+            })
+    
+    return results
+
+
+def youtube_request(skill: str, max_results: int):
+    """URL and query parameters of a YouTube search."""
+    params = youtube_params(skill, max_results)
+    LOG.sampled("youtube.search", "YouTube API: Searching for '%s' tutorials...", skill, level=logging.DEBUG,
+                provider="youtube", skill=skill)
+    return YOUTUBE_SEARCH_URL, params
+
+
+def fetch_youtube_links(skill: str, max_results: int = 3):
+    """Return a list of video objects: {title, url, thumbnail} from YouTube Data API.
+    Raises ProviderError when the API can't be used; an empty list means no videos were found.
+    """
+    return fetch_upstream("youtube", skill, max_results)
+
+
+async def fetch_youtube_links_async(skill: str, max_results: int = 3):
+    """fetch_youtube_links on the shared async HTTP client."""
+    return await fetch_upstream_async("youtube", skill, max_results)
 
 
 def get_youtube_fallback(skill: str, max_results: int = 3):
@@ -308,72 +737,84 @@ def get_youtube_fallback(skill: str, max_results: int = 3):
     return fallback_videos[:max_results]
 
 
-def get_google_books(skill: str, max_results: int = 3):
-    """Return a list of book objects: {title, authors, description, thumbnail, infoLink} from Google Books API."""
+def books_params(skill: str, max_results: int) -> dict:
     if not GOOGLE_BOOKS_API_KEY:
-        print("Google Books API: No API key configured - using fallback links")
-        return get_books_fallback(skill, max_results)
+        LOG.sampled("books.unconfigured", "Google Books API: No API key configured - using fallback links",
+                    provider="books")
+        raise ProviderError("books", "No API key configured")
 
-    params = {
+    return {
         "q": f"{skill} programming tutorial guide",
         "maxResults": max_results,
         "key": GOOGLE_BOOKS_API_KEY
     }
-    url = "https://www.googleapis.com/books/v1/volumes"
-    try:
-        print(f"Google Books API: Searching for '{skill}' books...")
-        r = requests.get(url, params=params, timeout=8)
-        
-        if r.status_code == 403:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"Google Books API error 403: {error_msg} - using fallback links")
-            return get_books_fallback(skill, max_results)
-        elif r.status_code == 400:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"Google Books API error 400: {error_msg} - using fallback links")
-            return get_books_fallback(skill, max_results)
-            
-        r.raise_for_status()
-        data = r.json()
-        items = data.get("items", [])
-        
-        print(f"Google Books API: Found {len(items)} books for '{skill}'")
+
+
+def parse_books_response(r, skill: str):
+    """Book objects from a Google Books volumes response (requests or httpx)."""
+    UPSTREAM_RESPONSES.inc("books", r.status_code)
+    if r.status_code == 403:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        LOG.warning("Google Books API error 403: %s - using fallback links", error_msg, provider="books", status=403)
+        raise ProviderError("books", error_msg, status=403,
+                            quota_exceeded="quota" in error_msg.lower())
+    elif r.status_code == 400:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        LOG.warning("Google Books API error 400: %s - using fallback links", error_msg, provider="books", status=400)
+        raise ProviderError("books", error_msg, status=400)
         
-        results = []
-        for item in items:
-            volume_info = item.get("volumeInfo", {})
-            title = volume_info.get("title")
-            authors = volume_info.get("authors", [])
-            description = volume_info.get("description", "No description available")
-            thumbnail = volume_info.get("imageLinks", {}).get("thumbnail")
-            info_link = volume_info.get("infoLink")
-            
-            # Truncate description if too long
-            if len(description) > 200:
-                description = description[:200] + "..."
-            
-            if title:  # Ensure we have valid data
-                results.append({
-                    "title": title,
-                    "authors": authors,
-                    "description": description,
-                    "thumbnail": thumbnail,
-                    "infoLink": info_link
-                })
+    r.raise_for_status()
+    data = r.json()
+    items = data.get("items", [])
+    
+    LOG.sampled("books.found", "Google Books API: Found %d books for '%s'", len(items), skill,
+                provider="books", skill=skill, results=len(items))
+    
+    results = []
+    for item in items:
+        volume_info = item.get("volumeInfo", {})
+        title = volume_info.get("title")
+        authors = volume_info.get("authors", [])
+        description = volume_info.get("description", "No description available")
+        thumbnail = volume_info.get("imageLinks", {}).get("thumbnail")
+        info_link = volume_info.get("infoLink")
         
-        return results if results else get_books_fallback(skill, max_results)
+        # Truncate description if too long
+        if len(description) > 200:
+            description = description[:200] + "..."
         
-    except requests.exceptions.Timeout:
-        print("Google Books API error: Request timeout - using fallback links")
-        return get_books_fallback(skill, max_results)
-    except requests.exceptions.ConnectionError:
-        print("Google Books API error: Connection failed - using fallback links")
-        return get_books_fallback(skill, max_results)
-    except Exception as e:
-        print(f"Google Books API error: {e} - using fallback links")
-        return get_books_fallback(skill, max_results)
+        if title:  # Ensure we have valid data
+            results.append({
+                "title": title,
+                "authors": authors,
+                "description": description,
+                "thumbnail": thumbnail,
+                "infoLink": info_link
+            })
+    
+    return results
+
+
+def books_request(skill: str, max_results: int):
+    """URL and query parameters of a Google Books search."""
+    params = books_params(skill, max_results)
+    LOG.sampled("books.search", "Google Books API: Searching for '%s' books...", skill, level=logging.DEBUG,
+                provider="books", skill=skill)
+    return BOOKS_VOLUMES_URL, params
+
+
+def fetch_google_books(skill: str, max_results: int = 3):
+    """Return a list of book objects: {title, authors, description, thumbnail, infoLink} from Google Books API.
+    Raises ProviderError when the API can't be used; an empty list means no books were found.
+    """
+    return fetch_upstream("books", skill, max_results)
+
+
+async def fetch_google_books_async(skill: str, max_results: int = 3):
+    """fetch_google_books on the shared async HTTP client."""
+    return await fetch_upstream_async("books", skill, max_results)
 
 
 def get_books_fallback(skill: str, max_results: int = 3):
@@ -407,89 +848,98 @@ def get_books_fallback(skill: str, max_results: int = 3):
     return fallback_books[:max_results]
 
 
-def get_certifications(skill: str, max_results: int = 3):
-    """Return a list of certification objects using Google Knowledge Graph API."""
+def certifications_params(skill: str, max_results: int) -> dict:
     if not GOOGLE_KNOWLEDGE_GRAPH_API_KEY:
-        print("Google Knowledge Graph API: No API key configured - using fallback links")
-        return get_certifications_fallback(skill, max_results)
+        LOG.sampled("certifications.unconfigured",
+                    "Google Knowledge Graph API: No API key configured - using fallback links",
+                    provider="certifications")
+        raise ProviderError("certifications", "No API key configured")
 
     # Search for certifications related to the skill
-    params = {
+    return {
         "query": f"{skill} certification course professional",
         "key": GOOGLE_KNOWLEDGE_GRAPH_API_KEY,
         "limit": max_results * 2,  # Get more results to filter
         "indent": True
     }
+
+
+def parse_certifications_response(r, skill: str, max_results: int):
+    """Certification objects from a Knowledge Graph search response (requests or httpx)."""
+    UPSTREAM_RESPONSES.inc("certifications", r.status_code)
+    if r.status_code == 403:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        LOG.warning("Knowledge Graph API error 403: %s - using fallback links", error_msg,
+                    provider="certifications", status=403)
+        raise ProviderError("certifications", error_msg, status=403,
+                            quota_exceeded="quota" in error_msg.lower())
+    elif r.status_code == 400:
+        error_data = r.json()
+        error_msg = error_data.get("error", {}).get("message", "Unknown error")
+        LOG.warning("Knowledge Graph API error 400: %s - using fallback links", error_msg,
+                    provider="certifications", status=400)
+        raise ProviderError("certifications", error_msg, status=400)
+        
+    r.raise_for_status()
+    data = r.json()
+    items = data.get("itemListElement", [])
     
-    url = "https://kgsearch.googleapis.com/v1/entities:search"
+    LOG.sampled("certifications.found", "Knowledge Graph API: Found %d results for '%s' certifications",
+                len(items), skill, provider="certifications", skill=skill, results=len(items))
     
-    try:
-        print(f"Knowledge Graph API: Searching for '{skill}' certifications...")
-        r = requests.get(url, params=params, timeout=8)
+    certifications = []
+    for item in items:
+        result = item.get("result", {})
+        name = result.get("name", "")
+        description = result.get("description", "")
+        detailed_description = result.get("detailedDescription", {})
         
-        if r.status_code == 403:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"Knowledge Graph API error 403: {error_msg} - using fallback links")
-            return get_certifications_fallback(skill, max_results)
-        elif r.status_code == 400:
-            error_data = r.json()
-            error_msg = error_data.get("error", {}).get("message", "Unknown error")
-            print(f"Knowledge Graph API error 400: {error_msg} - using fallback links")
-            return get_certifications_fallback(skill, max_results)
+        # Filter for certification-related entities
+        if any(keyword in name.lower() for keyword in ['certification', 'certificate', 'course', 'training', 'program']):
+            cert_description = detailed_description.get("articleBody", description)
+            if len(cert_description) > 200:
+                cert_description = cert_description[:200] + "..."
             
-        r.raise_for_status()
-        data = r.json()
-        items = data.get("itemListElement", [])
-        
-        print(f"Knowledge Graph API: Found {len(items)} results for '{skill}' certifications")
-        
-        certifications = []
-        for item in items:
-            result = item.get("result", {})
-            name = result.get("name", "")
-            description = result.get("description", "")
-            detailed_description = result.get("detailedDescription", {})
+            # Get URL from detailed description or construct search URL
+            cert_url = detailed_description.get("url", "")
+            if not cert_url:
+                search_query = f"{name.replace(' ', '+')}+certification"
+                cert_url = f"https://www.google.com/search?q={search_query}"
             
-            # Filter for certification-related entities
-            if any(keyword in name.lower() for keyword in ['certification', 'certificate', 'course', 'training', 'program']):
-                cert_description = detailed_description.get("articleBody", description)
-                if len(cert_description) > 200:
-                    cert_description = cert_description[:200] + "..."
-                
-                # Get URL from detailed description or construct search URL
-                cert_url = detailed_description.get("url", "")
-                if not cert_url:
-                    search_query = f"{name.replace(' ', '+')}+certification"
-                    cert_url = f"https://www.google.com/search?q={search_query}"
-                
-                certifications.append({
-                    "title": name,
-                    "provider": "Professional Certification",
-                    "description": cert_description or f"Professional certification program for {skill}",
-                    "url": cert_url,
-                    "type": "certification",
-                    "skill": skill
-                })
-                
-                if len(certifications) >= max_results:
-                    break
-        
-        # If no certification-specific results, use fallback
-        if not certifications:
-            return get_certifications_fallback(skill, max_results)
+            certifications.append({
+                "title": name,
+                "provider": "Professional Certification",
+                "description": cert_description or f"Professional certification program for {skill}",
+                "url": cert_url,
+                "type": "certification",
+                "skill": skill
+            })
             
-        return certifications
-        
-    except requests.exceptions.Timeout:
-        print("Knowledge Graph API error: Request timeout - using fallback links")
-        return get_certifications_fallback(skill, max_results)
-    except requests.exceptions.ConnectionError:
-        print("Knowledge Graph API error: Connection failed - using fallback links")
-        return get_certifications_fallback(skill, max_results)
-    except Exception as e:
-        print(f"Knowledge Graph API error: {e} - using fallback links")
-        return get_certifications_fallback(skill, max_results)
+            if len(certifications) >= max_results:
+                break
+    
+    return certifications
+
+
+def certifications_request(skill: str, max_results: int):
+    """URL and query parameters of a Knowledge Graph search."""
+    params = certifications_params(skill, max_results)
+    LOG.sampled("certifications.search", "Knowledge Graph API: Searching for '%s' certifications...", skill,
+                level=logging.DEBUG, provider="certifications", skill=skill)
+    return KNOWLEDGE_GRAPH_SEARCH_URL, params
+
+
+def fetch_certifications(skill: str, max_results: int = 3):
+    """Return a list of certification objects using Google Knowledge Graph API.
+    Raises ProviderError when the API can't be used; an empty list means nothing certification-related was found.
+    """
+    return fetch_upstream("certifications", skill, max_results)
+
+
+async def fetch_certifications_async(skill: str, max_results: int = 3):
+    """fetch_certifications on the shared async HTTP client."""
+    return await fetch_upstream_async("certifications", skill, max_results)
 
 
 def get_certifications_fallback(skill: str, max_results: int = 3):
@@ -526,24 +976,526 @@ def get_certifications_fallback(skill: str, max_results: int = 3):
     return fallback_certifications[:max_results]
 
 
+# Provider -> (request builder, response parser): everything in an upstream search but the transport
+UPSTREAM_APIS = {
+    "youtube": (youtube_request, lambda r, skill, max_results: parse_youtube_response(r, skill)),
+    "books": (books_request, lambda r, skill, max_results: parse_books_response(r, skill)),
+    "certifications": (certifications_request, parse_certifications_response),
+}
+
+
+def fetch_upstream(provider: str, skill: str, max_results: int):
+    """One upstream search on the pooled requests session; raises ProviderError when it can't be used."""
+    build, parse = UPSTREAM_APIS[provider]
+    url, params = build(skill, max_results)
+    with provider_errors(provider):
+        return parse(http_get(url, params=params, timeout=8), skill, max_results)
+
+
+async def fetch_upstream_async(provider: str, skill: str, max_results: int):
+    """fetch_upstream on the shared async HTTP client."""
+    build, parse = UPSTREAM_APIS[provider]
+    url, params = build(skill, max_results)
+    with provider_errors(provider):
+        return parse(await async_http_get(url, params=params, timeout=8), skill, max_results)
+
+
+# Resource providers used for every skill: (response field, lookup, fallback)
+PROVIDERS = (
+    ("videos", get_youtube_links, get_youtube_fallback),
+    ("books", get_google_books, get_books_fallback),
+    ("certifications", get_certifications, get_certifications_fallback),
+)
+
+# Response field -> provider name (metrics labels)
+FIELD_PROVIDERS = {"videos": "youtube", "books": "books", "certifications": "certifications"}
+
+# Shared, bounded worker pool so provider calls for all skills run at once
+_fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+_batch_pool = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch")
+
+
+def fetch_skill_resources(skills: List[str], deadline: float = None, pool: ThreadPoolExecutor = None,
+                          missed: set = None):
+    """Look up videos, books and certifications for every skill concurrently.
+
+    All provider calls are submitted at once (to `pool`, the fan-out pool by default)
+    and share a single deadline, so the total wait is roughly that of the slowest call.
+    Calls that have not finished (or that raised) by the deadline are answered from the
+    local fallback builders; skills with a lookup cut off by the deadline are added to
+    `missed`. Returns entries in the same order as `skills`.
+    """
+    results = [None] * len(skills)
+    for index, entry in iter_skill_resources(skills, deadline, pool, missed):
+        results[index] = entry
+    return results
+
+
+def iter_skill_resources(skills: List[str], deadline: float = None, pool: ThreadPoolExecutor = None,
+                         missed: set = None):
+    """Same fan-out as fetch_skill_resources, but yields (index, entry) for each
+    skill as soon as all of its lookups have finished, in completion order.
+    """
+    if pool is None:
+        pool = _fanout_pool
+    ends_at = fanout_deadline(deadline)
+
+    futures = [
+        # Each lookup runs in a copy of the request's context (request ID, timings)
+        [pool.submit(contextvars.copy_context().run, lookup, skill) for _, lookup, _ in PROVIDERS]
+        for skill in skills
+    ]
+    pending_skills = set(range(len(skills)))
+    pending = {f for row in futures for f in row}
+    while pending_skills:
+        remaining = ends_at - time.monotonic()
+        done = ()
+        if remaining > 0 and pending:
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        yield from finished_skills(skills, futures, pending_skills, not done, missed)
+
+
+def fanout_deadline(deadline: float = None) -> float:
+    """Monotonic time at which a fan-out stops waiting (PLAYLIST_DEADLINE_SECONDS from now by default)."""
+    return time.monotonic() + (PLAYLIST_DEADLINE_SECONDS if deadline is None else deadline)
+
+
+def finished_skills(skills: List[str], rows, pending_skills: set, timed_out: bool, missed: set = None):
+    """(index, entry) for each pending skill whose lookups (futures or tasks) have all
+    finished - for every one of them once the deadline has passed."""
+    for index in sorted(pending_skills):
+        row = rows[index]
+        if timed_out or all(f.done() for f in row):
+            pending_skills.discard(index)
+            yield index, skill_entry(skills[index], row, missed)
+
+
+# The same providers awaited on an event loop, in the same order as PROVIDERS
+ASYNC_PROVIDERS = (
+    ("videos", get_youtube_links_async, get_youtube_fallback),
+    ("books", get_google_books_async, get_books_fallback),
+    ("certifications", get_certifications_async, get_certifications_fallback),
+)
+
+
+async def fetch_skill_resources_async(skills: List[str], deadline: float = None, missed: set = None):
+    """fetch_skill_resources as tasks on the running event loop (no pool threads)."""
+    results = [None] * len(skills)
+    async for index, entry in iter_skill_resources_async(skills, deadline, missed):
+        results[index] = entry
+    return results
+
+
+async def iter_skill_resources_async(skills: List[str], deadline: float = None, missed: set = None):
+    """iter_skill_resources on the event loop: every lookup is a task, all of them
+    share the deadline, and (index, entry) pairs are yielded in completion order.
+    """
+    ends_at = fanout_deadline(deadline)
+
+    tasks = [
+        [asyncio.ensure_future(lookup(skill)) for _, lookup, _ in ASYNC_PROVIDERS]
+        for skill in skills
+    ]
+    pending_skills = set(range(len(skills)))
+    pending = {t for row in tasks for t in row}
+    try:
+        while pending_skills:
+            remaining = ends_at - time.monotonic()
+            done = ()
+            if remaining > 0 and pending:
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for item in finished_skills(skills, tasks, pending_skills, not done, missed):
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def skill_entry(skill: str, row, missed: set = None) -> dict:
+    """Collect one skill's provider results, falling back for late or failed lookups
+    (and adding the skill to `missed` if one was late)."""
+    entry = {"skill": skill}
+    for (field, _, fallback), future in zip(PROVIDERS, row):
+        if not future.done():
+            future.cancel()
+            if missed is not None:
+                missed.add(skill)
+            LOG.warning("Fan-out: %s lookup for '%s' missed the deadline - using fallback links", field, skill,
+                        provider=FIELD_PROVIDERS.get(field, field), skill=skill)
+            PROVIDER_FALLBACKS.inc(FIELD_PROVIDERS.get(field, field), "deadline")
+            entry[field] = fallback(skill)
+        elif future.exception() is not None:
+            LOG.warning("Fan-out: %s lookup for '%s' failed: %s - using fallback links", field, skill,
+                        future.exception(), provider=FIELD_PROVIDERS.get(field, field), skill=skill)
+            PROVIDER_FALLBACKS.inc(FIELD_PROVIDERS.get(field, field), "failed")
+            entry[field] = fallback(skill)
+        else:
+            entry[field] = future.result()
+    return entry
+
+
+def uses_fallback_links(entries) -> bool:
+    """True if any provider answered a skill with its fallback links."""
+    return any(
+        entry[field] == fallback(entry["skill"])
+        for entry in entries
+        for field, _, fallback in PROVIDERS
+    )
+
+
+# Serialized playlist responses: key -> (body after the request echo, digest)
+_response_cache = TTLCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def response_cache_key(career: str, known_skills: List[str]):
+    # Known skills by canonical ID: "ML" and "machine learning" share a cached body
+    return resolve_career(career), SKILL_INDEX.keys(known_skills)
+
+
+def invalidate_response_cache():
+    """Drop every cached playlist response.
+    Called when the skill tables change: the precomputed artifact is loaded or Vertex
+    skills are stored. The catalog snapshot is read-only and only changes with a deploy.
+    """
+    _response_cache.clear()
+
+
+def render_playlist_response(career: str, known_skills: List[str], cached):
+    """Join the per-request echo fields with a cached serialized body.
+    Returns (json_text, etag).
+    """
+    tail, digest = cached
+    head = f'{{"career": {json.dumps(career)}, "known_skills": {json.dumps(known_skills)}, '
+    etag = hashlib.blake2b((head + digest).encode(), digest_size=16).hexdigest()
+    return head + tail, f'"{etag}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def skill_gap(skills: List[str], known_skills: List[str]) -> List[str]:
+    """The skills not already known, compared by canonical skill ID."""
+    return SKILL_INDEX.gap(skills, known_skills)
+
+
+def build_playlist_body(career: str, known_skills: List[str], cache_key):
+    """Build and cache the shared part of a playlist response (everything after the echo)."""
+    skills = call_vertex_extract_skills(career)
+    skills_to_learn = skill_gap(skills, known_skills)
+
+    # Build the new format with skills_to_learn array (all lookups run concurrently)
+    with METRICS.span(STAGE_SECONDS, "fanout"):
+        skills_to_learn_array = fetch_skill_resources(skills_to_learn)
+    return cache_playlist_body(cache_key, skills, skills_to_learn, skills_to_learn_array)
+
+
+async def build_playlist_body_async(career: str, known_skills: List[str], cache_key):
+    """build_playlist_body with the skill lookups awaited on the event loop."""
+    skills = await call_vertex_extract_skills_async(career)
+    skills_to_learn = skill_gap(skills, known_skills)
+    with METRICS.span(STAGE_SECONDS, "fanout"):
+        skills_to_learn_array = await fetch_skill_resources_async(skills_to_learn)
+    return cache_playlist_body(cache_key, skills, skills_to_learn, skills_to_learn_array)
+
+
+def cache_playlist_body(cache_key, skills: List[str], skills_to_learn: List[str], skills_to_learn_array,
+                        store: bool = True):
+    """Serialize and cache (unless `store` is False) the shared part of a playlist response."""
+    # Everything after the "career"/"known_skills" echo is shared between requests
+    with METRICS.span(STAGE_SECONDS, "serialize"):
+        tail = json.dumps({
+            "skills_to_learn": skills_to_learn_array,
+            "total_skills": len(skills),
+            "skills_gap": len(skills_to_learn)
+        })[1:]
+    cached = (tail, hashlib.blake2b(tail.encode(), digest_size=16).hexdigest())
+    if store:
+        ttl = RESPONSE_CACHE_DEGRADED_TTL if uses_fallback_links(skills_to_learn_array) else RESPONSE_CACHE_TTL
+        _response_cache.set(cache_key, cached, ttl)
+    return cached
+
+
+def build_batch_bodies(items):
+    """Build playlist bodies for many careers, looking up each unique skill once.
+
+    `items` is a list of (career, known_skills, cache_key). Careers already in the
+    response cache are reused; for the rest, the union of their skill gaps is
+    deduplicated and fetched in a single fan-out on the batch pool, and each
+    career's body is assembled from that shared result set. Bodies with a lookup
+    cut off by the batch deadline are returned but not cached. Returns cached
+    bodies in item order.
+    """
+    bodies = [_response_cache.get(cache_key) for _, _, cache_key in items]
+    misses = [i for i, body in enumerate(bodies) if body is None]
+    if not misses:
+        return bodies
+
+    careers = [items[i][0] for i in misses]
+    skill_lists = list(_batch_pool.map(call_vertex_extract_skills, careers))
+    gaps = [skill_gap(skills, items[i][1]) for i, skills in zip(misses, skill_lists)]
+
+    unique = {}
+    for gap in gaps:
+        for skill in gap:
+            unique.setdefault(SKILL_INDEX.key(skill), skill)
+    LOG.info("Batch: %d careers need %d skills, %d unique", len(misses), sum(map(len, gaps)), len(unique))
+    missed = set()
+    fetched = fetch_skill_resources(list(unique.values()), BATCH_DEADLINE_SECONDS, _batch_pool, missed)
+    resources = dict(zip(unique, fetched))
+    missed = {SKILL_INDEX.key(skill) for skill in missed}
+
+    for i, skills, gap in zip(misses, skill_lists, gaps):
+        entries = [{**resources[SKILL_INDEX.key(skill)], "skill": skill} for skill in gap]
+        complete = not any(SKILL_INDEX.key(skill) in missed for skill in gap)
+        bodies[i] = cache_playlist_body(items[i][2], skills, gap, entries, store=complete)
+    return bodies
+
+
+def stream_format(request) -> Optional[str]:
+    """Streaming mode requested via ?stream=ndjson|sse or the Accept header, else None."""
+    flag = (request.args.get("stream") or "").lower()
+    if flag in ("sse", "event-stream"):
+        return "sse"
+    if flag in ("1", "true", "yes", "ndjson"):
+        return "ndjson"
+    accept = request.headers.get("Accept") or ""
+    if "text/event-stream" in accept:
+        return "sse"
+    if "application/x-ndjson" in accept:
+        return "ndjson"
+    return None
+
+
+STREAM_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def format_event(fmt: str, event: str, data: dict) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+def stream_playlist(career: str, known_skills: List[str], cache_key, fmt: str):
+    """Yield a playlist as a stream of events:
+
+    career - the career, known skills and the full list of skills to learn
+    skill  - one skill's videos/books/certifications with its position in that list,
+             emitted as soon as its lookups finish (completion order)
+    done   - end of stream
+    """
+    try:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            yield from cached_playlist_events(career, known_skills, cached, fmt)
+            return
+
+        stream = PlaylistStream(fmt, career, known_skills, call_vertex_extract_skills(career), cache_key)
+        yield stream.start()
+        for index, entry in iter_skill_resources(stream.skills_to_learn):
+            yield stream.skill(index, entry)
+        yield stream.done()
+    except Exception as e:
+        LOG.exception("Error in stream: %s", e)
+        yield format_event(fmt, "error", {"error": str(e)})
+
+
+async def stream_playlist_async(career: str, known_skills: List[str], cache_key, fmt: str):
+    """stream_playlist as an async generator, with the lookups awaited on the event loop."""
+    try:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            for event in cached_playlist_events(career, known_skills, cached, fmt):
+                yield event
+            return
+
+        stream = PlaylistStream(fmt, career, known_skills, await call_vertex_extract_skills_async(career), cache_key)
+        yield stream.start()
+        async for index, entry in iter_skill_resources_async(stream.skills_to_learn):
+            yield stream.skill(index, entry)
+        yield stream.done()
+    except Exception as e:
+        LOG.exception("Error in stream: %s", e)
+        yield format_event(fmt, "error", {"error": str(e)})
+
+
+class PlaylistStream:
+    """The events of one streamed playlist, built as its skills resolve; the
+    finished playlist is cached when the done event is produced."""
+
+    def __init__(self, fmt: str, career: str, known_skills: List[str], skills: List[str], cache_key):
+        self.fmt = fmt
+        self.career = career
+        self.known_skills = known_skills
+        self.skills = skills
+        self.cache_key = cache_key
+        self.skills_to_learn = skill_gap(skills, known_skills)
+        self.entries = [None] * len(self.skills_to_learn)
+
+    def start(self) -> str:
+        return career_event(self.fmt, self.career, self.known_skills, self.skills_to_learn, len(self.skills))
+
+    def skill(self, index: int, entry: dict) -> str:
+        self.entries[index] = entry
+        return skill_event(self.fmt, index, entry)
+
+    def done(self) -> str:
+        cache_playlist_body(self.cache_key, self.skills, self.skills_to_learn, self.entries)
+        return format_event(self.fmt, "done", {})
+
+
+def cached_playlist_events(career: str, known_skills: List[str], cached, fmt: str):
+    """Replay a cached playlist body as stream events."""
+    playlist = json.loads("{" + cached[0])
+    entries = playlist["skills_to_learn"]
+    yield career_event(fmt, career, known_skills, [entry["skill"] for entry in entries], playlist["total_skills"])
+    for index, entry in enumerate(entries):
+        yield skill_event(fmt, index, entry)
+    yield format_event(fmt, "done", {})
+
+
+def career_event(fmt: str, career: str, known_skills: List[str], skills_to_learn: List[str], total_skills: int):
+    return format_event(fmt, "career", {
+        "career": career,
+        "known_skills": known_skills,
+        "skills": skills_to_learn,
+        "total_skills": total_skills,
+        "skills_gap": len(skills_to_learn),
+    })
+
+
+def skill_event(fmt: str, index: int, entry: dict):
+    return format_event(fmt, "skill", {"index": index, **entry})
+
+
+def breaker_states() -> dict:
+    return {name: breaker.stats() for name, breaker in BREAKERS.items()}
+
+
+def collect_stats() -> dict:
+    """Runtime counters for the backend's shared infrastructure."""
+    return {
+        "http_pool": pool_stats(),
+        "async_http_pool": async_pool_stats(),
+        "provider_cache": {name: cache.stats() for name, cache in PROVIDER_CACHES.items()},
+        "response_cache": _response_cache.stats(),
+        "catalog": CATALOG.stats(),
+        "precomputed": PRECOMPUTED.stats(),
+        "refresh": REFRESHER.stats(),
+        "vertex": VERTEX_MODEL.health(),
+        "learned_skills": LEARNED_SKILLS.stats(),
+        "quota": QUOTA.stats(),
+        "warm_up": WARMUP.report(),
+        "logging": logging_stats(),
+        "breakers": breaker_states(),
+        "coalescing": {
+            "providers": PROVIDER_FLIGHTS.stats(),
+            "vertex": VERTEX_FLIGHTS.stats(),
+            "responses": RESPONSE_FLIGHTS.stats(),
+            "async_providers": ASYNC_PROVIDER_FLIGHTS.stats(),
+            "async_responses": ASYNC_RESPONSE_FLIGHTS.stats(),
+        },
+    }
+
+
+@METRICS.collector
+def export_stats():
+    """Counters kept by the caches, breakers, quota and flights, read at scrape time."""
+    caches = [({"cache": name}, cache.stats()) for name, cache in PROVIDER_CACHES.items()]
+    caches.append(({"cache": "response"}, _response_cache.stats()))
+    for result in ("hits", "misses", "stale_hits"):
+        yield (f"cache_{result}_total", "counter", f"Cache lookups ({result.replace('_', ' ')})",
+               [(labels, stats.get(result, 0)) for labels, stats in caches])
+
+    breakers = breaker_states()
+    yield ("circuit_breaker_open", "gauge", "1 while a provider's breaker is open or half-open",
+           [({"provider": name}, int(state["state"] != "closed")) for name, state in breakers.items()])
+    yield ("circuit_breaker_trips_total", "counter", "Times a provider's breaker opened",
+           [({"provider": name}, state.get("trips", 0)) for name, state in breakers.items()])
+    yield ("circuit_breaker_short_circuited_total", "counter", "Calls skipped while a breaker was open",
+           [({"provider": name}, state.get("short_circuited", 0)) for name, state in breakers.items()])
+
+    flights = {"providers": PROVIDER_FLIGHTS, "vertex": VERTEX_FLIGHTS, "responses": RESPONSE_FLIGHTS,
+               "async_providers": ASYNC_PROVIDER_FLIGHTS, "async_responses": ASYNC_RESPONSE_FLIGHTS}
+    yield ("coalesced_calls_total", "counter", "Callers that waited on an identical in-flight call",
+           [({"group": name}, flight.stats()["coalesced"]) for name, flight in flights.items()])
+
+    quota = QUOTA.stats()
+    yield ("quota_spent_units", "gauge", "Quota units spent in the daily window (shared ledger, as last seen here)",
+           [({"provider": name}, state["spent_units"]) for name, state in quota.items()])
+    yield ("quota_denied_total", "counter", "Upstream calls refused by the local quota guard",
+           [({"provider": name, "reason": reason}, state[f"denied_{reason}"])
+            for name, state in quota.items() for reason in ("budget", "rate", "exhausted")])
+
+    http = pool_stats()
+    yield ("http_pool_requests_total", "counter", "Requests sent through the pooled upstream session",
+           [({"client": "sync"}, http.get("requests", 0)), ({"client": "async"}, async_pool_stats()["requests"])])
+    logs = logging_stats()
+    yield ("log_records_dropped_total", "counter", "Log records dropped because the log queue was full",
+           [({}, logs["dropped"])])
+    yield ("log_records_sampled_out_total", "counter", "High-frequency log lines skipped by sampling",
+           [({}, logs["sampled_out"])])
+    yield ("warm_up_ready", "gauge", "1 once the startup warm-up has finished",
+           [({}, int(not WARMUP.pending))])
+
+
 @functions_framework.http
 def career_playlist(request):
     """HTTP Cloud Function entry point.
     Expects JSON: {"career": "Data Scientist", "known_skills": ["Python"]}
     Returns JSON: {career, playlist: {skill: [video_objs]}}
+    With ?stream=ndjson|sse (or an Accept header of application/x-ndjson or
+    text/event-stream) the playlist is streamed one skill at a time instead.
+    POST /batch with {"careers": [{career, known_skills}, ...]} builds many at once.
     """
-    # Add CORS headers for local development
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type"
-    }
+    warm_up_on_first_request()
+    request_id = new_request_id(request.headers)
+    token = set_request_id(request_id)
+    try:
+        content, status, headers = handle_playlist_request(request)
+        if not isinstance(content, (str, bytes)):
+            # Streamed bodies are generated after this returns, keep their log lines tagged
+            content = iterate_in_context(contextvars.copy_context(), content)
+    finally:
+        reset_request_id(token)
+    headers["X-Request-ID"] = request_id
+    return (content, status, headers)
+
+
+def handle_playlist_request(request):
+    """Route one request for career_playlist; returns (body, status, headers)."""
+    headers = cors_headers()
     
     # Handle preflight requests
     if request.method == 'OPTIONS':
         return ("", 200, headers)
     
+    # Prometheus scrape endpoint
+    if request.method == 'GET' and request.path.rstrip('/').endswith('/metrics'):
+        if not METRICS.enabled:
+            return (json.dumps({"error": "metrics are disabled (METRICS=0)"}), 404, headers)
+        headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        return (METRICS.render(), 200, headers)
+
+    # Runtime statistics (connection pool reuse, etc.)
+    if request.method == 'GET' and request.path.rstrip('/').endswith('/stats'):
+        return (json.dumps(collect_stats()), 200, headers)
+
+    # Readiness: 503 while the startup warm-up is still running
+    if request.method == 'GET' and request.path.rstrip('/').endswith('/ready'):
+        return (json.dumps(WARMUP.report()), 503 if WARMUP.pending else 200, headers)
+
+    # Circuit breaker state per upstream provider
+    if request.method == 'GET' and request.path.rstrip('/').endswith('/breakers'):
+        return (json.dumps(breaker_states()), 200, headers)
+
+    # Batch: {"careers": [{"career": ..., "known_skills": [...]}, ...]}
+    if request.method == 'POST' and request.path.rstrip('/').endswith('/batch'):
+        return batch_playlists(request, headers)
+
     # Handle GET requests for browser testing
     if request.method == 'GET':
         return (json.dumps({
@@ -551,44 +1503,261 @@ def career_playlist(request):
             "usage": "POST with JSON: {\"career\": \"Data Scientist\", \"known_skills\": [\"Python\"]}",
             "features": ["YouTube video recommendations", "Google Books recommendations", "Professional certifications"],
             "available_careers": sorted(list(FALLBACK_SKILLS.keys())),
-            "career_aliases": CAREER_ALIASES,
+            "career_aliases": dict(CAREER_ALIASES),
             "total_careers": len(FALLBACK_SKILLS),
             "status": "online"
         }), 200, headers)
     
     try:
-        payload = request.get_json(silent=True) or {}
-        career = payload.get("career") or payload.get("q") or "Data Scientist"
-        known_skills = payload.get("known_skills", [])
+        career, known_skills, cache_key = playlist_request(request)
 
-        skills = call_vertex_extract_skills(career)
+        # Opt-in streaming: the career and skill list first, then each skill as it resolves
+        fmt = stream_format(request)
+        if fmt is not None:
+            headers.update(stream_headers(fmt))
+            return (stream_playlist(career, known_skills, cache_key, fmt), 200, headers)
 
-        # optional: compute skill gap (very basic)
-        skills_to_learn = [s for s in skills if s.lower() not in [k.lower() for k in known_skills]]
+        with METRICS.request() as timings:
+            cached = _response_cache.get(cache_key)
+            hit = cached is not None
+            if cached is None:
+                # Identical requests arriving together build the playlist once
+                cached = RESPONSE_FLIGHTS.do(cache_key, build_playlist_body, career, known_skills, cache_key)
+            response = playlist_response(request, career, known_skills, cached, headers)
+        add_server_timing(timings, headers, hit)
+        return response
 
-        # Build the new format with skills_to_learn array
-        skills_to_learn_array = []
-        for skill in skills_to_learn:
-            videos = get_youtube_links(skill)
-            books = get_google_books(skill) 
-            certifications = get_certifications(skill)
-            
-            skills_to_learn_array.append({
-                "skill": skill,
-                "videos": videos,
-                "books": books,
-                "certifications": certifications
-            })
+    except Exception as e:
+        return error_response(e, headers)
 
-        response = {
-            "career": career,
-            "known_skills": known_skills,
-            "skills_to_learn": skills_to_learn_array,
-            "total_skills": len(skills),
-            "skills_gap": len(skills_to_learn)
-        }
-        return (json.dumps(response), 200, headers)
+
+async def career_playlist_async(request):
+    """career_playlist for an event loop (asgi.py). Playlist requests, plain or
+    streamed, are built with the async provider clients, so a worker can wait on
+    hundreds of upstream calls at once; every other route runs career_playlist
+    on a thread.
+    """
+    if request.method != 'POST' or request.path.rstrip('/').endswith('/batch'):
+        return await asyncio.to_thread(career_playlist, request)
+    if not WARMUP.started:
+        await asyncio.to_thread(warm_up_on_first_request)
+
+    # Each request runs in its own task (and context), so the ID isn't reset:
+    # a streamed body is generated after this returns
+    request_id = new_request_id(request.headers)
+    set_request_id(request_id)
+    headers = cors_headers()
+    headers["X-Request-ID"] = request_id
+    try:
+        career, known_skills, cache_key = playlist_request(request)
+
+        fmt = stream_format(request)
+        if fmt is not None:
+            headers.update(stream_headers(fmt))
+            return (stream_playlist_async(career, known_skills, cache_key, fmt), 200, headers)
+
+        with METRICS.request() as timings:
+            cached = _response_cache.get(cache_key)
+            hit = cached is not None
+            if cached is None:
+                cached = await ASYNC_RESPONSE_FLIGHTS.do(cache_key, build_playlist_body_async,
+                                                         career, known_skills, cache_key)
+            response = playlist_response(request, career, known_skills, cached, headers)
+        add_server_timing(timings, headers, hit)
+        return response
 
     except Exception as e:
-        print("Error in function:", e)
-        return (json.dumps({"error": str(e)}), 500, headers)
\ No newline at end of file
+        return error_response(e, headers)
+
+
+def playlist_request(request):
+    """(career, known_skills, response cache key) of a playlist request."""
+    payload = request.get_json(silent=True) or {}
+    career = payload.get("career") or payload.get("q") or "Data Scientist"
+    known_skills = payload.get("known_skills", [])
+    # Repeat requests are answered from the serialized response cache
+    return career, known_skills, response_cache_key(career, known_skills)
+
+
+def error_response(error: Exception, headers: dict):
+    LOG.exception("Error in function: %s", error)
+    return (json.dumps({"error": str(error)}), 500, headers)
+
+
+def cors_headers() -> dict:
+    # Add CORS headers for local development
+    return {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type, If-None-Match, Accept, X-Request-ID",
+        "Access-Control-Expose-Headers": "ETag, Server-Timing, X-Request-ID",
+        "Timing-Allow-Origin": "*"
+    }
+
+
+def add_server_timing(timings, headers: dict, cache_hit: bool):
+    """Record the request latency and describe its stages in a Server-Timing header."""
+    if timings is None:
+        return
+    PLAYLIST_SECONDS.observe(timings.elapsed(), "hit" if cache_hit else "miss")
+    if cache_hit:
+        timings.add("cache", 0.0)
+    headers["Server-Timing"] = timings.header()
+
+
+def iterate_in_context(context: contextvars.Context, iterator):
+    """Yield from iterator, running each step in context."""
+    iterator = iter(iterator)
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
+
+
+def stream_headers(fmt: str) -> dict:
+    return {"Content-Type": STREAM_CONTENT_TYPES[fmt], "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def playlist_response(request, career: str, known_skills: List[str], cached, headers):
+    """200 with the rendered playlist, or 304 if the client already has it."""
+    body, etag = render_playlist_response(career, known_skills, cached)
+    headers["ETag"] = etag
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return ("", 304, headers)
+    return (body, 200, headers)
+
+
+def batch_playlists(request, headers):
+    """Playlists for many careers in one request; returns {"results": [...], ...}."""
+    try:
+        payload = request.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload = payload.get("careers")
+        if not isinstance(payload, list) or not payload:
+            return (json.dumps({"error": "Expected JSON: {\"careers\": [{\"career\": ..., \"known_skills\": [...]}]}"}),
+                    400, headers)
+        if len(payload) > BATCH_MAX_CAREERS:
+            return (json.dumps({"error": f"At most {BATCH_MAX_CAREERS} careers per batch"}), 400, headers)
+
+        items = []
+        for entry in payload:
+            if isinstance(entry, str):
+                entry = {"career": entry}
+            if not isinstance(entry, dict):
+                return (json.dumps({"error": "Each batch entry must be a career name or {\"career\": ..., "
+                                             "\"known_skills\": [...]}"}), 400, headers)
+            career = entry.get("career") or entry.get("q") or "Data Scientist"
+            known_skills = entry.get("known_skills", [])
+            items.append((career, known_skills, response_cache_key(career, known_skills)))
+
+        bodies = build_batch_bodies(items)
+        results = [render_playlist_response(career, known_skills, body)[0]
+                   for (career, known_skills, _), body in zip(items, bodies)]
+        return ('{"results": [' + ", ".join(results) + f'], "total_careers": {len(results)}}}', 200, headers)
+
+    except Exception as e:
+        LOG.exception("Error in batch: %s", e)
+        return (json.dumps({"error": str(e)}), 500, headers)
+
+
+def warm_catalog():
+    """Page the memory-mapped catalog in."""
+    skills = sum(len(FALLBACK_SKILLS[name]) for name in FALLBACK_SKILLS)
+    return {"careers": len(FALLBACK_SKILLS), "aliases": len(CAREER_ALIASES), "skills": skills}
+
+
+def warm_career_index():
+    """Run every career and alias through resolution so the memos and code paths are hot."""
+    for name in list(FALLBACK_SKILLS) + list(CAREER_ALIASES):
+        resolve_career(name)
+    CAREER_FUZZY.match("data scienist")
+    return {"memoized": CAREER_INDEX.resolve.cache_info().currsize}
+
+
+def warm_fanout_pool():
+    """Start every fan-out worker thread now rather than during the first playlist."""
+    barrier = Barrier(FANOUT_MAX_WORKERS)
+    futures = [_fanout_pool.submit(barrier.wait, 2) for _ in range(FANOUT_MAX_WORKERS)]
+    wait(futures, timeout=5)
+    return {"workers": len(_fanout_pool._threads)}
+
+
+def warm_precomputed():
+    global PRECOMPUTED
+    if not len(PRECOMPUTED):
+        PRECOMPUTED = load_precomputed(PRECOMPUTED_PATH, PRECOMPUTED_MAX_AGE)
+        invalidate_response_cache()
+    return {"entries": len(PRECOMPUTED)}
+
+
+def warm_http_pool():
+    """Pay the TLS handshakes to the configured providers' hosts up front."""
+    urls = [url for provider, url in PROVIDER_URLS.items() if provider_configured(provider)]
+    return preconnect(urls) if urls else "no API keys configured"
+
+
+def warm_vertex():
+    if not VERTEX_MODEL.available:
+        return "Vertex AI not available"
+    if not VERTEX_MODEL.warm_up():
+        raise RuntimeError(VERTEX_MODEL.health()["last_error"])
+    return {"init_seconds": VERTEX_MODEL.health()["init_seconds"]}
+
+
+WARMUP = WarmUp()
+WARMUP.add("catalog", warm_catalog)
+WARMUP.add("career_index", warm_career_index)
+WARMUP.add("fanout_pool", warm_fanout_pool)
+WARMUP.add("precomputed", warm_precomputed)
+WARMUP.add("http_pool", warm_http_pool)
+if VERTEX_WARM_START:
+    WARMUP.add("vertex", warm_vertex)
+
+
+def warm_up() -> dict:
+    """Run the startup warm-up (once per process) and return the readiness report."""
+    return WARMUP.run()
+
+
+def server_warm_up():
+    """warm_up() for a server process about to accept requests, unless WARM_UP=off."""
+    if WARM_UP_OFF:
+        LOG.info("Warm-up: skipped (WARM_UP=%s)", WARM_UP_MODE)
+        return None
+    return warm_up()
+
+
+def shutdown():
+    """Graceful shutdown, once the server has drained its requests: stop background
+    refreshes and the fan-out pools, then close pooled upstream connections."""
+    REFRESHER.shutdown()
+    _fanout_pool.shutdown(wait=False, cancel_futures=True)
+    _batch_pool.shutdown(wait=False, cancel_futures=True)
+    close_session()
+    LOG.info("Shutdown: background work stopped, upstream connections closed")
+    stop_logging()
+
+
+def warm_up_on_first_request():
+    """Run (or start) the configured warm-up in this process if nothing has yet."""
+    if WARMUP.started or WARM_UP_OFF:
+        return
+    if WARM_UP_MODE in ("1", "true", "yes", "blocking"):
+        warm_up()
+    elif WARM_UP_MODE == "background" or VERTEX_WARM_START:
+        WARMUP.run_in_background()
+
+
+def after_fork():
+    """In a forked child only the forking thread exists: the parent's pool workers are gone
+    (submissions would never run), so start from new pools and an unwarmed process."""
+    global _fanout_pool, _batch_pool
+    _fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout")
+    _batch_pool = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch")
+    REFRESHER.after_fork()
+    WARMUP.reset()
+
+
+os.register_at_fork(after_in_child=after_fork)
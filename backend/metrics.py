@@ -0,0 +1,236 @@
+# backend/metrics.py
+"""
+Latency spans, counters and histograms for the playlist pipeline, exported in
+the Prometheus text format (GET /metrics) and per request as Server-Timing.
+
+    STAGE_SECONDS = METRICS.histogram("playlist_stage_seconds", "...", ("stage",))
+    with METRICS.span(STAGE_SECONDS, "vertex"):
+        ...
+
+A span observes its histogram and, inside a `with METRICS.request()` block,
+is also added to that request's timings (context variables,
+so spans in fan-out threads run in a copied context and in asyncio tasks count too).
+Values that other modules already count (cache hits, breaker trips, quota
+spend) are read by collectors at scrape time rather than on the hot path.
+
+With the registry disabled (METRICS=0), span() returns one shared no-op
+context manager and counters return immediately.
+"""
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NOOP = contextlib.nullcontext()
+_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def label_order(item):
+    """Sort key for (label values, ...) pairs whose values mix str and int."""
+    return tuple(str(value) for value in item[0])
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, registry, name: str, help: str, labels=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def lines(self):
+        with self._lock:
+            values = sorted(self._values.items(), key=label_order)
+        for label_values, value in values:
+            yield f"{self.name}{format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram (seconds) with a fixed set of label names."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def lines(self):
+        with self._lock:
+            series = sorted(((k, list(v)) for k, v in self._series.items()), key=label_order)
+        for label_values, counts in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = format_labels(self.labels + ("le",), label_values + (bound,))
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = format_labels(self.labels, label_values)
+            yield f"{self.name}_count{labels} {cumulative}"
+            yield f"{self.name}_sum{labels} {round(counts[-1], 6)}"
+
+
+class Span:
+    """Times a block into a histogram and the current request's timings."""
+
+    __slots__ = ("histogram", "label", "start")
+
+    def __init__(self, histogram: Histogram, label: str):
+        self.histogram = histogram
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        self.histogram.observe(seconds, self.label)
+        timings = _timings.get()
+        if timings is not None:
+            timings.add(self.label, seconds)
+        return False
+
+
+class RequestTimings:
+    """Spans of one request, rendered as a Server-Timing header."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._spans = {}  # name -> [slowest seconds, calls]
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [seconds, 1]
+            else:
+                span[0] = max(span[0], seconds)
+                span[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """e.g. 'resolve;dur=0.1, youtube;dur=212.5;desc="5 calls", total;dur=240.3'.
+        Repeated spans (one per skill) report the slowest call.
+        """
+        with self._lock:
+            spans = list(self._spans.items())
+        parts = []
+        for name, (seconds, calls) in spans:
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if calls > 1:
+                part += f';desc="{calls} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+class RequestScope:
+    """Makes a fresh RequestTimings current for the duration of a request."""
+
+    def __enter__(self) -> RequestTimings:
+        self.timings = RequestTimings()
+        self.token = _timings.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *exc):
+        _timings.reset(self.token)
+        return False
+
+
+class Metrics:
+    """Registry of counters, histograms and scrape-time collectors."""
+
+    def __init__(self, enabled: bool = True, prefix: str = ""):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._instruments = []
+        self._collectors = []
+
+    def counter(self, name: str, help: str, labels=()) -> Counter:
+        instrument = Counter(self, self.prefix + name, help, labels)
+        self._instruments.append(instrument)
+        return instrument
+
+    def histogram(self, name: str, help: str, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        instrument = Histogram(self, self.prefix + name, help, labels, buckets)
+        self._instruments.append(instrument)
+        return instrument
+
+    def collector(self, fn):
+        """Register fn() -> iterable of (name, kind, help, [(labels dict, value), ...]) read at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def span(self, histogram: Histogram, label: str):
+        if not self.enabled:
+            return _NOOP
+        return Span(histogram, label)
+
+    def request(self):
+        """Context manager collecting the spans of one request; yields its
+        RequestTimings (None when disabled).
+        """
+        if not self.enabled:
+            return _NOOP
+        return RequestScope()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for instrument in self._instruments:
+            lines.append(f"# HELP {instrument.name} {instrument.help}")
+            lines.append(f"# TYPE {instrument.name} {instrument.kind}")
+            lines.extend(instrument.lines())
+        for collect in self._collectors:
+            for name, kind, help, samples in collect():
+                name = self.prefix + name
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{format_labels(tuple(labels), tuple(labels.values()))} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,230 @@
+# backend/precompute.py
+"""
+Precomputed provider results for the built-in career catalog.
+
+The careers in FALLBACK_SKILLS share a small set of skills, so their videos,
+books and certifications can be fetched ahead of time (off-peak) and shipped
+as a compact gzip'd JSON artifact:
+
+    {"version": 1, "generated_at": ..., "complete": true, "max_results": 3,
+     "resources": {"youtube": {"python": [...], ...}, "books": {...}, ...}}
+
+career_playlist serves catalog skills straight from the artifact and only goes
+upstream for skills it doesn't contain.
+
+Run from the backend directory:
+
+    python precompute.py --output precomputed.json.gz --rate 1
+
+Progress is appended to a checkpoint file as each lookup finishes, so an
+interrupted run (Ctrl+C, quota exhausted) picks up where it stopped.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+from cache import normalize_skill
+from snapshot import Snapshot
+from structured_logging import get_logger
+
+ARTIFACT_VERSION = 1
+
+LOG = get_logger("precompute")
+
+
+class PrecomputedResources:
+    """Read-only view of a precomputed artifact."""
+
+    def __init__(self, resources=None, max_results: int = 0, generated_at: float = None, complete: bool = False):
+        self.resources = resources or {}
+        self.max_results = max_results
+        self.generated_at = generated_at
+        self.complete = complete
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, provider: str, skill: str, max_results: int = 3):
+        """Precomputed results for a skill, or None if it has to be looked up live."""
+        results = self.resources.get(provider, {}).get(normalize_skill(skill))
+        if not results or max_results > self.max_results:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return results[:max_results]
+
+    def __len__(self):
+        return sum(len(skills) for skills in self.resources.values())
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "generated_at": self.generated_at,
+            "complete": self.complete,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def load_precomputed(path: str, max_age: float = 0) -> PrecomputedResources:
+    """Load an artifact; a missing, unreadable or too old one gives an empty view.
+    A catalog snapshot (.snap) with embedded resources is served from its mmap.
+    """
+    if not path or not os.path.exists(path):
+        return PrecomputedResources()
+    try:
+        if path.endswith(".snap"):
+            snapshot = Snapshot.open(path)
+            data = dict(snapshot.meta.get("resources") or {}, version=ARTIFACT_VERSION, resources=snapshot.resources)
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+    except Exception as e:
+        LOG.warning("Precomputed: could not read %s: %s - looking everything up live", path, e)
+        return PrecomputedResources()
+    if "generated_at" not in data:
+        return PrecomputedResources()
+    if data.get("version") != ARTIFACT_VERSION:
+        LOG.warning("Precomputed: %s has version %s, expected %d - ignoring it",
+                    path, data.get("version"), ARTIFACT_VERSION)
+        return PrecomputedResources()
+    age = time.time() - data.get("generated_at", 0)
+    if max_age and age > max_age:
+        LOG.warning("Precomputed: %s is %.1f days old - ignoring it", path, age / 86400)
+        return PrecomputedResources()
+    precomputed = PrecomputedResources(data["resources"], data["max_results"], data["generated_at"], data["complete"])
+    LOG.info("Precomputed: loaded %d skill lookups from %s", len(precomputed), path)
+    return precomputed
+
+
+def write_artifact(path: str, resources: dict, max_results: int, complete: bool):
+    """Write the artifact atomically (readers never see a half-written file)."""
+    data = {
+        "version": ARTIFACT_VERSION,
+        "generated_at": time.time(),
+        "complete": complete,
+        "max_results": max_results,
+        "resources": resources,
+    }
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def catalog_skills(careers: dict):
+    """Unique skills across the catalog (first spelling wins), in catalog order."""
+    unique = {}
+    for skills in careers.values():
+        for skill in skills:
+            unique.setdefault(normalize_skill(skill), skill)
+    return unique
+
+
+def read_checkpoint(path: str) -> dict:
+    """provider -> {normalized skill: results} from an earlier, interrupted run."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a killed run
+            done.setdefault(record["provider"], {})[record["skill"]] = record["results"]
+    return done
+
+
+def run_precompute(careers: dict, fetchers: dict, output: str, checkpoint: str = None,
+                   max_results: int = 3, rate: float = 1.0, quota_error=None, sleep=time.sleep) -> bool:
+    """Fetch every (provider, catalog skill) pair once and write the artifact.
+
+    `fetchers` maps provider name -> fetch(skill, max_results), which raises on
+    failure. `rate` caps upstream calls per second. A failure whose exception
+    satisfies `quota_error` stops that provider for this run. Returns True when
+    every pair was fetched (the checkpoint is then removed).
+    """
+    checkpoint = checkpoint or output + ".checkpoint"
+    skills = catalog_skills(careers)
+    resources = read_checkpoint(checkpoint)
+    interval = 1.0 / rate if rate > 0 else 0.0
+    complete = True
+    last_call = None
+
+    with open(checkpoint, "a", encoding="utf-8") as log:
+        for provider, fetch in fetchers.items():
+            done = resources.setdefault(provider, {})
+            todo = [key for key in skills if key not in done]
+            LOG.info("Precompute: %s - %d skills from checkpoint, %d to fetch", provider, len(done), len(todo),
+                     provider=provider)
+            for key in todo:
+                if last_call is not None and interval:
+                    sleep(max(interval - (time.monotonic() - last_call), 0))
+                last_call = time.monotonic()
+                try:
+                    results = fetch(skills[key], max_results)
+                except Exception as e:
+                    complete = False
+                    if quota_error is not None and quota_error(e):
+                        LOG.warning("Precompute: %s quota exhausted - resume later", provider, provider=provider)
+                        break
+                    LOG.warning("Precompute: %s lookup for '%s' failed: %s", provider, skills[key], e,
+                                provider=provider, skill=skills[key])
+                    continue
+                if not results:
+                    complete = False
+                    continue
+                done[key] = results
+                log.write(json.dumps({"provider": provider, "skill": key, "results": results}) + "\n")
+                log.flush()
+
+    write_artifact(output, resources, max_results, complete)
+    LOG.info("Precompute: wrote %d skill lookups to %s%s", sum(len(v) for v in resources.values()), output,
+             "" if complete else " (incomplete - run again to resume)")
+    if complete:
+        os.remove(checkpoint)
+    return complete
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute provider results for the career catalog")
+    parser.add_argument("--output", default=None, help="artifact path (default: PRECOMPUTED_PATH)")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint path (default: <output>.checkpoint)")
+    parser.add_argument("--providers", default="youtube,books,certifications")
+    parser.add_argument("--max-results", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=1.0, help="upstream calls per second")
+    args = parser.parse_args(argv)
+
+    import main as app  # the Cloud Function module: catalog, provider clients, config
+
+    fetch = {
+        "youtube": app.fetch_youtube_links,
+        "books": app.fetch_google_books,
+        "certifications": app.fetch_certifications,
+    }
+    fetchers = {}
+    for provider in args.providers.split(","):
+        if not app.provider_configured(provider):
+            print(f"Precompute: no API key for {provider} - skipping it")
+            continue
+        fetchers[provider] = fetch[provider]
+
+    complete = run_precompute(
+        app.FALLBACK_SKILLS,
+        fetchers,
+        args.output or app.PRECOMPUTED_PATH,
+        checkpoint=args.checkpoint,
+        max_results=args.max_results,
+        rate=args.rate,
+        quota_error=lambda e: getattr(e, "quota_exceeded", False),
+    )
+    return 0 if complete else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+# backend/quota.py
+"""
+Daily quota accounting for the Google APIs.
+
+Every upstream call is admitted (or refused) before it is made:
+
+- units spent per provider are counted per quota day (Google resets quotas at
+  midnight Pacific time; QUOTA_RESET_TIMEZONE overrides it)
+- once spending reaches `soft_limit` of the daily quota, calls are refused and
+  callers serve cached or fallback results instead
+- the rest of the budget is spread over the remaining day with a token bucket,
+  so a morning spike can't burn the whole day's quota
+- a quota 403 from the API marks the provider exhausted until the window resets,
+  instead of paying a round-trip per skill to rediscover it
+
+Units spent and the exhausted flag are kept in a ledger shared by every worker
+and instance using the same backend (chosen with QUOTA_STORE, like the learned
+skills store), so the daily quota is the project's, not each process's:
+  firestore - Firestore document per provider, shared by every instance
+  sqlite    - local SQLite file, shared by workers on one machine
+  memory    - per-process counts
+The token bucket pacing is per process.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from structured_logging import get_logger
+
+LOG = get_logger("quota")
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover - Python < 3.9
+    ZoneInfo = None
+
+
+def resolve_timezone(name: str):
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            pass
+    # No tz database available: fixed Pacific standard time
+    return timezone(timedelta(hours=-8))
+
+
+class MemoryQuotaLedger:
+    """Per-process ledger (used when no shared backend is available)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, provider: str, window: str, units: int, limit: float):
+        """Add `units` to the window's spend unless that passes `limit` or the provider
+        is exhausted; returns (reserved, units spent, exhausted)."""
+        with self._lock:
+            spent, exhausted = self._rows.get((provider, window), (0, False))
+            if exhausted or spent + units > limit:
+                return False, spent, exhausted
+            self._rows[(provider, window)] = (spent + units, False)
+            return True, spent + units, False
+
+    def mark_exhausted(self, provider: str, window: str):
+        with self._lock:
+            spent, _ = self._rows.get((provider, window), (0, False))
+            self._rows[(provider, window)] = (spent, True)
+
+
+class SQLiteQuotaLedger:
+    """Ledger in a local SQLite file, shared by the worker processes on one machine."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork: each worker process opens its own
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota_ledger ("
+                " provider TEXT PRIMARY KEY, window TEXT NOT NULL, spent INTEGER NOT NULL, exhausted INTEGER NOT NULL)"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def _row(self, conn, provider: str, window: str):
+        row = conn.execute("SELECT window, spent, exhausted FROM quota_ledger WHERE provider = ?",
+                           (provider,)).fetchone()
+        if row is None or row[0] != window:
+            return 0, False
+        return row[1], bool(row[2])
+
+    def reserve(self, provider: str, window: str, units: int, limit: float):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                spent, exhausted = self._row(conn, provider, window)
+                if exhausted or spent + units > limit:
+                    return False, spent, exhausted
+                conn.execute("INSERT OR REPLACE INTO quota_ledger (provider, window, spent, exhausted) "
+                             "VALUES (?, ?, ?, 0)", (provider, window, spent + units))
+                return True, spent + units, False
+            finally:
+                conn.execute("COMMIT")
+
+    def mark_exhausted(self, provider: str, window: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                spent, _ = self._row(conn, provider, window)
+                conn.execute("INSERT OR REPLACE INTO quota_ledger (provider, window, spent, exhausted) "
+                             "VALUES (?, ?, ?, 1)", (provider, window, spent))
+            finally:
+                conn.execute("COMMIT")
+
+
+class FirestoreQuotaLedger:
+    """Ledger in a Firestore collection (one document per provider), shared by every instance."""
+
+    name = "firestore"
+
+    def __init__(self, collection: str = "quota_ledger", project: str = None):
+        from google.cloud import firestore
+        self._firestore = firestore
+        self._client = firestore.Client(project=project)
+        self._collection = self._client.collection(collection)
+
+    def _update(self, provider: str, window: str, change):
+        ref = self._collection.document(provider)
+
+        @self._firestore.transactional
+        def apply(transaction):
+            snapshot = ref.get(transaction=transaction)
+            data = snapshot.to_dict() if snapshot.exists else None
+            if data is None or data.get("window") != window:
+                data = {"window": window, "spent": 0, "exhausted": False}
+            result, data = change(data)
+            if data is not None:
+                transaction.set(ref, data)
+            return result
+
+        return apply(self._client.transaction())
+
+    def reserve(self, provider: str, window: str, units: int, limit: float):
+        def change(data):
+            if data["exhausted"] or data["spent"] + units > limit:
+                return (False, data["spent"], data["exhausted"]), None
+            data["spent"] += units
+            return (True, data["spent"], False), data
+
+        return self._update(provider, window, change)
+
+    def mark_exhausted(self, provider: str, window: str):
+        self._update(provider, window, lambda data: (None, {**data, "exhausted": True}))
+
+
+def build_quota_ledger(kind: str, path: str = None, collection: str = "quota_ledger", project: str = None):
+    """Create the configured ledger, falling back to memory if it can't be opened."""
+    try:
+        if kind == "firestore":
+            return FirestoreQuotaLedger(collection, project)
+        if kind == "sqlite":
+            return SQLiteQuotaLedger(path)
+    except Exception as e:
+        LOG.warning("Quota ledger: %s unavailable (%s) - counting per process", kind, e)
+    return MemoryQuotaLedger()
+
+
+class ProviderBudget:
+    """Quota window, soft limit and token bucket for one provider."""
+
+    def __init__(self, name: str, daily_units: int, cost: int, soft_limit: float = 0.9,
+                 burst_calls: int = 20, tz=timezone.utc, clock=time.time, ledger=None):
+        self.name = name
+        self.daily_units = daily_units
+        self.cost = cost
+        self.soft_limit = soft_limit
+        self.burst_units = burst_calls * cost
+        self.tz = tz
+        self.clock = clock
+        self.ledger = ledger if ledger is not None else MemoryQuotaLedger()
+        self._lock = threading.Lock()
+        self._window = None
+        self._window_end = 0.0
+        self.spent = 0  # last known spend in the ledger (every process's)
+        self.exhausted = False
+        self._tokens = 0.0
+        self._last_refill = 0.0
+        self.admitted = 0
+        self.denied_budget = 0
+        self.denied_rate = 0
+        self.denied_exhausted = 0
+        self.ledger_errors = 0
+
+    @property
+    def budget_units(self) -> float:
+        return self.daily_units * self.soft_limit
+
+    def _window_bounds(self, now: float):
+        local = datetime.fromtimestamp(now, self.tz)
+        reset = (local + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return local.date(), reset.timestamp()
+
+    def _roll(self, now: float):
+        window, self._window_end = self._window_bounds(now)
+        if window != self._window:
+            self._window = window
+            self.spent = 0
+            self.exhausted = False
+            self._tokens = float(self.burst_units)
+            self._last_refill = now
+
+    def _refill(self, now: float):
+        remaining = max(self.budget_units - self.spent, 0)
+        rate = remaining / max(self._window_end - now, 1.0)
+        self._tokens = min(float(self.burst_units), self._tokens + rate * (now - self._last_refill))
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Reserve one call's worth of units; False means don't call the API."""
+        with self._lock:
+            now = self.clock()
+            self._roll(now)
+            if self.exhausted:
+                self.denied_exhausted += 1
+                return False
+            if self.spent + self.cost > self.budget_units:
+                self.denied_budget += 1
+                return False
+            self._refill(now)
+            if self._tokens < self.cost:
+                self.denied_rate += 1
+                return False
+            self._tokens -= self.cost
+            window = self._window
+
+        # The ledger call may be a network round-trip; other threads keep checking the bucket
+        try:
+            reserved, spent, exhausted = self.ledger.reserve(self.name, str(window), self.cost, self.budget_units)
+        except Exception as e:
+            LOG.warning("Quota ledger error: %s - counting %s locally", e, self.name, provider=self.name)
+            with self._lock:
+                self.ledger_errors += 1
+                reserved, spent, exhausted = True, self.spent + self.cost, False
+
+        with self._lock:
+            if window == self._window:
+                self.spent = max(self.spent, spent)
+                self.exhausted = self.exhausted or exhausted
+            if not reserved:
+                self._tokens += self.cost
+                if exhausted:
+                    self.denied_exhausted += 1
+                else:
+                    self.denied_budget += 1
+                return False
+            self.admitted += 1
+            return True
+
+    def mark_exhausted(self):
+        """The API reported the quota as exceeded: stop calling until the window resets
+        (in every process sharing the ledger)."""
+        with self._lock:
+            self._roll(self.clock())
+            if not self.exhausted:
+                LOG.warning("Quota: %s quota exhausted - serving cached/fallback results until reset", self.name,
+                            provider=self.name)
+            self.exhausted = True
+            window = self._window
+        try:
+            self.ledger.mark_exhausted(self.name, str(window))
+        except Exception as e:
+            with self._lock:
+                self.ledger_errors += 1
+            LOG.warning("Quota ledger error: %s - %s exhausted in this process only", e, self.name,
+                        provider=self.name)
+
+    def is_exhausted(self) -> bool:
+        with self._lock:
+            self._roll(self.clock())
+            return self.exhausted
+
+    def headroom(self) -> float:
+        """Fraction of today's budget still unspent (0 when exhausted)."""
+        with self._lock:
+            self._roll(self.clock())
+            if self.exhausted:
+                return 0.0
+            return max(self.budget_units - self.spent, 0) / self.budget_units if self.budget_units else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._roll(self.clock())
+            return {
+                "window": str(self._window),
+                "resets_in_seconds": int(self._window_end - self.clock()),
+                "daily_units": self.daily_units,
+                "budget_units": self.budget_units,
+                "spent_units": self.spent,
+                "exhausted": self.exhausted,
+                "admitted": self.admitted,
+                "denied_budget": self.denied_budget,
+                "denied_rate": self.denied_rate,
+                "denied_exhausted": self.denied_exhausted,
+                "ledger": self.ledger.name,
+                "ledger_errors": self.ledger_errors,
+            }
+
+
+class QuotaManager:
+    """Budgets for every quota-limited provider."""
+
+    def __init__(self, budgets):
+        self.budgets = {budget.name: budget for budget in budgets}
+
+    def try_acquire(self, provider: str) -> bool:
+        budget = self.budgets.get(provider)
+        return budget.try_acquire() if budget is not None else True
+
+    def mark_exhausted(self, provider: str):
+        budget = self.budgets.get(provider)
+        if budget is not None:
+            budget.mark_exhausted()
+
+    def is_exhausted(self, provider: str) -> bool:
+        budget = self.budgets.get(provider)
+        return budget is not None and budget.is_exhausted()
+
+    def headroom(self, provider: str) -> float:
+        budget = self.budgets.get(provider)
+        return budget.headroom() if budget is not None else 1.0
+
+    def stats(self) -> dict:
+        return {name: budget.stats() for name, budget in self.budgets.items()}
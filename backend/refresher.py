@@ -0,0 +1,104 @@
+# backend/refresher.py
+"""
+Background refresh of stale cache entries (stale-while-revalidate).
+
+Requests are answered from the stale value straight away and the refresh is
+handed to a small worker pool here:
+
+- at most one refresh per key is queued or running at a time
+- at most `max_pending` refreshes are queued; beyond that they are dropped
+  (the next request for that key will ask again)
+- after a failed refresh the key is left alone for `retry_after` seconds, so a
+  failing API isn't retried on every request; the stale value keeps being served
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from structured_logging import get_logger
+
+LOG = get_logger("refresher")
+
+
+class BackgroundRefresher:
+    """Bounded, deduplicating pool for background refreshes."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64, retry_after: float = 60.0,
+                 clock=time.monotonic):
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.clock = clock
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._failed_at = {}
+        self._closed = False
+        self.scheduled = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.backed_off = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    def submit(self, key, fn, *args, **kwargs) -> bool:
+        """Schedule fn(*args, **kwargs) to refresh `key`; False if it was not scheduled."""
+        with self._lock:
+            if self._closed:
+                return False
+            if key in self._pending:
+                self.deduplicated += 1
+                return False
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None and self.clock() - failed_at < self.retry_after:
+                self.backed_off += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending.add(key)
+            self.scheduled += 1
+        self._pool.submit(self._run, key, fn, args, kwargs)
+        return True
+
+    def _run(self, key, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            LOG.warning("Refresh: %s failed: %s - keeping the cached value", key, e)
+            with self._lock:
+                self.failed += 1
+                if len(self._failed_at) > 10000:
+                    self._failed_at.clear()
+                self._failed_at[key] = self.clock()
+        else:
+            with self._lock:
+                self.succeeded += 1
+                self._failed_at.pop(key, None)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def after_fork(self):
+        """In a forked child: the parent's worker threads don't exist here, start a new pool."""
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="refresh")
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def shutdown(self):
+        """Stop accepting refreshes and drop the queued ones; running ones finish."""
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "scheduled": self.scheduled,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped,
+                "backed_off": self.backed_off,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+            }
@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
 """
-Simple Flask server to run the backend for testing
+Flask server for the backend
+
+    python server.py          # production: gunicorn workers (see gunicorn.conf.py)
+    python server.py --dev    # development: Werkzeug with the reloader and debugger
 """
-from main import career_playlist
+from main import career_playlist, server_warm_up
 from flask import Flask, request
+import importlib.util
 import json
+import os
+import sys
 
 app = Flask(__name__)
 
@@ -13,10 +19,69 @@ def handle_request():
     """Handle all requests and pass them to the career_playlist function"""
     return career_playlist(request)
 
+@app.route('/batch', methods=['POST', 'OPTIONS'])
+def handle_batch():
+    """Build playlists for many careers in one request"""
+    return career_playlist(request)
+
+@app.route('/stats', methods=['GET'])
+def handle_stats():
+    """Expose runtime statistics (connection pool reuse, etc.)"""
+    return career_playlist(request)
+
+@app.route('/ready', methods=['GET'])
+def handle_ready():
+    """Readiness: 503 until the startup warm-up has finished"""
+    return career_playlist(request)
+
+@app.route('/breakers', methods=['GET'])
+def handle_breakers():
+    """Expose circuit breaker state per upstream provider"""
+    return career_playlist(request)
+
+@app.route('/metrics', methods=['GET'])
+def handle_metrics():
+    """Prometheus metrics: stage and upstream latency, cache, breaker and quota counters"""
+    return career_playlist(request)
+
+def run_production(port):
+    """gunicorn (gunicorn.conf.py) where it runs, uvicorn on Windows, else Werkzeug without the debugger"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    if os.name != "nt" and importlib.util.find_spec("gunicorn") is not None:
+        # Replace this process: gunicorn's master must not inherit main.py's
+        # thread pools or pooled sockets, each worker imports it after fork()
+        sys.stdout.flush()
+        os.execv(sys.executable, [sys.executable, "-m", "gunicorn", "--chdir", here,
+                                  "-c", os.path.join(here, "gunicorn.conf.py")])
+
+    try:
+        import uvicorn
+    except ImportError:
+        uvicorn = None
+    if uvicorn is not None:
+        return uvicorn.run(
+            "asgi:app", app_dir=here, host='0.0.0.0', port=port,
+            workers=int(os.getenv("WEB_CONCURRENCY", "2")),
+            timeout_keep_alive=int(os.getenv("KEEP_ALIVE", "75")),
+            timeout_graceful_shutdown=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        )
+
+    print("⚠️ gunicorn/uvicorn not installed (pip install -r requirements-server.txt) - using Werkzeug")
+    server_warm_up()
+    app.run(host='0.0.0.0', port=port, threaded=True)
+
+
 if __name__ == '__main__':
+    port = int(os.getenv("PORT", "8080"))
+    dev = "--dev" in sys.argv[1:] or os.getenv("FLASK_DEBUG", "").lower() in ("1", "true", "yes")
     print("🚀 Starting AI Career Playlist Builder Backend...")
-    print("🌐 Server will run on: http://localhost:8080")
+    print(f"🌐 Server will run on: http://localhost:{port}")
     print("✅ CORS enabled for frontend communication")
-    print("📡 Endpoints: GET / and POST /")
+    print("📡 Endpoints: GET / and POST /, POST /batch, GET /stats, GET /ready, GET /breakers, GET /metrics")
     print("=" * 50)
-    app.run(host='0.0.0.0', port=8080, debug=True)
\ No newline at end of file
+    if dev:
+        # Development: single process with the reloader and debugger
+        server_warm_up()
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        run_production(port)
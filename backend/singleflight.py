@@ -0,0 +1,88 @@
+# backend/singleflight.py
+"""
+Request coalescing ("single flight") for identical in-flight lookups.
+
+The first caller for a key runs the function; callers arriving with the same
+key while it is still running wait on the same future and get its result (or
+its exception) instead of issuing a duplicate upstream call. Nothing is kept
+once the call finishes - caching is a separate layer.
+
+AsyncSingleFlight does the same for coroutines running on one event loop.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Share one in-flight call per key between concurrent callers."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs), or wait for the identical call already running."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines: concurrent awaits of one key share a task."""
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs), or the identical call already in flight."""
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # A caller giving up (deadline) must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
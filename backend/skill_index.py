@@ -0,0 +1,67 @@
+# backend/skill_index.py
+"""
+Canonical skill IDs.
+
+Built once from the catalog's skills and skill aliases ("ML" -> "Machine
+Learning", "JS" -> "JavaScript"), as one map from normalized name (case-folded,
+whitespace collapsed) to a small integer ID. Spellings of the same skill share
+an ID, so the skill gap is a set difference and cache keys built from IDs hit
+for every spelling.
+
+Names outside the table (skills generated by Vertex, free-form known skills)
+are keyed by their normalized text instead of getting new IDs, so the table
+never grows with user input.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Union
+
+from cache import normalize_skill
+
+SkillKey = Union[int, str]
+
+
+class SkillIndex:
+    """Normalized skill name -> canonical ID, with the canonical name for each ID."""
+
+    def __init__(self, skills: Iterable[str], aliases: Dict[str, str] = None):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for skill in skills:
+            self._intern(skill)
+        # Aliases override a catalog spelling of the same name ("ML" listed as its own skill)
+        for alias, target in (aliases or {}).items():
+            self.ids[normalize_skill(alias)] = self._intern(target)
+        # Catalog and alias spellings as written skip normalization (most skills compared are these)
+        self.exact = {name: self.ids[normalize_skill(name)] for name in [*self.names, *(aliases or {})]}
+
+    def _intern(self, name: str) -> int:
+        key = normalize_skill(name)
+        skill_id = self.ids.get(key)
+        if skill_id is None:
+            skill_id = self.ids[key] = len(self.names)
+            self.names.append(name)
+        return skill_id
+
+    def __len__(self):
+        return len(self.names)
+
+    def key(self, name: str) -> SkillKey:
+        """The skill's canonical ID, or its normalized name if it isn't in the table."""
+        skill_id = self.exact.get(name)
+        if skill_id is not None:
+            return skill_id
+        normalized = normalize_skill(name)
+        return self.ids.get(normalized, normalized)
+
+    def keys(self, names: Iterable[str]) -> FrozenSet[SkillKey]:
+        return frozenset(self.key(name) for name in names)
+
+    def canonical(self, name: str) -> str:
+        """The normalized canonical name; stable across catalog edits, so safe for persistent keys."""
+        normalized = normalize_skill(name)
+        skill_id = self.ids.get(normalized)
+        return normalized if skill_id is None else normalize_skill(self.names[skill_id])
+
+    def gap(self, skills: List[str], known: Iterable[str]) -> List[str]:
+        """Skills (in order) whose canonical key is not among the known skills'."""
+        known_keys = self.keys(known)
+        return [skill for skill in skills if self.key(skill) not in known_keys]
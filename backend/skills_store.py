@@ -0,0 +1,306 @@
+# backend/skills_store.py
+"""
+Persistent store for skills generated by Vertex for careers that are not in
+FALLBACK_SKILLS, so each unknown career is only generated once.
+
+Backends (chosen with SKILLS_STORE):
+  firestore - Firestore collection, shared by every instance (production)
+  sqlite    - local SQLite file, shared by workers on one machine (default)
+  memory    - per-process dict
+
+LearnedSkills adds the policy on top: entries older than the TTL are served
+while one background refresh replaces them, and concurrent first requests for
+the same career wait for a single generation instead of each calling the model.
+Within a process this is a per-career lock; across processes/instances the
+store hands out a short lease to the one caller allowed to generate.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from structured_logging import get_logger
+
+LOG = get_logger("skills_store")
+
+
+class MemorySkillsStore:
+    """Per-process store (used when no persistent backend is available)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._data = {}
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def get(self, career: str) -> Optional[Tuple[List[str], float]]:
+        return self._data.get(career)
+
+    def put(self, career: str, skills: List[str]):
+        self._data[career] = (list(skills), time.time())
+
+    def acquire_lease(self, career: str, seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._leases.get(career, 0) > now:
+                return False
+            self._leases[career] = now + seconds
+            return True
+
+    def release_lease(self, career: str):
+        self._leases.pop(career, None)
+
+
+class SQLiteSkillsStore:
+    """Local stand-in for Firestore, safe to share between worker processes."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS learned_skills ("
+                " career TEXT PRIMARY KEY, skills TEXT NOT NULL, generated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (career TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, career: str) -> Optional[Tuple[List[str], float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT skills, generated_at FROM learned_skills WHERE career = ?", (career,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, career: str, skills: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO learned_skills (career, skills, generated_at) VALUES (?, ?, ?)",
+                (career, json.dumps(skills), time.time()),
+            )
+            self._conn.commit()
+
+    def acquire_lease(self, career: str, seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE career = ? AND expires_at <= ?", (career, now))
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO leases (career, expires_at) VALUES (?, ?)", (career, now + seconds)
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def release_lease(self, career: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE career = ?", (career,))
+            self._conn.commit()
+
+
+class FirestoreSkillsStore:
+    """Learned skills in a Firestore collection, leases in a sibling collection."""
+
+    name = "firestore"
+
+    def __init__(self, collection: str = "learned_skills", project: str = None):
+        from google.cloud import firestore
+        self._firestore = firestore
+        self._client = firestore.Client(project=project)
+        self._skills = self._client.collection(collection)
+        self._leases = self._client.collection(f"{collection}_leases")
+
+    @staticmethod
+    def _doc_id(career: str) -> str:
+        # Career names may contain "/" (e.g. "ui/ux designer"), which Firestore ids can't
+        return hashlib.sha1(career.encode()).hexdigest()
+
+    def get(self, career: str) -> Optional[Tuple[List[str], float]]:
+        doc = self._skills.document(self._doc_id(career)).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return data["skills"], data["generated_at"]
+
+    def put(self, career: str, skills: List[str]):
+        self._skills.document(self._doc_id(career)).set({
+            "career": career,
+            "skills": list(skills),
+            "generated_at": time.time(),
+        })
+
+    def acquire_lease(self, career: str, seconds: float) -> bool:
+        ref = self._leases.document(self._doc_id(career))
+
+        @self._firestore.transactional
+        def claim(transaction):
+            now = time.time()
+            snapshot = ref.get(transaction=transaction)
+            if snapshot.exists and snapshot.get("expires_at") > now:
+                return False
+            transaction.set(ref, {"career": career, "expires_at": now + seconds})
+            return True
+
+        return claim(self._client.transaction())
+
+    def release_lease(self, career: str):
+        self._leases.document(self._doc_id(career)).delete()
+
+
+def build_skills_store(kind: str, path: str = None, collection: str = "learned_skills", project: str = None):
+    """Create the configured backend, falling back to memory if it can't be opened."""
+    try:
+        if kind == "firestore":
+            return FirestoreSkillsStore(collection, project)
+        if kind == "sqlite":
+            return SQLiteSkillsStore(path)
+    except Exception as e:
+        LOG.warning("Learned skills store: %s unavailable (%s) - using memory only", kind, e)
+    return MemorySkillsStore()
+
+
+class LearnedSkills:
+    """TTL, background refresh and stampede protection over a skills store."""
+
+    def __init__(self, store, ttl: float, lease_seconds: float = 30.0, wait_timeout: float = 20.0,
+                 on_write: Callable[[str], None] = None):
+        self.store = store
+        self.ttl = ttl
+        # Called with the career after its (re)generated skills are stored
+        self.on_write = on_write
+        self.lease_seconds = lease_seconds
+        self.wait_timeout = wait_timeout
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def _read(self, career: str):
+        try:
+            return self.store.get(career)
+        except Exception as e:
+            self.errors += 1
+            LOG.warning("Learned skills store read error: %s", e)
+            return None
+
+    def _write(self, career: str, skills: List[str]):
+        try:
+            self.store.put(career, skills)
+        except Exception as e:
+            self.errors += 1
+            LOG.warning("Learned skills store write error: %s", e)
+
+    def _acquire_lease(self, career: str) -> bool:
+        try:
+            return self.store.acquire_lease(career, self.lease_seconds)
+        except Exception as e:
+            self.errors += 1
+            LOG.warning("Learned skills lease error: %s", e)
+            return True
+
+    def _release_lease(self, career: str):
+        try:
+            self.store.release_lease(career)
+        except Exception as e:
+            self.errors += 1
+            LOG.warning("Learned skills lease error: %s", e)
+
+    def get(self, career: str, generate: Callable[[], Optional[List[str]]]) -> Optional[List[str]]:
+        """Stored skills for `career`, generating (once) if there are none.
+        `generate` returns a skill list, or None if generation failed (nothing is stored).
+        """
+        record = self._read(career)
+        if record is not None:
+            skills, generated_at = record
+            if time.time() - generated_at > self.ttl:
+                self._refresh_in_background(career, generate)
+            self.hits += 1
+            return skills
+
+        self.misses += 1
+        with self._locks_guard:
+            lock = self._locks.setdefault(career, threading.Lock())
+        with lock:
+            try:
+                # Another thread in this process may have generated it while we waited
+                record = self._read(career)
+                if record is not None:
+                    self.coalesced += 1
+                    return record[0]
+
+                leased = self._acquire_lease(career)
+                if not leased:
+                    # Another instance is generating it; give it a chance to finish
+                    record = self._wait_for_record(career)
+                    if record is not None:
+                        self.coalesced += 1
+                        return record[0]
+                return self._generate(career, generate, leased)
+            finally:
+                with self._locks_guard:
+                    if self._locks.get(career) is lock:
+                        del self._locks[career]
+
+    def _generate(self, career: str, generate, leased: bool) -> Optional[List[str]]:
+        try:
+            skills = generate()
+            if skills:
+                self._write(career, skills)
+                self.generated += 1
+                if self.on_write is not None:
+                    self.on_write(career)
+            return skills
+        finally:
+            if leased:
+                self._release_lease(career)
+
+    def _wait_for_record(self, career: str):
+        deadline = time.time() + self.wait_timeout
+        while time.time() < deadline:
+            time.sleep(0.2)
+            record = self._read(career)
+            if record is not None:
+                return record
+        return None
+
+    def _refresh_in_background(self, career: str, generate):
+        with self._locks_guard:
+            if career in self._refreshing:
+                return
+            self._refreshing.add(career)
+
+        def refresh():
+            try:
+                if self._acquire_lease(career):
+                    self.refreshes += 1
+                    self._generate(career, generate, True)
+            finally:
+                with self._locks_guard:
+                    self._refreshing.discard(career)
+
+        threading.Thread(target=refresh, name="learned-skills-refresh", daemon=True).start()
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.store.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+        }
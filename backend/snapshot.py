@@ -0,0 +1,376 @@
+# backend/snapshot.py
+"""
+Compact, memory-mapped snapshot of the career catalog and cached resources.
+
+The catalog (careers -> skills, aliases) lives in catalog.json and is compiled
+into catalog.snap. Workers mmap the snapshot read-only, so every process on a
+host shares one copy through the page cache instead of parsing and holding its
+own dicts. Lookups binary-search the mmap; nothing is decoded up front.
+
+Layout (little-endian u32 unless noted):
+
+    header     magic "CPSNAP\\0\\1", version, meta, strings, pool, careers, aliases, providers, reserved
+    pool       count, u32[count] - string ids referenced by the tables below
+    careers    count, (name, pool_start, skill_count)[count], sorted_order[count]
+    aliases    count, (alias, career)[count], sorted_order[count]
+    providers  count, (name, table_offset)[count]
+    resources  per provider: count, (skill, pool_start, resource_count)[count] sorted by skill;
+               in the pool each resource is field_count, (key, kind, value)[field_count]
+               where kind 0 = string, 1 = JSON-encoded value
+    strings    count, offsets[count + 1], UTF-8 data (each distinct string stored once)
+
+The header fields after the version are offsets of each section; `meta` is the
+id of a JSON string (source digest, generation time, resource settings, and the
+catalog's small skill alias table).
+Records keep the source order; `sorted_order` lists them by UTF-8 key for lookups.
+
+Rebuild after editing catalog.json (or to embed precomputed resources):
+
+    python snapshot.py [--resources precomputed.json.gz]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from collections.abc import Mapping
+
+from structured_logging import get_logger
+
+MAGIC = b"CPSNAP\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8s8I")
+
+LOG = get_logger("snapshot")
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(BACKEND_DIR, "catalog.json")
+DEFAULT_SNAPSHOT = os.path.join(BACKEND_DIR, "catalog.snap")
+
+
+def source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+class _Writer:
+    """Collects interned strings and the id pool while the tables are laid out."""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+        self.pool = []
+
+    def intern(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text.encode("utf-8"))
+        return sid
+
+    def extend_pool(self, ids) -> int:
+        start = len(self.pool)
+        self.pool.extend(ids)
+        return start
+
+
+def _keyed_table(writer, records):
+    """count, records, sorted order - records are tuples whose first item is a string id."""
+    order = sorted(range(len(records)), key=lambda i: writer.strings[records[i][0]])
+    width = len(records[0]) if records else 0
+    return struct.pack(f"<I{len(records) * width}I{len(order)}I", len(records),
+                       *(v for record in records for v in record), *order)
+
+
+def _resource_table(writer, skills: dict):
+    records = []
+    for skill in sorted(skills, key=lambda s: s.encode("utf-8")):
+        entries = []
+        for resource in skills[skill]:
+            entries.append(len(resource))
+            for key, value in resource.items():
+                kind = 0 if isinstance(value, str) else 1
+                entries.extend((writer.intern(key), kind,
+                                writer.intern(value if kind == 0 else json.dumps(value, separators=(",", ":")))))
+        records.append((writer.intern(skill), writer.extend_pool(entries), len(skills[skill])))
+    return struct.pack(f"<I{len(records) * 3}I", len(records), *(v for record in records for v in record))
+
+
+def build_snapshot(careers: dict, aliases: dict, resources: dict = None, meta: dict = None) -> bytes:
+    """Serialize a catalog (and optionally provider -> skill -> resources) to snapshot bytes."""
+    writer = _Writer()
+    meta_sid = writer.intern(json.dumps(meta or {}, sort_keys=True))
+    career_records = [
+        (writer.intern(name), writer.extend_pool([writer.intern(s) for s in skills]), len(skills))
+        for name, skills in careers.items()
+    ]
+    alias_records = [(writer.intern(alias), writer.intern(target)) for alias, target in aliases.items()]
+    provider_tables = [(writer.intern(p), _resource_table(writer, skills)) for p, skills in (resources or {}).items()]
+
+    careers_blob = _keyed_table(writer, career_records)
+    aliases_blob = _keyed_table(writer, alias_records)
+    pool_blob = struct.pack(f"<I{len(writer.pool)}I", len(writer.pool), *writer.pool)
+
+    offsets, position = [], 0
+    for data in writer.strings:
+        offsets.append(position)
+        position += len(data)
+    offsets.append(position)
+    strings_blob = struct.pack(f"<I{len(offsets)}I", len(writer.strings), *offsets) + b"".join(writer.strings)
+
+    # Sections in file order; provider tables sit right after the provider directory
+    pos = HEADER.size
+    pool_pos = pos
+    careers_pos = pool_pos + len(pool_blob)
+    aliases_pos = careers_pos + len(careers_blob)
+    providers_pos = aliases_pos + len(aliases_blob)
+    table_pos = providers_pos + 4 + 8 * len(provider_tables)
+    directory = [len(provider_tables)]
+    for name_sid, table in provider_tables:
+        directory.extend((name_sid, table_pos))
+        table_pos += len(table)
+    strings_pos = table_pos
+
+    header = HEADER.pack(MAGIC, VERSION, meta_sid, strings_pos, pool_pos, careers_pos, aliases_pos, providers_pos, 0)
+    return b"".join([header, pool_blob, careers_blob, aliases_blob,
+                     struct.pack(f"<{len(directory)}I", *directory),
+                     *(table for _, table in provider_tables), strings_blob])
+
+
+class _Table(Mapping):
+    """Read-only mapping over one keyed table of a snapshot."""
+
+    def __init__(self, snapshot, pos: int, width: int, ordered: bool):
+        self._snap = snapshot
+        self._words = snapshot.words
+        self._count = self._words[pos // 4]
+        self._records = pos // 4 + 1
+        self._width = width
+        self._order = self._records + self._count * width if ordered else None
+
+    def _at(self, i: int):
+        start = self._records + i * self._width
+        return self._words[start:start + self._width]
+
+    def _sorted_at(self, i: int):
+        if self._order is not None:
+            i = self._words[self._order + i]
+        return self._at(i)
+
+    def _find(self, key):
+        if not isinstance(key, str):
+            return None
+        target = key.encode("utf-8")
+        words, buf, offsets, data = self._words, self._snap.buf, self._snap._offsets, self._snap._data
+        records, width, order = self._records, self._width, self._order
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = words[order + mid] if order is not None else mid
+            sid = words[records + i * width]
+            start = words[offsets + sid]
+            current = buf[data + start:data + words[offsets + sid + 1]]
+            if current == target:
+                return self._at(i)
+            if current < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __getitem__(self, key):
+        record = self._find(key)
+        if record is None:
+            raise KeyError(key)
+        return self._value(record)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._snap.string(self._at(i)[0])
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {self._count} entries>"
+
+
+class CareerTable(_Table):
+    """career -> list of skills"""
+
+    def __init__(self, snapshot, pos):
+        super().__init__(snapshot, pos, 3, ordered=True)
+
+    def _value(self, record):
+        return [self._snap.string(sid) for sid in self._snap.pool(record[1], record[2])]
+
+
+class AliasTable(_Table):
+    """alias -> career"""
+
+    def __init__(self, snapshot, pos):
+        super().__init__(snapshot, pos, 2, ordered=True)
+
+    def _value(self, record):
+        return self._snap.string(record[1])
+
+
+class ResourceTable(_Table):
+    """normalized skill -> list of resource dicts, for one provider"""
+
+    def __init__(self, snapshot, pos):
+        super().__init__(snapshot, pos, 3, ordered=False)
+
+    def _value(self, record):
+        snap, cursor, resources = self._snap, record[1], []
+        for _ in range(record[2]):
+            fields = snap.pool(cursor, 1)[0]
+            values = snap.pool(cursor + 1, 3 * fields)
+            resource = {}
+            for j in range(0, len(values), 3):
+                value = snap.string(values[j + 2])
+                resource[snap.string(values[j])] = value if values[j + 1] == 0 else json.loads(value)
+            resources.append(resource)
+            cursor += 1 + 3 * fields
+        return resources
+
+
+class ProviderTables(Mapping):
+    """provider -> ResourceTable"""
+
+    def __init__(self, snapshot, pos):
+        count = snapshot.words[pos // 4]
+        directory = snapshot.words[pos // 4 + 1:pos // 4 + 1 + 2 * count]
+        self._tables = {
+            snapshot.string(directory[i]): ResourceTable(snapshot, directory[i + 1])
+            for i in range(0, len(directory), 2)
+        }
+
+    def __getitem__(self, provider):
+        return self._tables[provider]
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
+
+
+class Snapshot:
+    """A snapshot opened over an mmap (or any bytes-like buffer).
+
+    Every section except the string data is u32-aligned, so the tables are read
+    through one u32 view of the buffer (native order, hence little-endian hosts only).
+    """
+
+    def __init__(self, buf, path: str = None):
+        magic, version, meta_sid, strings_pos, pool_pos, careers_pos, aliases_pos, providers_pos, _ = \
+            HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} catalog snapshot")
+        if sys.byteorder != "little":
+            raise ValueError("catalog snapshots can only be read on little-endian hosts")
+        self.buf = buf
+        self.path = path
+        self.words = memoryview(buf)[:len(buf) - len(buf) % 4].cast("I")
+        self._string_count = self.words[strings_pos // 4]
+        self._offsets = strings_pos // 4 + 1
+        self._data = strings_pos + 4 * (self._string_count + 2)
+        self._pool = pool_pos // 4 + 1
+        self.meta = json.loads(self.string(meta_sid))
+        self.careers = CareerTable(self, careers_pos)
+        self.aliases = AliasTable(self, aliases_pos)
+        self.resources = ProviderTables(self, providers_pos)
+        self.skill_aliases = self.meta.get("skill_aliases", {})
+
+    @classmethod
+    def open(cls, path: str):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf, path)
+
+    def string_bytes(self, sid: int) -> bytes:
+        start, end = self.words[self._offsets + sid], self.words[self._offsets + sid + 1]
+        return self.buf[self._data + start:self._data + end]
+
+    def string(self, sid: int) -> str:
+        return self.string_bytes(sid).decode("utf-8")
+
+    def pool(self, start: int, count: int):
+        return self.words[self._pool + start:self._pool + start + count]
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "bytes": len(self.buf),
+            "strings": self._string_count,
+            "careers": len(self.careers),
+            "aliases": len(self.aliases),
+            "resources": {provider: len(table) for provider, table in self.resources.items()},
+        }
+
+    def close(self):
+        self.words.release()
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+
+
+def load_catalog(snapshot_path: str = DEFAULT_SNAPSHOT, source_path: str = DEFAULT_SOURCE) -> Snapshot:
+    """Open the catalog snapshot; if it is missing or older than the JSON source,
+    build one in memory from the source instead."""
+    digest = source_digest(source_path) if source_path and os.path.exists(source_path) else None
+    if os.path.exists(snapshot_path):
+        try:
+            snapshot = Snapshot.open(snapshot_path)
+            if digest is None or snapshot.meta.get("source") == digest:
+                return snapshot
+            snapshot.close()
+            LOG.warning("Catalog: %s is out of date - run `python snapshot.py` to rebuild it", snapshot_path)
+        except Exception as e:
+            LOG.warning("Catalog: could not open %s: %s", snapshot_path, e)
+    if digest is None:
+        raise FileNotFoundError(f"no catalog snapshot or source found ({snapshot_path}, {source_path})")
+    with open(source_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    meta = {"source": digest, "skill_aliases": catalog.get("skill_aliases", {})}
+    return Snapshot(build_snapshot(catalog["careers"], catalog["aliases"], meta=meta))
+
+
+def write_snapshot(output: str, source_path: str, resources_path: str = None):
+    with open(source_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    meta = {"source": source_digest(source_path), "generated_at": time.time(),
+            "skill_aliases": catalog.get("skill_aliases", {})}
+    resources = None
+    if resources_path:
+        with gzip.open(resources_path, "rt", encoding="utf-8") as f:
+            artifact = json.load(f)
+        resources = artifact["resources"]
+        meta["resources"] = {key: artifact[key] for key in ("generated_at", "complete", "max_results")}
+    data = build_snapshot(catalog["careers"], catalog["aliases"], resources, meta)
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, output)
+    return len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile catalog.json into a memory-mapped snapshot")
+    parser.add_argument("--catalog", default=DEFAULT_SOURCE)
+    parser.add_argument("--resources", default=None, help="precomputed artifact to embed (precompute.py output)")
+    parser.add_argument("--output", default=DEFAULT_SNAPSHOT)
+    args = parser.parse_args(argv)
+    size = write_snapshot(args.output, args.catalog, args.resources)
+    print(f"Snapshot: wrote {args.output} ({size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# backend/structured_logging.py
+"""
+Structured, sampled, non-blocking logging for the backend.
+
+    log = get_logger("playlist")
+    log.warning("YouTube API error: %s - using fallback links", error, provider="youtube")
+    log.sampled("youtube.found", "YouTube API: Found %d videos for '%s'", n, skill, results=n)
+
+Records go through a bounded queue to one writer thread, so a request thread
+never waits on stdout (or on Cloud Logging's agent reading it): the message
+is formatted and written by the writer, and when the queue is full the record
+is dropped and counted instead. Each line is JSON with the severity, message,
+request ID and any keyword fields; Cloud Logging reads "severity" and
+"message" from it. A terminal gets plain text lines instead.
+
+sampled() is for lines that repeat on every provider call (searches, result
+counts, a missing API key): they are written once every LOG_SAMPLE_EVERY
+calls per key, with "sampled": N so counts can be scaled back up.
+
+LOG_LEVEL        - DEBUG, INFO (default), WARNING or ERROR
+LOG_FORMAT       - "json" or "text" (default: text on a terminal, else json)
+LOG_SAMPLE_EVERY - write 1 in N sampled() lines per key (default 100, 1 = all)
+LOG_QUEUE_SIZE   - records buffered for the writer thread (default 10000)
+"""
+import atexit
+import contextvars
+import datetime
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+_configured = None
+_configure_lock = threading.Lock()
+
+
+def new_request_id(headers=None) -> str:
+    """The caller's X-Request-ID (or Cloud trace ID) if it sent one, else a random ID."""
+    if headers is not None:
+        supplied = headers.get("X-Request-ID") or headers.get("X-Cloud-Trace-Context", "").split("/")[0]
+        if supplied and len(supplied) <= 64 and supplied.replace("-", "").isalnum():
+            return supplied
+    return os.urandom(8).hex()
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+def set_request_id(request_id: str):
+    """Set the request ID for the current context; returns a token for reset_request_id()."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, severity, logger, message, request_id, fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                    .isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The message with its request ID, for reading logs in a terminal."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        request_id = getattr(record, "request_id", None)
+        line = f"[{request_id}] {record.getMessage()}" if request_id else record.getMessage()
+        if record.levelno >= logging.WARNING:
+            line = f"{record.levelname}: {line}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at the time (test runners swap it)."""
+
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread without formatting them or waiting
+    for room; records that don't fit are dropped and counted.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The request ID lives in the caller's context, the writer thread has none
+        record.request_id = _request_id.get()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Sampler:
+    """Lets through the first of every `every` calls per key."""
+
+    def __init__(self, every: int):
+        self.every = max(1, every)
+        self._counters = {}
+        self.sampled_out = 0
+
+    def take(self, key) -> bool:
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters.setdefault(key, itertools.count())
+        if next(counter) % self.every == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class StructuredLogger:
+    """A logging.Logger whose calls take keyword fields and can be sampled."""
+
+    def __init__(self, logger: logging.Logger, sampler: Sampler):
+        self.logger = logger
+        self.sampler = sampler
+
+    def log(self, level: int, msg: str, *args, exc_info=None, **fields):
+        if self.logger.isEnabledFor(level):
+            self.logger._log(level, msg, args, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, msg: str, *args, **fields):
+        self.log(logging.DEBUG, msg, *args, **fields)
+
+    def info(self, msg: str, *args, **fields):
+        self.log(logging.INFO, msg, *args, **fields)
+
+    def warning(self, msg: str, *args, **fields):
+        self.log(logging.WARNING, msg, *args, **fields)
+
+    def error(self, msg: str, *args, **fields):
+        self.log(logging.ERROR, msg, *args, **fields)
+
+    def exception(self, msg: str, *args, **fields):
+        self.log(logging.ERROR, msg, *args, exc_info=True, **fields)
+
+    def sampled(self, key, msg: str, *args, level: int = logging.INFO, **fields):
+        """Log a high-frequency line once every LOG_SAMPLE_EVERY calls with this key."""
+        if self.logger.isEnabledFor(level) and self.sampler.take(key):
+            if self.sampler.every > 1:
+                fields["sampled"] = self.sampler.every
+            self.logger._log(level, msg, args, extra={"fields": fields})
+
+
+class LoggingSetup:
+    """The queue, writer thread and sampler shared by every logger."""
+
+    def __init__(self):
+        level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+        self.level = level if isinstance(level, int) else logging.INFO
+        default_format = "text" if sys.stdout.isatty() else "json"
+        self.format = os.getenv("LOG_FORMAT", default_format).lower()
+        self.sampler = Sampler(int(os.getenv("LOG_SAMPLE_EVERY", "100")))
+        self.queue = queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+
+        self.writer = StdoutHandler()
+        self.writer.setFormatter(JsonFormatter() if self.format == "json" else TextFormatter())
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, self.writer)
+        self.listener.start()
+
+        self.root = logging.getLogger("backend")
+        self.root.setLevel(self.level)
+        self.root.addHandler(self.handler)
+        self.root.propagate = False
+
+    def after_fork(self):
+        """In a forked child the writer thread wasn't copied: start a new queue and writer
+        (the parent's queued records are the parent's to write)."""
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.handler.queue = self.queue
+        self.listener = logging.handlers.QueueListener(self.queue, self.writer)
+        self.listener.start()
+
+    def flush(self):
+        """Wait until the writer thread has written everything queued so far."""
+        if self.listener._thread is not None:
+            self.queue.join()
+
+    def stop(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def stats(self) -> dict:
+        return {
+            "level": logging.getLevelName(self.level),
+            "format": self.format,
+            "sample_every": self.sampler.every,
+            "queued": self.queue.qsize(),
+            "dropped": self.handler.dropped,
+            "sampled_out": self.sampler.sampled_out,
+        }
+
+
+def configure() -> LoggingSetup:
+    """Start the writer thread (once per process) and return the shared setup."""
+    global _configured
+    with _configure_lock:
+        if _configured is None:
+            _configured = LoggingSetup()
+            atexit.register(_configured.stop)
+            os.register_at_fork(after_in_child=_configured.after_fork)
+        return _configured
+
+
+def get_logger(name: str) -> StructuredLogger:
+    setup = configure()
+    return StructuredLogger(setup.root.getChild(name), setup.sampler)
+
+
+def flush_logs():
+    configure().flush()
+
+
+def stop_logging():
+    """Write out what is queued and stop the writer thread (worker shutdown)."""
+    configure().stop()
+
+
+def logging_stats() -> dict:
+    return configure().stats()
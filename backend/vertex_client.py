@@ -0,0 +1,184 @@
+# backend/vertex_client.py
+"""
+Process-wide holder for the Vertex AI text model.
+
+aiplatform.init() and TextGenerationModel.from_pretrained() build clients and
+make metadata round-trips, so they run once per process (on first use, or
+during warm-up) instead of on every unknown-career request. A failed init is
+not retried until `retry_after` seconds have passed, and the handle is rebuilt
+after repeated predict failures.
+
+The SDK itself (google.cloud.aiplatform, which pulls in grpc and protobuf) is
+only imported when the model is first built; at import time we just check that
+it is installed, so cold starts that never reach Vertex don't pay for it.
+
+Tests and local development can inject a fake with set_factory():
+
+    VERTEX_MODEL.set_factory(lambda: FakeModel())
+"""
+import importlib.util
+import threading
+import time
+
+from structured_logging import get_logger
+
+LOG = get_logger("vertex_client")
+
+
+def vertex_sdk_installed() -> bool:
+    """True if google.cloud.aiplatform can be imported (without importing it)."""
+    try:
+        return importlib.util.find_spec("google.cloud.aiplatform") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def default_model_factory(project: str, location: str, model_name: str):
+    """Import and initialise the Vertex SDK, then load the text model."""
+    start = time.perf_counter()
+    from google.cloud import aiplatform
+    LOG.info("Vertex AI: SDK imported in %.2fs", time.perf_counter() - start)
+    aiplatform.init(project=project, location=location)
+    return aiplatform.TextGenerationModel.from_pretrained(model_name)
+
+
+class Prediction:
+    """The part of a Vertex text prediction the backend reads."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class RestTextModel:
+    """A text model behind a Vertex-style REST :predict URL, called without
+    credentials (the local mock upstream, or a proxy that adds them).
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url
+        self.timeout = timeout
+
+    def predict(self, prompt: str, **parameters):
+        from http_client import http_post
+        # max_output_tokens -> maxOutputTokens, as the REST API spells it
+        parameters = {
+            name.split("_")[0] + "".join(part.title() for part in name.split("_")[1:]): value
+            for name, value in parameters.items()
+        }
+        r = http_post(self.url, json={"instances": [{"prompt": prompt}], "parameters": parameters},
+                      timeout=self.timeout)
+        r.raise_for_status()
+        return Prediction(r.json()["predictions"][0]["content"])
+
+
+class VertexModelHolder:
+    """Lazily initialised, thread-safe Vertex model handle."""
+
+    def __init__(self, project: str, location: str, model_name: str = "text-bison@001",
+                 library_available: bool = None, retry_after: float = 30.0,
+                 refresh_after_failures: int = 3):
+        self.project = project
+        self.location = location
+        self.model_name = model_name
+        # None: check lazily whether the SDK is installed
+        self.library_available = library_available
+        self.retry_after = retry_after
+        self.refresh_after_failures = refresh_after_failures
+        self._factory = None
+        self._model = None
+        self._lock = threading.Lock()
+        self._init_seconds = None
+        self._initialized_at = None
+        self._last_error = None
+        self._last_failure_at = None
+        self._consecutive_failures = 0
+        self.predictions = 0
+        self.failures = 0
+
+    @property
+    def available(self) -> bool:
+        """True if a model can be built (SDK importable or a factory injected)."""
+        if self._factory is not None:
+            return True
+        if self.library_available is None:
+            self.library_available = vertex_sdk_installed()
+        return self.library_available
+
+    def set_factory(self, factory):
+        """Replace how the model is built (e.g. a local fake) and drop the current handle."""
+        with self._lock:
+            self._factory = factory
+            self._model = None
+            self._last_failure_at = None
+
+    def get(self):
+        """Return the model, building it on first use."""
+        model = self._model
+        if model is not None:
+            return model
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            if self._last_failure_at is not None and time.time() - self._last_failure_at < self.retry_after:
+                raise RuntimeError(f"Vertex model init failed recently: {self._last_error}")
+            start = time.perf_counter()
+            try:
+                if self._factory is not None:
+                    model = self._factory()
+                else:
+                    model = default_model_factory(self.project, self.location, self.model_name)
+            except Exception as e:
+                self._last_error = str(e)
+                self._last_failure_at = time.time()
+                raise
+            self._init_seconds = round(time.perf_counter() - start, 3)
+            self._initialized_at = time.time()
+            self._last_failure_at = None
+            self._model = model
+            return model
+
+    def predict(self, prompt: str, **kwargs):
+        """Run a prediction on the shared model."""
+        model = self.get()
+        try:
+            response = model.predict(prompt, **kwargs)
+        except Exception as e:
+            self.failures += 1
+            self._last_error = str(e)
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= self.refresh_after_failures:
+                self.refresh()
+            raise
+        self.predictions += 1
+        self._consecutive_failures = 0
+        return response
+
+    def warm_up(self) -> bool:
+        """Build the model ahead of the first request. Returns True when ready."""
+        if not self.available:
+            return False
+        try:
+            self.get()
+            return True
+        except Exception as e:
+            LOG.warning("Vertex warm-up failed: %s", e)
+            return False
+
+    def refresh(self):
+        """Drop the current handle; the next call builds a fresh one."""
+        with self._lock:
+            self._model = None
+            self._consecutive_failures = 0
+            self._last_failure_at = None
+
+    def health(self) -> dict:
+        return {
+            "available": self.available,
+            "initialized": self._model is not None,
+            "model": self.model_name,
+            "init_seconds": self._init_seconds,
+            "initialized_at": self._initialized_at,
+            "predictions": self.predictions,
+            "failures": self.failures,
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,92 @@
+# backend/warmup.py
+"""
+Startup warm-up and readiness reporting.
+
+Work that would otherwise land on the first user request (building lookup
+tables, first TLS handshakes, loading artifacts, initialising Vertex) is
+registered as named steps and run once per process, either blocking or in a
+background thread. A failing step is reported but doesn't stop the others;
+the instance is ready once every step has run.
+"""
+import threading
+import time
+
+from structured_logging import get_logger
+
+LOG = get_logger("warmup")
+
+
+class WarmUp:
+    """Named warm-up steps, run once, with per-step timings."""
+
+    def __init__(self):
+        self.steps = []
+        self.reset()
+
+    def reset(self):
+        """Forget a previous run, so the steps run again (in a forked child, whose
+        threads and connections aren't the parent's)."""
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started = False
+        self.started_at = None
+        self.seconds = None
+        self.results = {}
+
+    def add(self, name: str, fn):
+        """Register a step; fn() may return a small JSON-serialisable detail."""
+        self.steps.append((name, fn))
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def pending(self) -> bool:
+        """Started but not finished yet."""
+        return self._started and not self._done.is_set()
+
+    def run(self) -> dict:
+        """Run every step once (later calls wait for the first run) and return the report."""
+        with self._lock:
+            first = not self._started
+            self._started = True
+        if not first:
+            self._done.wait()
+            return self.report()
+
+        self.started_at = time.time()
+        start = time.perf_counter()
+        for name, fn in self.steps:
+            step_start = time.perf_counter()
+            try:
+                detail = fn()
+                self.results[name] = {"ok": True, "seconds": round(time.perf_counter() - step_start, 3)}
+                if detail is not None:
+                    self.results[name]["detail"] = detail
+            except Exception as e:
+                self.results[name] = {"ok": False, "seconds": round(time.perf_counter() - step_start, 3),
+                                      "error": str(e)}
+                LOG.warning("Warm-up: %s failed: %s", name, e)
+        self.seconds = round(time.perf_counter() - start, 3)
+        self._done.set()
+        timings = ", ".join(f"{name} {r['seconds'] * 1000:.0f}ms" for name, r in self.results.items())
+        LOG.info("Warm-up: ready in %.2fs (%s)", self.seconds, timings)
+        return self.report()
+
+    def run_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "started": self._started,
+            "seconds": self.seconds,
+            "steps": dict(self.results),
+        }
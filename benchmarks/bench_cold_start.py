@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cold vs warm first-request benchmark
+Starts the backend in a fresh process - as the functions_framework target and as
+backend/server.py (gunicorn, or the Werkzeug debug server with --targets dev) -
+with the startup warm-up (WARM_UP=blocking: before each server worker accepts
+requests, or on the functions target's first request) and without it
+(WARM_UP=off), then times how long it takes to accept connections and to answer
+the first and later requests.
+
+Usage: python benchmarks/bench_cold_start.py [--targets functions server] [--runs 3] [--json]
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+COMMANDS = {
+    "functions": lambda port: [sys.executable, "-m", "functions_framework", "--target", "career_playlist",
+                               "--source", "main.py", "--port", str(port)],
+    "server": lambda port: [sys.executable, "server.py"],
+    "dev": lambda port: [sys.executable, "server.py", "--dev"],
+}
+FIRST_CAREER = "Data Scientist"
+LATER_CAREERS = ["DevOps Engineer", "Web Developer", "Nurse", "Data Analyst", "Chef"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_listening(port: int, proc, timeout: float = 60.0):
+    ends = time.monotonic() + timeout
+    while time.monotonic() < ends:
+        if proc.poll() is not None:
+            raise SystemExit(f"backend exited early:\n{proc.stdout.read()}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.01)
+    raise SystemExit("backend did not start listening in time")
+
+
+def post_ms(port: int, career: str) -> float:
+    body = json.dumps({"career": career, "known_skills": []}).encode()
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/", data=body,
+                                     headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_once(target: str, warm: bool) -> dict:
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WARM_UP="blocking" if warm else "off", SKILLS_STORE="memory",
+               PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(COMMANDS[target](port), cwd=BACKEND, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, start_new_session=True)
+    try:
+        wait_listening(port, proc)
+        listening = (time.perf_counter() - start) * 1000
+        first = post_ms(port, FIRST_CAREER)
+        later = [post_ms(port, career) for career in LATER_CAREERS]
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=10)
+    return {"listening_ms": listening, "first_request_ms": first, "later_request_ms": statistics.median(later)}
+
+
+def run(target: str, warm: bool, runs: int) -> dict:
+    samples = [run_once(target, warm) for _ in range(runs)]
+    result = {"target": target, "mode": "warm" if warm else "cold", "runs": runs}
+    for key in samples[0]:
+        result[key] = round(statistics.median(s[key] for s in samples), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", nargs="+", choices=sorted(COMMANDS), default=["functions", "server"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [run(target, warm, args.runs) for target in args.targets for warm in (False, True)]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("🥶 Cold vs warm first request")
+    print("=" * 60)
+    for r in results:
+        print(f"{'🔥' if r['mode'] == 'warm' else '🧊'} {r['target']:<9} {r['mode']:<4} | listening after"
+              f" {r['listening_ms']}ms | first request {r['first_request_ms']}ms | later {r['later_request_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
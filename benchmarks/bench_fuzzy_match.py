@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Fuzzy career matching benchmark
+Builds synthetic career tables (10k and 100k entries by default), then times
+typo'd lookups against FuzzyCareerMatcher with the memo bypassed.
+
+Usage: python benchmarks/bench_fuzzy_match.py [--sizes 10000 100000] [--queries 500] [--json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from fuzzy_match import FuzzyCareerMatcher
+
+SENIORITY = ["junior", "senior", "lead", "principal", "staff", "associate", "chief",
+             "head", "assistant", "trainee", "intern", "deputy", "regional", "global"]
+DOMAIN = ["data", "cloud", "security", "network", "software", "hardware", "marketing", "sales",
+          "finance", "legal", "medical", "clinical", "retail", "logistics", "supply", "energy",
+          "automotive", "aerospace", "biotech", "pharmaceutical", "insurance", "banking", "media",
+          "gaming", "education", "research", "hospitality", "construction", "manufacturing",
+          "agriculture", "environmental", "quality", "product", "platform", "mobile", "web",
+          "embedded", "robotics", "analytics", "infrastructure", "database", "payments",
+          "compliance", "procurement", "facilities", "content", "brand", "community", "customer",
+          "operations", "talent", "learning", "design", "audio", "video", "blockchain",
+          "geospatial", "nutrition", "veterinary", "maritime"]
+ROLE = ["engineer", "developer", "analyst", "manager", "scientist", "architect", "designer",
+        "consultant", "specialist", "coordinator", "administrator", "technician", "strategist",
+        "director", "officer", "planner", "researcher", "auditor", "advisor", "operator",
+        "supervisor", "instructor", "writer", "editor", "producer", "recruiter", "inspector",
+        "estimator", "controller", "evangelist"]
+QUALIFIER = ["", "remote", "contract", "certified", "field", "hybrid", "emea", "apac"]
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def build_catalog(size: int, rng: random.Random):
+    combos = list(itertools.product(SENIORITY, DOMAIN, ROLE, QUALIFIER))
+    rng.shuffle(combos)
+    if size > len(combos):
+        raise SystemExit(f"catalog generator tops out at {len(combos)} entries")
+    return [" ".join(w for w in combo if w) for combo in combos[:size]]
+
+
+def add_typo(text: str, rng: random.Random) -> str:
+    """Apply one random edit (drop, swap, replace or insert) to one longer word."""
+    words = text.split()
+    candidates = [i for i, w in enumerate(words) if len(w) >= 6]
+    if not candidates:
+        return text
+    i = rng.choice(candidates)
+    w = words[i]
+    pos = rng.randrange(1, len(w) - 1)
+    edit = rng.choice(["drop", "swap", "replace", "insert"])
+    if edit == "drop":
+        w = w[:pos] + w[pos + 1:]
+    elif edit == "swap":
+        w = w[:pos] + w[pos + 1] + w[pos] + w[pos + 2:]
+    elif edit == "replace":
+        w = w[:pos] + rng.choice(LETTERS) + w[pos + 1:]
+    else:
+        w = w[:pos] + rng.choice(LETTERS) + w[pos:]
+    words[i] = w
+    return " ".join(words)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(size: int, queries: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    careers = build_catalog(size, rng)
+
+    start = time.perf_counter()
+    matcher = FuzzyCareerMatcher(careers)
+    build_seconds = time.perf_counter() - start
+
+    samples = [rng.choice(careers) for _ in range(queries)]
+    typos = [add_typo(career, rng) for career in samples]
+
+    timings = []
+    correct = 0
+    for expected, text in zip(samples, typos):
+        t0 = time.perf_counter()
+        result = matcher._match(text)  # bypass the memo to time real work
+        timings.append((time.perf_counter() - t0) * 1e6)
+        if result and result[0] == expected:
+            correct += 1
+
+    return {
+        "entries": size,
+        "build_seconds": round(build_seconds, 2),
+        "vocabulary": len(matcher.postings),
+        "queries": queries,
+        "mean_us": round(statistics.mean(timings), 1),
+        "p50_us": round(percentile(timings, 50), 1),
+        "p99_us": round(percentile(timings, 99), 1),
+        "accuracy": round(correct / queries, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [run(size, args.queries) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("🔍 Fuzzy career matching benchmark")
+    print("=" * 60)
+    for r in results:
+        print(f"📚 {r['entries']:>7} careers | build {r['build_seconds']}s | vocab {r['vocabulary']}")
+        print(f"   ⏱️ mean {r['mean_us']}us  p50 {r['p50_us']}us  p99 {r['p99_us']}us"
+              f"  | accuracy {r['accuracy']:.1%} over {r['queries']} typo'd queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the pure-Python hot paths in main.py
+Times the CPU work a playlist request does outside the network: career
+resolution (resolve_career, call_vertex_extract_skills) against synthetic
+catalogs of --catalog-sizes careers with the memos bypassed, skill_gap and
+response serialization (cache_playlist_body + render_playlist_response) for
+--skill-counts skills, the three parse_*_response loops on recorded provider
+payloads (benchmarks/fixtures/) and the get_*_fallback builders.
+
+Each case is run in a loop for at least --min-time seconds, --repeat times; the
+minimum and median time per operation are reported. --save writes the results
+to a baseline file and --compare checks a run against one, exiting 1 when a
+case's minimum got more than --threshold slower. --record refreshes the
+fixtures from the live APIs (needs the API keys).
+
+Usage: python benchmarks/bench_hot_paths.py [--catalog-sizes 100 1000 10000] [--skill-counts 5 20 100]
+                                            [--filter resolve] [--repeat 7] [--min-time 0.2]
+                                            [--save baseline.json] [--compare baseline.json] [--threshold 0.2]
+                                            [--record] [--json]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+sys.path.insert(0, BACKEND)
+os.environ.update(SKILLS_STORE="memory", WARM_UP="", PRECOMPUTED_PATH="", LOG_LEVEL="WARNING")
+
+import main  # noqa: E402
+from bench_fuzzy_match import add_typo, build_catalog  # noqa: E402
+from career_index import CareerIndex  # noqa: E402
+from fuzzy_match import FuzzyCareerMatcher  # noqa: E402
+
+# Fixture name -> (provider URL, request params for the recorded skill)
+FIXTURE_SOURCES = {
+    "youtube_search": (main.YOUTUBE_SEARCH_URL, lambda skill: main.youtube_params(skill, 3)),
+    "books_volumes": (main.BOOKS_VOLUMES_URL, lambda skill: main.books_params(skill, 3)),
+    "kg_search": (main.KNOWLEDGE_GRAPH_SEARCH_URL, lambda skill: main.certifications_params(skill, 3)),
+}
+SKILL_NAMES = sorted({skill for skills in main.FALLBACK_SKILLS.values() for skill in skills})
+QUERIES = 200
+
+# name -> (axes, setup); setup(**params) is a context manager yielding (fn, operations per call)
+CASES = {}
+
+
+def case(name: str, axes=()):
+    def register(setup):
+        CASES[name] = (axes, contextlib.contextmanager(setup))
+        return setup
+    return register
+
+
+class RecordedResponse:
+    """A provider response replayed from a fixture; json() decodes the body like requests does."""
+    status_code = 200
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+    def raise_for_status(self):
+        pass
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES, f"{name}.json"), "rb") as f:
+        return f.read()
+
+
+@contextlib.contextmanager
+def patched(**values):
+    """Temporarily replace main's module globals."""
+    saved = {name: getattr(main, name) for name in values}
+    for name, value in values.items():
+        setattr(main, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(main, name, value)
+
+
+def synthetic_catalog(size: int, seed: int = 42):
+    """A catalog of `size` careers wired into main the way load_catalog's is, memos bypassed."""
+    rng = random.Random(seed)
+    names = build_catalog(size, rng)
+    careers = {name: rng.sample(SKILL_NAMES, 6) for name in names}
+    aliases = {f"alias {i}": name for i, name in enumerate(names[: size // 4])}
+    index = CareerIndex(careers, aliases)
+    index.resolve = index._resolve
+    fuzzy = FuzzyCareerMatcher(careers, aliases, resolve=index._resolve, threshold=main.FUZZY_MATCH_THRESHOLD)
+    fuzzy.match = fuzzy._match
+    queries = {
+        "exact": [rng.choice(names).title() for _ in range(QUERIES)],
+        "alias": [f"Alias {rng.randrange(max(size // 4, 1))}" for _ in range(QUERIES)],
+        "typo": [add_typo(rng.choice(names), rng) for _ in range(QUERIES)],
+    }
+    globals_ = {"FALLBACK_SKILLS": careers, "CAREER_ALIASES": aliases, "CAREER_INDEX": index, "CAREER_FUZZY": fuzzy}
+    return globals_, queries
+
+
+def skill_lists(count: int, seed: int = 42):
+    """`count` required skills and `count` known skills, half of them matching in a different case."""
+    rng = random.Random(seed)
+    pool = SKILL_NAMES + [f"Skill {i}" for i in range(max(0, 2 * count - len(SKILL_NAMES)))]
+    skills = rng.sample(pool, count)
+    others = [s for s in pool if s not in skills]
+    known = [s.upper() for s in skills[: count // 2]] + rng.sample(others, count - count // 2)
+    rng.shuffle(known)
+    return skills, known
+
+
+def resolve_case(kind: str):
+    def setup(catalog):
+        globals_, queries = synthetic_catalog(catalog)
+        batch = queries[kind]
+        with patched(**globals_):
+            yield (lambda: [main.resolve_career(q) for q in batch]), len(batch)
+    return setup
+
+
+for _kind in ("exact", "alias", "typo"):
+    case(f"resolve_career.{_kind}", ("catalog",))(resolve_case(_kind))
+
+
+@case("call_vertex_extract_skills.catalog", ("catalog",))
+def extract_skills(catalog):
+    globals_, queries = synthetic_catalog(catalog)
+    batch = queries["exact"]
+    with patched(**globals_):
+        yield (lambda: [main.call_vertex_extract_skills(q) for q in batch]), len(batch)
+
+
+@case("skill_gap", ("skills",))
+def skill_gap(skills):
+    required, known = skill_lists(skills)
+    yield (lambda: main.skill_gap(required, known)), 1
+
+
+def parse_case(fixture: str, parse):
+    def setup():
+        response = RecordedResponse(load_fixture(fixture))
+        yield (lambda: parse(response)), 1
+    return setup
+
+
+case("parse_youtube_response")(parse_case("youtube_search", lambda r: main.parse_youtube_response(r, "Python")))
+case("parse_books_response")(parse_case("books_volumes", lambda r: main.parse_books_response(r, "Python")))
+case("parse_certifications_response")(
+    parse_case("kg_search", lambda r: main.parse_certifications_response(r, "Python", 3)))
+
+
+def fallback_case(fallback):
+    def setup():
+        yield (lambda: fallback("Machine Learning")), 1
+    return setup
+
+
+for _field, _, _fallback in main.PROVIDERS:
+    case(f"{_fallback.__name__}")(fallback_case(_fallback))
+
+
+@case("serialize_playlist", ("skills",))
+def serialize_playlist(skills):
+    required, known = skill_lists(skills)
+    videos = main.parse_youtube_response(RecordedResponse(load_fixture("youtube_search")), "Python")
+    books = main.parse_books_response(RecordedResponse(load_fixture("books_volumes")), "Python")
+    entries = [{"skill": s, "videos": videos, "books": books,
+                "certifications": main.get_certifications_fallback(s)} for s in required]
+    key = ("bench hot paths", tuple(known))
+
+    def serialize():
+        cached = main.cache_playlist_body(key, required, required, entries)
+        return main.render_playlist_response("Data Scientist", known, cached)
+
+    try:
+        yield serialize, 1
+    finally:
+        main._response_cache.delete(key)
+
+
+def time_case(fn, ops: int, repeat: int, min_time: float) -> dict:
+    """Per-operation seconds over `repeat` runs of a loop lasting at least min_time."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    runs = [elapsed]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append(time.perf_counter() - start)
+    per_op = [run / number / ops * 1e6 for run in runs]
+    return {"min_us": round(min(per_op), 3), "median_us": round(statistics.median(per_op), 3),
+            "loops": number, "ops": ops}
+
+
+def case_params(axes, args):
+    grid = [{}]
+    for axis in axes:
+        values = args.catalog_sizes if axis == "catalog" else args.skill_counts
+        grid = [dict(params, **{axis: value}) for params in grid for value in values]
+    return grid
+
+
+def case_label(name: str, params: dict) -> str:
+    return f"{name}[{', '.join(f'{k}={v}' for k, v in params.items())}]" if params else name
+
+
+def run(args) -> dict:
+    results = {}
+    for name, (axes, setup) in CASES.items():
+        if args.filter and not any(f in name for f in args.filter):
+            continue
+        for params in case_params(axes, args):
+            with setup(**params) as (fn, ops):
+                results[case_label(name, params)] = time_case(fn, ops, args.repeat, args.min_time)
+    return {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """Cases in both runs with the ratio of their minimums; `regressed` when above 1 + threshold."""
+    changes = {}
+    for label, result in results["results"].items():
+        before = baseline["results"].get(label)
+        if before is None:
+            continue
+        ratio = result["min_us"] / before["min_us"] if before["min_us"] else 1.0
+        changes[label] = {"before_us": before["min_us"], "after_us": result["min_us"], "ratio": round(ratio, 3),
+                          "regressed": ratio > 1 + threshold}
+    return changes
+
+
+def record(skill: str):
+    """Overwrite the fixtures with live responses for `skill`, using the backend's request params."""
+    for name, (url, params) in FIXTURE_SOURCES.items():
+        try:
+            r = main.http_get(url, params=params(skill), timeout=8)
+            r.raise_for_status()
+        except Exception as e:
+            print(f"⚠️ {name}: not recorded ({e})")
+            continue
+        with open(os.path.join(FIXTURES, f"{name}.json"), "w") as f:
+            json.dump(r.json(), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"📼 {name}: recorded {url} for '{skill}'")
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--catalog-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--skill-counts", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--filter", nargs="+", help="only run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds each timed loop runs for at least")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="compare against this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression")
+    parser.add_argument("--record", action="store_true", help="refresh the fixtures from the live APIs first")
+    parser.add_argument("--record-skill", default="Python")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record_skill)
+    results = run(args)
+    changes = {}
+    if args.compare:
+        with open(args.compare) as f:
+            changes = compare(results, json.load(f), args.threshold)
+        results["compare"] = {"baseline": args.compare, "threshold": args.threshold, "changes": changes}
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    regressions = [label for label, change in changes.items() if change["regressed"]]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"🔥 Hot paths: Python {results['python']}, {args.repeat} runs of >= {args.min_time}s per case")
+        print("=" * 86)
+        for label, result in results["results"].items():
+            change = changes.get(label)
+            delta = ""
+            if change:
+                delta = f" | {'🔴' if change['regressed'] else '🟢'} {(change['ratio'] - 1) * 100:+.1f}%"
+            print(f"⏱️ {label:<52} min {result['min_us']:>10.2f}µs | median {result['median_us']:>10.2f}µs{delta}")
+        if args.save:
+            print(f"📝 Baseline written to {args.save}")
+        if args.compare:
+            print(f"{'🔴' if regressions else '✅'} {len(regressions)} of {len(changes)} cases more than"
+                  f" {args.threshold:.0%} slower than {args.compare}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_()
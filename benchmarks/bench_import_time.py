@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark
+Imports backend/main.py in fresh interpreters with `python -X importtime`, reports
+the cumulative import time and the slowest modules, and fails if the median
+exceeds the budget or if modules that must load lazily (the Vertex SDK, grpc,
+protobuf) were imported.
+
+Usage: python benchmarks/bench_import_time.py [--budget-ms 750] [--runs 5] [--top 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+# Must not be imported while loading main (they are pulled in on first Vertex use)
+LAZY_MODULES = ["google.cloud.aiplatform", "grpc", "google.protobuf"]
+
+
+def import_profile(module: str = "main"):
+    """Run one cold import; returns {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=BACKEND, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr}")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run(runs: int, top: int) -> dict:
+    profiles = [import_profile() for _ in range(runs)]
+    totals = [profile["main"][1] / 1000 for profile in profiles]
+    last = profiles[-1]
+    slowest = sorted(last.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "main_self_ms": round(last["main"][0] / 1000, 1),
+        "modules_imported": len(last),
+        "slowest": [{"module": name, "cumulative_ms": round(cum / 1000, 1)} for name, (_, cum) in slowest],
+        "lazy_modules_imported": [name for name in LAZY_MODULES if name in last],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "750")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    result = run(args.runs, args.top)
+    result["budget_ms"] = args.budget_ms
+    result["passed"] = result["median_ms"] <= args.budget_ms and not result["lazy_modules_imported"]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("🧊 Cold-start import benchmark (import main)")
+        print("=" * 60)
+        print(f"⏱️ median {result['median_ms']}ms (min {result['min_ms']}, max {result['max_ms']})"
+              f" over {args.runs} runs | budget {args.budget_ms}ms")
+        print(f"📦 {result['modules_imported']} modules, main itself {result['main_self_ms']}ms")
+        for entry in result["slowest"]:
+            print(f"   {entry['cumulative_ms']:>8}ms  {entry['module']}")
+        if result["lazy_modules_imported"]:
+            print(f"❌ Imported at startup but should be lazy: {', '.join(result['lazy_modules_imported'])}")
+        print("✅ Within budget" if result["passed"] else "❌ Over budget")
+    sys.exit(0 if result["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Per-request logging overhead benchmark
+Builds uncached playlists in-process (5 skills x 3 providers against a fake
+upstream that answers instantly) from several threads at once, with stdout
+going to a pipe drained by a reader thread like a container's log agent
+(--reader-delay-ms makes it a slow one), and compares:
+
+  print       - every line print()ed on the request thread (the previous logging)
+  structured  - the queue-based JSON logger with sampling (LOG_SAMPLE_EVERY)
+  off         - logging disabled, the baseline the overhead is measured against
+
+Modes are run interleaved for --rounds rounds; the median round is reported.
+
+Usage: python benchmarks/bench_logging.py [--requests 200] [--threads 16] [--rounds 5]
+                                          [--sink pipe|devnull] [--reader-delay-ms 0] [--json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+sys.path.insert(0, BACKEND)
+os.environ.update(
+    SKILLS_STORE="memory", WARM_UP="", PRECOMPUTED_PATH="", LOG_FORMAT="json", METRICS="0",
+    YOUTUBE_API_KEY="bench", GOOGLE_BOOKS_API_KEY="bench", GOOGLE_KNOWLEDGE_GRAPH_API_KEY="bench",
+    YOUTUBE_CACHE_TTL="0", BOOKS_CACHE_TTL="0", CERTIFICATIONS_CACHE_TTL="0", PROVIDER_STALE_TTL="0",
+    YOUTUBE_DAILY_QUOTA="1000000000", BOOKS_DAILY_QUOTA="1000000000", KNOWLEDGE_GRAPH_DAILY_QUOTA="1000000000",
+    QUOTA_BURST_CALLS="1000000",
+)
+
+from flask import Flask, request  # noqa: E402
+
+import main  # noqa: E402
+import structured_logging  # noqa: E402
+
+RESPONSES = {
+    main.YOUTUBE_SEARCH_URL: {"items": [
+        {"id": {"videoId": f"v{i}"}, "snippet": {"title": f"Video {i}", "thumbnails": {"default": {"url": "t"}}}}
+        for i in range(3)]},
+    main.BOOKS_VOLUMES_URL: {"items": [
+        {"volumeInfo": {"title": f"Book {i}", "authors": ["A"], "infoLink": "https://books.example"}}
+        for i in range(3)]},
+    main.KNOWLEDGE_GRAPH_SEARCH_URL: {"itemListElement": [
+        {"result": {"name": f"Certification {i}", "description": "d"}} for i in range(6)]},
+}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+def fake_http_get(url, params=None, timeout=8):
+    return FakeResponse(RESPONSES[url])
+
+
+class PrintLogger:
+    """The print() calls main.py made before structured logging: every line, on the caller's thread."""
+
+    def log(self, level, msg, *args, exc_info=None, **fields):
+        print(msg % args if args else msg)
+
+    def sampled(self, key, msg, *args, level=logging.INFO, **fields):
+        self.log(level, msg, *args)
+
+    debug = info = warning = error = exception = lambda self, msg, *args, **fields: self.log(0, msg, *args)
+
+
+class PipeSink:
+    """Points sys.stdout at a pipe (or /dev/null) and counts the bytes read from it."""
+
+    def __init__(self, kind: str, delay_ms: float = 0):
+        self.kind = kind
+        self.delay = delay_ms / 1000
+        self.bytes = 0
+
+    def __enter__(self):
+        self.saved = sys.stdout
+        if self.kind == "devnull":
+            sys.stdout = open(os.devnull, "w")
+            return self
+        read_fd, write_fd = os.pipe()
+        sys.stdout = os.fdopen(write_fd, "w", buffering=1)
+        self.reader = threading.Thread(target=self.drain, args=(read_fd,), daemon=True)
+        self.reader.start()
+        return self
+
+    def drain(self, fd):
+        while True:
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                os.close(fd)
+                return
+            self.bytes += len(chunk)
+            if self.delay:
+                time.sleep(self.delay)
+
+    def __exit__(self, *exc):
+        structured_logging.flush_logs()
+        sys.stdout.close()
+        sys.stdout = self.saved
+        if self.kind == "pipe":
+            self.reader.join()
+        return False
+
+
+def run_mode(mode: str, requests: int, threads: int, sink: str, delay_ms: float = 0, round_: int = 0) -> dict:
+    app = Flask(__name__)
+    structured = main.LOG
+    root = structured_logging.configure().root
+    level = root.level
+    if mode == "print":
+        main.LOG = PrintLogger()
+    elif mode == "off":
+        root.setLevel(logging.CRITICAL)
+
+    def one(i):
+        payload = {"career": "Data Scientist", "known_skills": [f"bench-{mode}-{round_}-{i}"]}
+        with app.test_request_context("/", method="POST", json=payload):
+            start = time.perf_counter()
+            main.career_playlist(request)
+            return (time.perf_counter() - start) * 1000
+
+    try:
+        with PipeSink(sink, delay_ms) as out:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as pool:
+                latencies = sorted(pool.map(one, range(requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        main.LOG = structured
+        root.setLevel(level)
+    return {
+        "mode": mode,
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 3),
+        "log_bytes_per_request": round(out.bytes / requests) if sink == "pipe" else None,
+    }
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sink", choices=["pipe", "devnull"], default="pipe")
+    parser.add_argument("--reader-delay-ms", type=float, default=0,
+                        help="pause after each 4KB read from the pipe (a slow log agent)")
+    parser.add_argument("--modes", nargs="+", choices=["print", "structured", "off"],
+                        default=["off", "print", "structured"])
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    main.http_get = fake_http_get
+    run_mode("off", 20, args.threads, "devnull")  # warm the fan-out pool and imports
+    rounds = {mode: [] for mode in args.modes}
+    for round_ in range(args.rounds):
+        for mode in args.modes:
+            rounds[mode].append(run_mode(mode, args.requests, args.threads, args.sink, args.reader_delay_ms, round_))
+    results = [sorted(runs, key=lambda r: r["mean_ms"])[len(runs) // 2] for runs in rounds.values()]
+    baseline = next((r["mean_ms"] for r in results if r["mode"] == "off"), None)
+    for r in results:
+        r["overhead_ms"] = round(r["mean_ms"] - baseline, 3) if baseline is not None else None
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"🪵 Logging overhead: {args.requests} uncached playlists x {args.rounds} rounds, {args.threads} threads,"
+          f" stdout -> {args.sink} (reader delay {args.reader_delay_ms}ms)")
+    print("=" * 60)
+    for r in results:
+        overhead = f" | {r['overhead_ms']:+.3f}ms/request" if r["mode"] != "off" and r["overhead_ms"] is not None else ""
+        volume = f" | {r['log_bytes_per_request']} B logged" if r["log_bytes_per_request"] is not None else ""
+        print(f"📊 {r['mode']:<10} | {r['rps']:>7} req/s | mean {r['mean_ms']:.3f}ms"
+              f" | p99 {r['p99_ms']:.3f}ms{overhead}{volume}")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Serving load test: Werkzeug dev server vs gunicorn (gthread) vs gunicorn + uvicorn (ASGI)
+Starts backend/server.py in each mode against the local mock upstream
+(benchmarks/mock_upstream.py, fixed latency per call, provider caches disabled, a unique
+known_skills per request so the response cache never answers), drives it with a
+fixed number of keep-alive clients and reports throughput and latency percentiles.
+
+Usage: python benchmarks/bench_serving.py [--targets dev gthread asgi] [--concurrency 32]
+                                          [--duration 15] [--upstream-ms 80] [--workers 2] [--json]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from mock_upstream import EndpointProfile, MockUpstream
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+TARGETS = {
+    "dev": (["--dev"], {}),
+    "gthread": ([], {"SERVER_WORKER_CLASS": "gthread"}),
+    "asgi": ([], {"SERVER_WORKER_CLASS": "asgi"}),
+}
+CAREERS = ["Data Scientist", "DevOps Engineer", "Web Developer", "Data Analyst", "Cybersecurity Analyst"]
+
+# Backend settings for load tests: every lookup goes upstream, nothing is throttled
+LOAD_TEST_ENV = dict(
+    SKILLS_STORE="memory", WARM_UP="", PRECOMPUTED_PATH="",
+    YOUTUBE_CACHE_TTL="0", BOOKS_CACHE_TTL="0", CERTIFICATIONS_CACHE_TTL="0", PROVIDER_STALE_TTL="0",
+    YOUTUBE_DAILY_QUOTA="1000000000", BOOKS_DAILY_QUOTA="1000000000", KNOWLEDGE_GRAPH_DAILY_QUOTA="1000000000",
+    QUOTA_BURST_CALLS="1000000",
+)
+
+
+def upstream_calls(mock: MockUpstream) -> int:
+    return sum(endpoint["calls"] for endpoint in mock.stats().values())
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, proc, timeout: float = 60.0):
+    ends = time.monotonic() + timeout
+    while time.monotonic() < ends:
+        if proc.poll() is not None:
+            raise SystemExit("backend exited early")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    raise SystemExit("backend did not become ready in time")
+
+
+def start_backend(target: str, port: int, mock: MockUpstream, workers: int, env_overrides: dict = None):
+    args, extra = TARGETS[target]
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), **LOAD_TEST_ENV, **mock.env(), **extra)
+    env.update(env_overrides or {})
+    return subprocess.Popen([sys.executable, "server.py", *args], cwd=BACKEND, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def client(port: int, client_id: int, stop_at: float, record_from: float, latencies: list, errors: list):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    n = 0
+    while time.monotonic() < stop_at:
+        n += 1
+        body = json.dumps({"career": CAREERS[n % len(CAREERS)], "known_skills": [f"lt-{client_id}-{n}"]})
+        start = time.monotonic()
+        try:
+            conn.request("POST", "/", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            ok = False
+        if start >= record_from:
+            (latencies if ok else errors).append(time.monotonic() - start)
+    conn.close()
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+def run(target: str, args, mock: MockUpstream) -> dict:
+    port = free_port()
+    proc = start_backend(target, port, mock, args.workers)
+    try:
+        wait_ready(port, proc)
+        calls_before = upstream_calls(mock)
+        latencies, errors = [], []
+        now = time.monotonic()
+        record_from, stop_at = now + args.warmup, now + args.warmup + args.duration
+        threads = [threading.Thread(target=client, args=(port, i, stop_at, record_from, latencies, errors))
+                   for i in range(args.concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        calls = upstream_calls(mock) - calls_before
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=40)
+
+    elapsed = args.warmup + args.duration
+    return {
+        "target": target,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "upstream_calls_per_s": round(calls / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=["dev", "gthread", "asgi"])
+    parser.add_argument("--concurrency", type=int, default=32, help="keep-alive clients")
+    parser.add_argument("--duration", type=float, default=15.0, help="measured seconds per target")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before that")
+    parser.add_argument("--upstream-ms", type=float, default=80.0, help="mock API latency per call")
+    parser.add_argument("--workers", type=int, default=2, help="WEB_CONCURRENCY for gunicorn")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    profile = EndpointProfile(latency=f"fixed:{args.upstream_ms}")
+    with MockUpstream({name: profile for name in ("youtube", "books", "certifications")}) as mock:
+        results = [run(target, args, mock) for target in args.targets]
+
+    if args.json:
+        print(json.dumps({"concurrency": args.concurrency, "duration": args.duration,
+                          "upstream_ms": args.upstream_ms, "workers": args.workers, "results": results}, indent=2))
+        return
+
+    print(f"🏋️ Serving load test: {args.concurrency} clients, {args.duration:.0f}s, "
+          f"{args.upstream_ms:.0f}ms upstream, {args.workers} workers")
+    print("=" * 78)
+    for r in results:
+        print(f"🌐 {r['target']:<8} | {r['rps']:>6} req/s | p50 {r['p50_ms']:>7}ms | p95 {r['p95_ms']:>7}ms"
+              f" | p99 {r['p99_ms']:>7}ms | errors {r['errors']} | upstream {r['upstream_calls_per_s']}/s")
+
+
+if __name__ == "__main__":
+    main()
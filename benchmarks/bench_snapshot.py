@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Catalog snapshot benchmark
+Compares loading a synthetic catalog as a Python dict literal, as JSON and as an
+mmap'd snapshot, plus per-lookup latency and the heap each worker ends up holding.
+
+Usage: python benchmarks/bench_snapshot.py [--sizes 1000 10000 50000] [--lookups 2000] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from snapshot import Snapshot, build_snapshot
+
+SKILLS = [f"Skill {i}" for i in range(400)]
+
+
+def build_catalog(size: int, rng: random.Random):
+    careers = {f"career {i} {rng.choice(['engineer', 'analyst', 'manager'])}": rng.sample(SKILLS, 5)
+               for i in range(size)}
+    aliases = {f"alias {i}": name for i, name in enumerate(list(careers)[: size // 4])}
+    return careers, aliases
+
+
+def timed(fn, trace=True):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    seconds = time.perf_counter() - start
+    heap = tracemalloc.get_traced_memory()[0] if trace else None
+    tracemalloc.stop()
+    return value, seconds, heap
+
+
+def lookup_us(table, keys):
+    timings = []
+    for key in keys:
+        t0 = time.perf_counter()
+        table[key]
+        timings.append((time.perf_counter() - t0) * 1e6)
+    return round(statistics.median(timings), 2)
+
+
+def run(size: int, lookups: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    careers, aliases = build_catalog(size, rng)
+    literal = f"FALLBACK_SKILLS = {careers!r}\nCAREER_ALIASES = {aliases!r}\n"
+    as_json = json.dumps({"careers": careers, "aliases": aliases})
+    data = build_snapshot(careers, aliases)
+    keys = [rng.choice(list(careers)) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.snap")
+        with open(path, "wb") as f:
+            f.write(data)
+        _, literal_s, _ = timed(lambda: exec(compile(literal, "catalog", "exec"), {}), trace=False)
+        loaded, json_s, json_heap = timed(lambda: json.loads(as_json))
+        snap, snap_s, snap_heap = timed(lambda: Snapshot.open(path))
+        result = {
+            "careers": size,
+            "snapshot_bytes": len(data),
+            "json_bytes": len(as_json),
+            "load_ms": {
+                "dict_literal": round(literal_s * 1000, 2),
+                "json": round(json_s * 1000, 2),
+                "snapshot": round(snap_s * 1000, 3),
+            },
+            "heap_kb": {
+                "json": round(json_heap / 1024),
+                "snapshot": round(snap_heap / 1024),
+            },
+            "lookup_p50_us": {
+                "dict": lookup_us(loaded["careers"], keys),
+                "snapshot": lookup_us(snap.careers, keys),
+            },
+        }
+        snap.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    results = [run(size, args.lookups) for size in args.sizes]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("🗂️ Catalog snapshot benchmark")
+    print("=" * 60)
+    for r in results:
+        print(f"📚 {r['careers']:>6} careers | snapshot {r['snapshot_bytes'] // 1024} KB, JSON {r['json_bytes'] // 1024} KB")
+        print(f"   ⏱️ load: literal {r['load_ms']['dict_literal']}ms  json {r['load_ms']['json']}ms"
+              f"  snapshot {r['load_ms']['snapshot']}ms")
+        print(f"   🧠 heap: json {r['heap_kb']['json']} KB  snapshot {r['heap_kb']['snapshot']} KB")
+        print(f"   🔍 lookup p50: dict {r['lookup_p50_us']['dict']}us  snapshot {r['lookup_p50_us']['snapshot']}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Fixed-RPS load test of career_playlist against the mock upstream
+Starts benchmarks/mock_upstream.py in-process, then sends playlist requests on
+a fixed schedule (open loop: a slow response doesn't delay the next request,
+and latency is measured from when a request was due, so queueing counts) to
+either career_playlist called in this process or a backend/server.py it starts
+(--target gthread|asgi|dev). Writes a JSON report with throughput, latency
+percentiles, status counts and upstream calls per endpoint.
+
+Every run with the same options and --seed sends the same requests, and the
+mock answers them with the same sequence of latencies and errors. By default each request has its own known_skills and
+provider caching is off, so every lookup goes upstream; --warm-caches keeps the
+backend's caches and repeats payloads instead. --unknown-careers sends a share
+of careers outside the catalog, which go to the mock Vertex endpoint.
+
+Usage: python benchmarks/load_test.py [--rps 50] [--duration 20] [--target inprocess|gthread|asgi|dev]
+                                      [--latency lognormal:80,0.4] [--error-rate 0.01] [--quota-calls youtube=500]
+                                      [--report load_report.json] [--json]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_serving import LOAD_TEST_ENV, TARGETS, free_port, start_backend, wait_ready
+from mock_upstream import MockUpstream, add_profile_arguments, profiles_from_args
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+CAREERS = ["Data Scientist", "DevOps Engineer", "Web Developer", "Data Analyst", "Cybersecurity Analyst",
+           "Nurse", "Chef", "Product Manager"]
+
+
+def build_workload(args) -> list:
+    """The (career, known_skills) payloads to send, the same for a given seed."""
+    rng = random.Random(args.seed)
+    payloads = []
+    for i in range(int(args.rps * (args.warmup + args.duration))):
+        if rng.random() < args.unknown_careers:
+            career = f"Load Test Career {rng.randrange(10 ** 6)}"
+        else:
+            career = rng.choice(CAREERS)
+        known_skills = [] if args.warm_caches else [f"lt-{args.seed}-{i}"]
+        payloads.append({"career": career, "known_skills": known_skills})
+    return payloads
+
+
+class InProcessTarget:
+    """Calls main.career_playlist directly (main is imported with the mock's environment)."""
+
+    def __init__(self, env: dict):
+        os.environ.update(env)
+        sys.path.insert(0, BACKEND)
+        from flask import Flask, request
+        import main
+        self.main, self.request = main, request
+        self.app = Flask(__name__)
+
+    def send(self, payload: dict) -> int:
+        with self.app.test_request_context("/", method="POST", json=payload):
+            _, status, _ = self.main.career_playlist(self.request)
+        return status
+
+    def close(self):
+        pass
+
+
+class HttpTarget:
+    """POSTs to a backend/server.py subprocess over one keep-alive connection per thread."""
+
+    def __init__(self, target: str, mock: MockUpstream, env: dict, workers: int):
+        self.port = free_port()
+        self.proc = start_backend(target, self.port, mock, workers, env)
+        wait_ready(self.port, self.proc)
+        self.local = threading.local()
+
+    def send(self, payload: dict) -> int:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            conn.request("POST", "/", body=json.dumps(payload), headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self.local.conn = None
+            raise
+
+    def close(self):
+        os.killpg(self.proc.pid, signal.SIGTERM)
+        self.proc.wait(timeout=40)
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+def summarize_ms(values) -> dict:
+    return {
+        "mean": round(statistics.fmean(values) * 1000, 2) if values else 0.0,
+        "p50": round(percentile(values, 0.50) * 1000, 2),
+        "p95": round(percentile(values, 0.95) * 1000, 2),
+        "p99": round(percentile(values, 0.99) * 1000, 2),
+        "max": round(max(values) * 1000, 2) if values else 0.0,
+    }
+
+
+def drive(target, payloads: list, rps: float, warmup: float, max_inflight: int, on_measure_start) -> dict:
+    """Send payloads[i] at start + i/rps; returns the measured requests' results."""
+    results = []  # (latency s, lag s, status or None)
+    lock = threading.Lock()
+    warmup_count = int(rps * warmup)
+
+    def one(i: int, due: float):
+        started = time.perf_counter()
+        try:
+            status = target.send(payloads[i])
+        except Exception:
+            status = None
+        if i >= warmup_count:
+            with lock:
+                results.append((time.perf_counter() - due, started - due, status))
+
+    start = time.perf_counter()
+    measure_start = start + warmup
+    with ThreadPoolExecutor(max_inflight) as pool:
+        for i in range(len(payloads)):
+            due = start + i / rps
+            if i == warmup_count:
+                on_measure_start()
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one, i, due)
+    return {"results": results, "elapsed": time.perf_counter() - measure_start}
+
+
+def run(args) -> dict:
+    payloads = build_workload(args)
+    env = dict(LOAD_TEST_ENV, LOG_LEVEL="ERROR")
+    if args.warm_caches:
+        for name in ("YOUTUBE_CACHE_TTL", "BOOKS_CACHE_TTL", "CERTIFICATIONS_CACHE_TTL", "PROVIDER_STALE_TTL"):
+            env.pop(name)
+    with MockUpstream(profiles_from_args(args), seed=args.seed) as mock:
+        if args.target == "inprocess":
+            target = InProcessTarget(dict(env, **mock.env()))
+        else:
+            target = HttpTarget(args.target, mock, env, args.workers)
+        try:
+            # Upstream calls are counted from the end of the warm-up (quota use is not reset)
+            snapshot = {}
+            run_ = drive(target, payloads, args.rps, args.warmup, args.max_inflight,
+                         lambda: snapshot.update(mock.stats()))
+        finally:
+            target.close()
+        upstream = mock.stats(since=snapshot)
+        profile = mock.describe()
+
+    results = run_["results"]
+    ok = [latency for latency, _, status in results if status == 200]
+    statuses = {}
+    for _, _, status in results:
+        key = str(status) if status is not None else "connection_error"
+        statuses[key] = statuses.get(key, 0) + 1
+    calls = sum(endpoint["calls"] for endpoint in upstream.values())
+    return {
+        "config": {
+            "target": args.target, "rps": args.rps, "duration": args.duration, "warmup": args.warmup,
+            "workers": args.workers if args.target != "inprocess" else None, "warm_caches": args.warm_caches,
+            "unknown_careers": args.unknown_careers, "max_inflight": args.max_inflight, "upstream": profile,
+        },
+        "requests": {"sent": len(results), "ok": len(ok), "statuses": statuses},
+        "throughput_rps": round(len(ok) / run_["elapsed"], 2),
+        "latency_ms": summarize_ms(ok),
+        "schedule_lag_ms": summarize_ms([lag for _, lag, _ in results]),
+        "upstream": {"calls": calls, "calls_per_request": round(calls / len(results), 2) if results else 0.0,
+                     "endpoints": upstream},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=["inprocess", *sorted(TARGETS)], default="inprocess")
+    parser.add_argument("--rps", type=float, default=50.0, help="requests sent per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before that")
+    parser.add_argument("--workers", type=int, default=2, help="WEB_CONCURRENCY for server targets")
+    parser.add_argument("--max-inflight", type=int, default=256, help="requests outstanding at once")
+    parser.add_argument("--unknown-careers", type=float, default=0.0, help="share of careers outside the catalog")
+    parser.add_argument("--warm-caches", action="store_true", help="keep the backend's caches and repeat payloads")
+    parser.add_argument("--report", help="write the JSON report to this file")
+    parser.add_argument("--json", action="store_true", help="print the JSON report")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    latency = report["latency_ms"]
+    print(f"🎯 Load test: {args.target}, {args.rps:g} req/s offered for {args.duration:g}s (seed {args.seed})")
+    print("=" * 70)
+    print(f"📈 Throughput: {report['throughput_rps']} req/s ({report['requests']['ok']}/{report['requests']['sent']} ok,"
+          f" statuses {report['requests']['statuses']})")
+    print(f"⏱️ Latency:    p50 {latency['p50']}ms | p95 {latency['p95']}ms | p99 {latency['p99']}ms"
+          f" | max {latency['max']}ms")
+    print(f"🌐 Upstream:   {report['upstream']['calls']} calls ({report['upstream']['calls_per_request']} per request)")
+    for name, endpoint in report["upstream"]["endpoints"].items():
+        print(f"   {name:<15} {endpoint['calls']:>6} calls  {endpoint['statuses']}")
+    if args.report:
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Deterministic local stand-in for the upstream APIs
+Serves YouTube search, Google Books volumes, Knowledge Graph search and a
+Vertex-style text :predict endpoint with configurable latency distributions,
+error rates and quota 403s, so load tests and benchmarks never touch Google.
+
+Every call draws its latency and outcome from a generator seeded with
+(seed, endpoint, call number), and response bodies are derived from the query,
+so the same seed and workload give the same upstream behaviour on every run.
+
+    python benchmarks/mock_upstream.py --port 9100 --latency lognormal:80,0.4 \\
+        --error-rate books=0.05 --quota-calls youtube=500
+
+prints the environment variables that point the backend at it. In Python:
+
+    with MockUpstream({"youtube": EndpointProfile(latency="uniform:40,120")}, seed=7) as mock:
+        os.environ.update(mock.env())
+        ...
+        mock.stats()  # calls and statuses per endpoint
+
+Latency specs (milliseconds): "80" or "fixed:80", "uniform:LOW,HIGH",
+"lognormal:MEDIAN,SIGMA".
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PATHS = {
+    "youtube": "/youtube/v3/search",
+    "books": "/books/v1/volumes",
+    "certifications": "/v1/entities:search",
+    "vertex": "/v1/projects/mock/locations/us-central1/publishers/google/models/text-bison:predict",
+}
+ENV_NAMES = {
+    "youtube": "YOUTUBE_SEARCH_URL",
+    "books": "BOOKS_VOLUMES_URL",
+    "certifications": "KNOWLEDGE_GRAPH_SEARCH_URL",
+    "vertex": "VERTEX_PREDICT_URL",
+}
+QUOTA_MESSAGES = {
+    "youtube": "The request cannot be completed because you have exceeded your quota.",
+    "books": "Quota exceeded for quota metric 'Queries' and limit 'Queries per day'.",
+    "certifications": "Quota exceeded for quota metric 'Read requests' and limit 'Read requests per day'.",
+    "vertex": "Quota exceeded for aiplatform.googleapis.com/online_prediction_requests_per_base_model.",
+}
+SKILL_POOL = ["Python", "SQL", "Communication", "Project Management", "Statistics", "Excel", "Cloud Computing",
+              "Data Visualization", "Leadership", "Git", "Linux", "Customer Service", "Negotiation", "Research"]
+
+
+class LatencySpec:
+    """A latency distribution parsed from "80", "fixed:80", "uniform:40,120" or "lognormal:80,0.5" (ms)."""
+
+    def __init__(self, spec: str):
+        self.spec = str(spec)
+        kind, _, values = self.spec.partition(":") if ":" in self.spec else ("fixed", "", self.spec)
+        self.kind = kind
+        self.values = [float(v) for v in values.split(",")]
+        if kind not in ("fixed", "uniform", "lognormal") or len(self.values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"bad latency spec {spec!r}: use fixed:MS, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+
+    def sample(self, rng: random.Random) -> float:
+        """Seconds for one call."""
+        if self.kind == "fixed":
+            ms = self.values[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(*self.values)
+        else:
+            ms = self.values[0] * math.exp(rng.gauss(0, self.values[1]))
+        return max(ms, 0) / 1000
+
+
+class EndpointProfile:
+    """How one endpoint behaves.
+
+    latency     - LatencySpec string
+    error_rate  - fraction of calls answered 503
+    quota_calls - calls answered normally before every later one gets a quota 403 (None = unlimited)
+    quota_rate  - fraction of calls answered with a quota 403 anyway
+    """
+
+    def __init__(self, latency="fixed:80", error_rate: float = 0.0, quota_calls: int = None,
+                 quota_rate: float = 0.0):
+        self.latency = LatencySpec(latency)
+        self.error_rate = error_rate
+        self.quota_calls = quota_calls
+        self.quota_rate = quota_rate
+
+    def describe(self) -> dict:
+        return {"latency": self.latency.spec, "error_rate": self.error_rate,
+                "quota_calls": self.quota_calls, "quota_rate": self.quota_rate}
+
+
+def stable_hash(*parts) -> str:
+    return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+
+
+def youtube_body(params: dict) -> dict:
+    q = params.get("q", "")
+    return {"items": [
+        {"id": {"kind": "youtube#video", "videoId": stable_hash("yt", q, i)[:11]},
+         "snippet": {"title": f"{q.title()} - Part {i + 1}",
+                     "thumbnails": {"default": {"url": f"https://i.ytimg.com/vi/{stable_hash('yt', q, i)[:11]}/default.jpg"}}}}
+        for i in range(int(params.get("maxResults", 3)))
+    ]}
+
+
+def books_body(params: dict) -> dict:
+    q = params.get("q", "")
+    return {"items": [
+        {"volumeInfo": {"title": f"{q.title()}, Volume {i + 1}", "authors": [f"Author {stable_hash('bk', q, i)[:4]}"],
+                        "description": f"A practical guide to {q}.",
+                        "imageLinks": {"thumbnail": f"https://books.example/{stable_hash('bk', q, i)[:8]}.jpg"},
+                        "infoLink": f"https://books.google.com/books?id={stable_hash('bk', q, i)[:12]}"}}
+        for i in range(int(params.get("maxResults", 3)))
+    ]}
+
+
+def certifications_body(params: dict) -> dict:
+    topic = params.get("query", "").split(" certification")[0]
+    return {"itemListElement": [
+        {"result": {"name": f"{topic} Professional Certification {i + 1}",
+                    "description": f"Certification program for {topic}",
+                    "detailedDescription": {"articleBody": f"An industry certification covering {topic}.",
+                                            "url": f"https://certs.example/{stable_hash('kg', topic, i)[:8]}"}},
+         "resultScore": 100 - i}
+        for i in range(int(params.get("limit", 6)))
+    ]}
+
+
+def vertex_body(payload: dict) -> dict:
+    prompt = (payload.get("instances") or [{}])[0].get("prompt", "")
+    rng = random.Random(stable_hash("vertex", prompt))
+    return {"predictions": [{"content": json.dumps(rng.sample(SKILL_POOL, 5))}]}
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # load tests open many connections at once
+
+
+class MockUpstream:
+    """The mock server; start() it (or use it as a context manager) and point the backend at env()."""
+
+    def __init__(self, profiles: dict = None, seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.profiles = {name: EndpointProfile() for name in PATHS}
+        self.profiles.update(profiles or {})
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._calls = {name: 0 for name in PATHS}
+        self._statuses = {name: {} for name in PATHS}
+        self._admitted = {name: 0 for name in PATHS}
+        self.server = MockServer((host, port), self.handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Environment variables pointing the backend at this server (with placeholder API keys)."""
+        env = {ENV_NAMES[name]: self.url + path for name, path in PATHS.items()}
+        env.update(YOUTUBE_API_KEY="mock", GOOGLE_BOOKS_API_KEY="mock", GOOGLE_KNOWLEDGE_GRAPH_API_KEY="mock")
+        return env
+
+    def decide(self, name: str):
+        """(delay seconds, status) for the next call to an endpoint."""
+        profile = self.profiles[name]
+        with self._lock:
+            call = self._calls[name]
+            self._calls[name] += 1
+            rng = random.Random(f"{self.seed}:{name}:{call}")
+            delay = profile.latency.sample(rng)
+            if profile.quota_calls is not None and self._admitted[name] >= profile.quota_calls:
+                status = 403
+            elif rng.random() < profile.quota_rate:
+                status = 403
+            elif rng.random() < profile.error_rate:
+                status = 503
+            else:
+                status = 200
+                self._admitted[name] += 1
+            self._statuses[name][status] = self._statuses[name].get(status, 0) + 1
+        return delay, status
+
+    def stats(self, since: dict = None) -> dict:
+        """Calls and statuses per endpoint, minus those in an earlier stats() snapshot."""
+        with self._lock:
+            stats = {name: {"calls": self._calls[name],
+                            "statuses": {str(s): n for s, n in sorted(self._statuses[name].items())}}
+                     for name in PATHS}
+        for name, before in (since or {}).items():
+            stats[name]["calls"] -= before["calls"]
+            stats[name]["statuses"] = {status: n - before["statuses"].get(status, 0)
+                                       for status, n in stats[name]["statuses"].items()
+                                       if n - before["statuses"].get(status, 0)}
+        return stats
+
+    def describe(self) -> dict:
+        return {"seed": self.seed, "endpoints": {name: p.describe() for name, p in self.profiles.items()}}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def handler_class(self):
+        mock = self
+        routes = {path: name for name, path in PATHS.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                params = dict(urllib.parse.parse_qsl(query))
+                builders = {"youtube": youtube_body, "books": books_body, "certifications": certifications_body}
+                name = routes.get(path)
+                if name not in builders:
+                    return self.reply(404, {"error": {"code": 404, "message": "Not found"}})
+                self.answer(name, lambda: builders[name](params))
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if routes.get(self.path) != "vertex":
+                    return self.reply(404, {"error": {"code": 404, "message": "Not found"}})
+                self.answer("vertex", lambda: vertex_body(json.loads(body or b"{}")))
+
+            def do_HEAD(self):
+                # preconnect() sends a HEAD per host during warm-up
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def answer(self, name, build):
+                delay, status = mock.decide(name)
+                time.sleep(delay)
+                if status == 403:
+                    self.reply(403, {"error": {"code": 403, "message": QUOTA_MESSAGES[name],
+                                               "errors": [{"reason": "quotaExceeded"}]}})
+                elif status == 503:
+                    self.reply(503, {"error": {"code": 503, "message": "Backend Error"}})
+                else:
+                    self.reply(200, build())
+
+            def reply(self, status: int, data: dict):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def per_endpoint(values, convert) -> dict:
+    """["80", "youtube=lognormal:120,0.5"] -> {"*": "80", "youtube": "lognormal:120,0.5"}."""
+    result = {}
+    for value in values or []:
+        name, _, setting = value.rpartition("=") if "=" in value else ("*", "", value)
+        if name != "*" and name not in PATHS:
+            raise SystemExit(f"unknown endpoint {name!r}: choose from {', '.join(PATHS)}")
+        result[name] = convert(setting)
+    return result
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """The --latency/--error-rate/--quota-calls/--quota-rate/--seed options shared with load_test.py."""
+    group = parser.add_argument_group("mock upstream", "each takes VALUE (all endpoints) or ENDPOINT=VALUE, repeatable")
+    group.add_argument("--latency", action="append", help="latency spec, default fixed:80")
+    group.add_argument("--error-rate", action="append", help="fraction of calls answered 503")
+    group.add_argument("--quota-calls", action="append", help="calls allowed before every call gets a quota 403")
+    group.add_argument("--quota-rate", action="append", help="fraction of calls answered with a quota 403")
+    group.add_argument("--seed", type=int, default=0)
+
+
+def profiles_from_args(args) -> dict:
+    settings = {
+        "latency": per_endpoint(args.latency, str),
+        "error_rate": per_endpoint(args.error_rate, float),
+        "quota_calls": per_endpoint(args.quota_calls, int),
+        "quota_rate": per_endpoint(args.quota_rate, float),
+    }
+    profiles = {}
+    for name in PATHS:
+        options = {key: values.get(name, values.get("*")) for key, values in settings.items()}
+        profiles[name] = EndpointProfile(**{key: value for key, value in options.items() if value is not None})
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    mock = MockUpstream(profiles_from_args(args), seed=args.seed, host=args.host, port=args.port)
+    print(f"🧪 Mock upstream on {mock.url} (seed {args.seed})")
+    for name, profile in mock.profiles.items():
+        print(f"   {name:<15} {json.dumps(profile.describe())}")
+    print("\n# Point the backend at it:")
+    for key, value in mock.env().items():
+        print(f"export {key}={value}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {json.dumps(mock.stats())}")
+
+
+if __name__ == "__main__":
+    main()
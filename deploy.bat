@@ -22,7 +22,7 @@ gcloud functions deploy career-playlist ^
   --trigger-http ^
   --allow-unauthenticated ^
   --entry-point career_playlist ^
-  --set-env-vars YOUTUBE_API_KEY=%YOUTUBE_API_KEY%,GCP_PROJECT=%PROJECT_ID%,LOCATION=us-central1
+  --set-env-vars YOUTUBE_API_KEY=%YOUTUBE_API_KEY%,GCP_PROJECT=%PROJECT_ID%,LOCATION=us-central1,SKILLS_STORE=firestore
 
 if %errorlevel% neq 0 (
     echo Error: Backend deployment failed!
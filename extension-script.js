@@ -11,6 +11,9 @@ class CareerPlaylistExtension {
         
         // Extension works WITHOUT APIs using static fallback
         this.FALLBACK_MODE = true; // Always enable fallback for users
+
+        // Last response per request body, revalidated with If-None-Match (304 = reuse)
+        this.responseCache = new Map();
         
         this.popularCareers = [
             'Data Scientist', 'Frontend Developer', 'DevOps Engineer', 'UI/UX Designer',
@@ -112,19 +115,36 @@ class CareerPlaylistExtension {
         
         for (const apiUrl of this.API_ENDPOINTS) {
             try {
+                const body = JSON.stringify({
+                    career: career,
+                    known_skills: skills.split(',').map(s => s.trim()).filter(Boolean)
+                });
+                const cacheKey = `${apiUrl} ${body}`;
+                const cached = this.responseCache.get(cacheKey);
+                const headers = { 'Content-Type': 'application/json' };
+                if (cached) {
+                    headers['If-None-Match'] = cached.etag;
+                }
+
                 const response = await fetch(apiUrl, {
                     method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        career: career,
-                        known_skills: skills.split(',').map(s => s.trim()).filter(Boolean)
-                    })
+                    headers: headers,
+                    body: body
                 });
 
+                if (response.status === 304 && cached) {
+                    this.displayResults(cached.data);
+                    this.saveData(career, skills);
+                    success = true;
+                    break;
+                }
+
                 if (response.ok) {
                     const data = await response.json();
+                    const etag = response.headers.get('ETag');
+                    if (etag) {
+                        this.responseCache.set(cacheKey, { etag, data });
+                    }
                     this.displayResults(data);
                     this.saveData(career, skills);
                     success = true;
@@ -2,6 +2,9 @@ import React, { useState } from 'react'
 
 const API = process.env.REACT_APP_API_URL || 'http://localhost:8080'
 
+// Last response per request body, revalidated with If-None-Match (304 = reuse)
+const responseCache = new Map()
+
 export default function App(){
   const [career, setCareer] = useState('Data Scientist')
   const [loading, setLoading] = useState(false)
@@ -23,20 +26,28 @@ export default function App(){
     setError(null)
     
     try{
-      const res = await fetch(API, {
-        method:'POST',
-        headers:{'Content-Type':'application/json'},
-        body: JSON.stringify({ 
-          career, 
-          known_skills: knownSkills.split(',').map(s=>s.trim()).filter(Boolean) 
-        })
+      const body = JSON.stringify({ 
+        career, 
+        known_skills: knownSkills.split(',').map(s=>s.trim()).filter(Boolean) 
       })
+      const cached = responseCache.get(body)
+      const headers = {'Content-Type':'application/json'}
+      if (cached) headers['If-None-Match'] = cached.etag
+
+      const res = await fetch(API, { method:'POST', headers, body })
       
+      if (res.status === 304 && cached) {
+        setData(cached.data)
+        return
+      }
+
       if (!res.ok) {
         throw new Error(`HTTP error! status: ${res.status}`)
       }
       
       const json = await res.json()
+      const etag = res.headers.get('ETag')
+      if (etag) responseCache.set(body, { etag, data: json })
       setData(json)
     } catch(err) {
       console.error('Error:', err)
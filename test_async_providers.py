@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Async provider client test
+Checks the async lookups against the sync ones with a fake upstream, and that the
+async fan-out runs many slow lookups at once on one event loop
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+from quota import ProviderBudget, QuotaManager
+from async_http_client import async_http_get
+from singleflight import AsyncSingleFlight
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+VIDEOS = {"items": [{"id": {"videoId": "abc"}, "snippet": {"title": "Intro", "thumbnails": {"default": {"url": "t"}}}}]}
+
+
+def test_async_fetch_matches_sync():
+    print("🧪 Testing async fetch against the sync one")
+    original = (main.http_get, main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+
+    async def fake_async_get(url, params=None, timeout=8):
+        return FakeResponse(VIDEOS)
+
+    main.http_get = lambda url, params=None, timeout=8: FakeResponse(VIDEOS)
+    main.async_http_get = fake_async_get
+    main.YOUTUBE_API_KEY, main.QUOTA = "test-key", QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    try:
+        sync = main.fetch_youtube_links("Python")
+        result = asyncio.run(main.fetch_youtube_links_async("Python"))
+    finally:
+        main.http_get, main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+    assert result == sync == [{"title": "Intro", "url": "https://www.youtube.com/watch?v=abc", "thumbnail": "t"}]
+    print("✅ Same video objects from both clients")
+
+
+def test_async_timeout_uses_fallback():
+    print("\n🧪 Testing async timeout fallback")
+    original = (main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+
+    async def timeout_get(url, params=None, timeout=8):
+        raise requests.exceptions.Timeout("read timed out")
+
+    main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA = timeout_get, "test-key", QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    main.PROVIDER_CACHES["youtube"].clear()
+    failures = main.BREAKERS["youtube"].stats()["recent_failures"]
+    try:
+        result = asyncio.run(main.get_youtube_links_async("Rust"))
+        recorded = main.BREAKERS["youtube"].stats()["recent_failures"]
+    finally:
+        main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+    assert result == main.get_youtube_fallback("Rust")
+    assert recorded == failures + 1
+    print("✅ Fallback links returned and the breaker saw the failure")
+
+
+def test_async_fanout_is_concurrent():
+    print("\n🧪 Testing async fan-out")
+
+    async def slow_lookup(skill, max_results=3):
+        await asyncio.sleep(0.2)
+        return [{"title": f"{skill} resource"}]
+
+    original = main.ASYNC_PROVIDERS
+    main.ASYNC_PROVIDERS = tuple((field, slow_lookup, fallback) for field, _, fallback in original)
+    skills = [f"Skill {i}" for i in range(200)]
+    before = set(threading.enumerate())
+    try:
+        start = time.perf_counter()
+        entries = asyncio.run(main.fetch_skill_resources_async(skills))
+        elapsed = time.perf_counter() - start
+    finally:
+        main.ASYNC_PROVIDERS = original
+    assert [e["skill"] for e in entries] == skills
+    assert entries[7]["books"] == [{"title": "Skill 7 resource"}]
+    assert elapsed < 1.0
+    # Only threads this call could have started: fan-out pool workers or asyncio's default executor
+    # (other tests' background threads may start or exit meanwhile)
+    started = [t.name for t in threading.enumerate()
+               if t not in before and t.name.startswith(("fanout", "asyncio"))]
+    assert not started, started
+    print(f"✅ {len(skills) * 3} lookups of 200ms in {elapsed * 1000:.0f}ms without extra threads")
+
+
+def test_async_singleflight():
+    print("\n🧪 Testing async request coalescing")
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def lookup(skill):
+        calls.append(skill)
+        await asyncio.sleep(0.05)
+        return skill.upper()
+
+    async def run():
+        return await asyncio.gather(*[flights.do("go", lookup, "go") for _ in range(10)])
+
+    assert asyncio.run(run()) == ["GO"] * 10
+    assert calls == ["go"] and flights.stats()["coalesced"] == 9
+    print("✅ 10 concurrent awaits, 1 call")
+
+
+def test_transport_errors_are_translated():
+    print("\n🧪 Testing async client errors")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    try:
+        asyncio.run(async_http_get(f"http://127.0.0.1:{port}/", timeout=2))
+    except requests.exceptions.ConnectionError:
+        pass
+    else:
+        raise AssertionError("expected a ConnectionError")
+    print("✅ Connection refused surfaces as requests' ConnectionError")
+
+
+def test_async_playlist_matches_sync():
+    print("\n🧪 Testing career_playlist_async")
+    app = Flask(__name__)
+    payload = {"career": "DevOps", "known_skills": ["Docker"]}
+    with app.test_request_context("/", method="POST", json=payload):
+        main.invalidate_response_cache()
+        sync_body, _, _ = main.career_playlist(request)
+        main.invalidate_response_cache()
+        async_body, status, headers = asyncio.run(main.career_playlist_async(request))
+    assert status == 200 and json.loads(async_body) == json.loads(sync_body)
+    print(f"✅ Identical playlists ({len(json.loads(async_body)['skills_to_learn'])} skills)")
+
+
+def test_cache_and_quota_io_stay_off_the_loop():
+    print("\n🧪 Testing that SQLite/ledger steps run off the event loop")
+    loop_threads = []
+
+    class RecordingCache:
+        """Stands in for a provider cache with a SQLite tier."""
+
+        def get_entry(self, key):
+            loop_threads.append(threading.current_thread())
+
+        def set(self, key, results):
+            loop_threads.append(threading.current_thread())
+
+    class RecordingQuota(QuotaManager):
+        def try_acquire(self, provider):
+            loop_threads.append(threading.current_thread())
+            return super().try_acquire(provider)
+
+    async def fake_async_get(url, params=None, timeout=8):
+        return FakeResponse(VIDEOS)
+
+    async def lookup():
+        return threading.current_thread(), await main.get_youtube_links_async("Elixir")
+
+    original = (main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA, main.PROVIDER_CACHES["youtube"],
+                main.CACHE_IO_BLOCKS, main.QUOTA_IO_BLOCKS)
+    main.async_http_get, main.YOUTUBE_API_KEY = fake_async_get, "test-key"
+    main.QUOTA = RecordingQuota([ProviderBudget("youtube", 10000, 100)])
+    main.PROVIDER_CACHES["youtube"] = RecordingCache()
+    main.CACHE_IO_BLOCKS = main.QUOTA_IO_BLOCKS = True
+    try:
+        loop_thread, result = asyncio.run(lookup())
+    finally:
+        (main.async_http_get, main.YOUTUBE_API_KEY, main.QUOTA, main.PROVIDER_CACHES["youtube"],
+         main.CACHE_IO_BLOCKS, main.QUOTA_IO_BLOCKS) = original
+    assert result == [{"title": "Intro", "url": "https://www.youtube.com/watch?v=abc", "thumbnail": "t"}]
+    assert len(loop_threads) == 3 and loop_thread not in loop_threads
+    print("✅ Cache read, quota reservation and cache write all ran on threads")
+
+
+if __name__ == "__main__":
+    test_async_fetch_matches_sync()
+    test_async_timeout_uses_fallback()
+    test_async_fanout_is_concurrent()
+    test_async_singleflight()
+    test_transport_errors_are_translated()
+    test_async_playlist_matches_sync()
+    test_cache_and_quota_io_stay_off_the_loop()
+    print("\n🎉 Async provider tests completed!")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Batch endpoint test
+Counts provider lookups with fake providers to check skills are shared across careers,
+and checks the batch's own deadline and pool
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+
+app = Flask(__name__)
+
+
+def post_batch(payload):
+    with app.test_request_context("/batch", method="POST", json=payload):
+        return main.career_playlist(request)
+
+
+def counting_providers(calls):
+    def make(field):
+        def lookup(skill, max_results=3):
+            calls.append((field, skill))
+            return [{"title": f"{skill} {field}", "url": "https://example.com"}]
+        return lookup
+    return tuple((field, make(field), fallback) for field, _, fallback in main.PROVIDERS)
+
+
+def test_shared_skills_are_looked_up_once():
+    print("🧪 Testing batch deduplication")
+    calls = []
+    original = main.PROVIDERS
+    main.PROVIDERS = counting_providers(calls)
+    main.invalidate_response_cache()
+    careers = ["Data Scientist", "Data Analyst", "Machine Learning Engineer", "Backend Developer"]
+    try:
+        body, status, _ = post_batch({"careers": [{"career": c, "known_skills": []} for c in careers]})
+    finally:
+        main.PROVIDERS = original
+
+    assert status == 200
+    results = json.loads(body)["results"]
+    assert [r["career"] for r in results] == careers
+    required = [e["skill"] for r in results for e in r["skills_to_learn"]]
+    unique = {s.lower() for s in required}
+    assert len(required) > len(unique)
+    assert len(calls) == 3 * len(unique)
+    python = [e for r in results for e in r["skills_to_learn"] if e["skill"] == "Python"]
+    assert len(python) >= 2 and all(e["videos"][0]["title"] == "Python videos" for e in python)
+    print(f"✅ {len(required)} skills across {len(careers)} careers, {len(unique)} unique lookups per provider")
+
+
+def test_batch_matches_single_requests_and_reuses_cache():
+    print("\n🧪 Testing batch bodies and response cache")
+    main.invalidate_response_cache()
+    payload = {"careers": [{"career": "DevOps", "known_skills": ["Linux"]}, "Data Scientist"]}
+    body, _, _ = post_batch(payload)
+    batch = json.loads(body)["results"]
+
+    with app.test_request_context("/", method="POST", json={"career": "DevOps", "known_skills": ["Linux"]}):
+        single, _, _ = main.career_playlist(request)
+    assert json.loads(single) == batch[0]
+    assert batch[1]["known_skills"] == []
+    print("✅ Batch entries match single-career responses")
+
+
+def test_batch_deadline_and_pool():
+    print("\n🧪 Testing the batch deadline")
+    threads = set()
+
+    def make(field, fallback):
+        def lookup(skill, max_results=3):
+            threads.add(threading.current_thread().name.split("_")[0])
+            if field == "videos" and skill == "Python":
+                time.sleep(1)
+            return [{"title": f"{skill} {field}", "url": "https://example.com"}]
+        return field, lookup, fallback
+
+    original = (main.PROVIDERS, main.BATCH_DEADLINE_SECONDS)
+    main.PROVIDERS = tuple(make(field, fallback) for field, _, fallback in original[0])
+    main.BATCH_DEADLINE_SECONDS = 0.3
+    main.invalidate_response_cache()
+    try:
+        body, status, _ = post_batch({"careers": ["Data Scientist", "DevOps"]})
+        late = main._response_cache.get(main.response_cache_key("Data Scientist", []))
+        complete = main._response_cache.get(main.response_cache_key("DevOps", []))
+    finally:
+        main.PROVIDERS, main.BATCH_DEADLINE_SECONDS = original
+        main.invalidate_response_cache()
+
+    assert status == 200
+    python = json.loads(body)["results"][0]["skills_to_learn"][0]
+    assert python["skill"] == "Python" and python["videos"] == main.get_youtube_fallback("Python")
+    assert late is None and complete is not None
+    assert threads == {"batch"}
+    print("✅ The late body is served but not cached; lookups ran on the batch pool")
+
+
+def test_invalid_batches():
+    print("\n🧪 Testing invalid batches")
+    assert post_batch({"careers": []})[1] == 400
+    assert post_batch({"career": "DevOps"})[1] == 400
+    too_many = {"careers": ["DevOps"] * (main.BATCH_MAX_CAREERS + 1)}
+    assert post_batch(too_many)[1] == 400
+    assert post_batch({"careers": [5]})[1] == 400
+    assert post_batch({"careers": ["DevOps", ["Linux"]]})[1] == 400
+    print("✅ Empty, malformed and oversized batches are rejected")
+
+
+if __name__ == "__main__":
+    test_shared_skills_are_looked_up_once()
+    test_batch_matches_single_requests_and_reuses_cache()
+    test_batch_deadline_and_pool()
+    test_invalid_batches()
+    print("\n🎉 Batch tests completed!")
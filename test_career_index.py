@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Career resolution index test
+Checks exact, alias, substring, token and typo-tolerant matching without a server
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from career_index import CareerIndex
+
+EXPECTED = {
+    "Data Scientist": "data scientist",
+    "  DATA   scientist ": "data scientist",
+    "devops": "devops engineer",
+    "dev": "web developer",
+    "ux designer": "ui/ux designer",
+    "senior data scientist": "data scientist",
+    "data sci": "data scientist",
+    "learning": "machine learning engineer",
+    "engineer machine learning": "machine learning engineer",
+    "cloud": "cloud architect",
+}
+
+
+def test_known_inputs():
+    print("🧪 Testing career resolution")
+    for text, career in EXPECTED.items():
+        resolved = main.resolve_career(text)
+        print(f"  '{text}' -> '{resolved}'")
+        assert resolved == career, (text, resolved)
+    print("✅ All inputs resolved to the expected career")
+
+
+def test_unknown_inputs_pass_through():
+    print("\n🧪 Testing unknown careers")
+    assert main.CAREER_INDEX.resolve("Python Developer") is None
+    assert main.resolve_career("Python  Developer") == "python developer"
+    assert main.CAREER_INDEX.resolve("nursery") is None  # whole words only
+    assert main.CAREER_INDEX.resolve("senior engineer") is None
+    print("✅ Unknown careers are left for Vertex")
+
+
+def test_result_does_not_depend_on_table_order():
+    print("\n🧪 Testing deterministic ranking")
+    careers = ["data engineer", "big data engineer", "data analyst"]
+    forward = CareerIndex(careers)
+    backward = CareerIndex(list(reversed(careers)))
+    for text in ["senior big data engineer", "data", "data eng"]:
+        assert forward.resolve(text) == backward.resolve(text), text
+    assert forward.resolve("senior big data engineer") == "big data engineer"  # longest contained career
+    assert forward.resolve("data") == "data analyst"  # shortest career starting with the input
+    print("✅ Same answer regardless of table order")
+
+
+def test_typos_resolve_locally():
+    print("\n🧪 Testing typo-tolerant matching")
+    typos = {
+        "data scienist": "data scientist",
+        "machne learning engr": "machine learning engineer",
+        "sofware enginer": "software engineer",
+        "grafic designer": "graphic designer",
+        "product managr": "product manager",
+    }
+    for text, career in typos.items():
+        match = main.CAREER_FUZZY.match(text)
+        print(f"  '{text}' -> {match}")
+        assert match is not None and match[0] == career, (text, match)
+        assert main.resolve_career(text) == career
+    print("✅ Near-miss inputs resolved without Vertex")
+
+
+def test_low_confidence_is_rejected():
+    print("\n🧪 Testing fuzzy confidence threshold")
+    for text in ["senior engineer", "python developer", "xyz"]:
+        assert main.CAREER_FUZZY.match(text) is None, text
+    print("✅ Weak matches are left for Vertex")
+
+
+def test_short_inputs_are_not_partial_matches():
+    print("\n🧪 Testing one- and two-letter inputs")
+    for text in ["a", "e", "d", "da"]:
+        resolved = main.CAREER_INDEX.resolve(text)
+        print(f"  '{text}' -> {resolved}")
+        assert resolved is None, (text, resolved)
+    assert main.CAREER_INDEX.resolve("dev") == "web developer"
+    assert main.CAREER_INDEX.resolve("ux") == "ui/ux designer"  # aliases of any length still apply
+    print("✅ Inputs under 3 characters are left for Vertex")
+
+
+if __name__ == "__main__":
+    test_known_inputs()
+    test_unknown_inputs_pass_through()
+    test_result_does_not_depend_on_table_order()
+    test_typos_resolve_locally()
+    test_low_confidence_is_rejected()
+    test_short_inputs_are_not_partial_matches()
+    print("\n🎉 Career index tests completed!")
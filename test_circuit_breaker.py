@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker test
+Uses a fake clock for the breaker and a fake upstream that times out
+"""
+
+import asyncio
+import os
+import sys
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from quota import ProviderBudget, QuotaManager
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_trips_on_failure_rate():
+    print("🧪 Testing failure-rate trip")
+    breaker = CircuitBreaker("youtube", window=10, min_calls=4, failure_rate=0.5, clock=FakeClock())
+    breaker.record_success(0.1)
+    breaker.record_failure(0.1)
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED  # below min_calls
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()["short_circuited"] == 1
+    print(f"✅ Opened after 2 of 4 calls failed ({breaker.stats()['last_trip_reason']})")
+
+
+def test_trips_on_slow_calls():
+    print("\n🧪 Testing latency trip")
+    breaker = CircuitBreaker("books", window=5, min_calls=5, slow_call_seconds=2.0, slow_call_rate=0.8,
+                             clock=FakeClock())
+    for _ in range(4):
+        breaker.record_success(3.0)
+    breaker.record_success(0.1)
+    assert breaker.state == OPEN
+    print("✅ Opened after 4 of 5 successful calls were slow")
+
+
+def test_half_open_single_probe():
+    print("\n🧪 Testing half-open probe")
+    clock = FakeClock()
+    breaker = CircuitBreaker("youtube", min_calls=1, open_seconds=30, clock=clock)
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+
+    clock.now += 31
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # only one probe at a time
+    breaker.record_failure(0.1)
+    assert breaker.state == OPEN
+    assert breaker.stats()["trips"] == 2
+
+    clock.now += 31
+    assert breaker.allow() is True
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow() is True
+    print("✅ One probe per open period; failed probe reopens, good probe closes")
+
+
+def test_cancelled_probe_frees_the_slot():
+    print("\n🧪 Testing cancelled probe")
+    clock = FakeClock()
+    breaker = CircuitBreaker("books", min_calls=1, open_seconds=10, clock=clock)
+    breaker.record_failure(0.1)
+    clock.now += 11
+    assert breaker.allow() is True
+    breaker.cancel()
+    assert breaker.allow() is True
+    print("✅ A probe refused by the quota budget doesn't wedge the breaker")
+
+
+def test_cancelled_upstream_call_releases_the_probe():
+    print("\n🧪 Testing a half-open probe cancelled mid-call")
+    clock = FakeClock()
+    breaker = CircuitBreaker("youtube", min_calls=1, open_seconds=10, clock=clock)
+    breaker.record_failure(0.1)
+    clock.now += 11
+
+    async def hanging_fetch(skill, max_results):
+        await asyncio.sleep(60)
+
+    async def cancel_probe():
+        task = asyncio.ensure_future(main.fetch_and_cache_async(
+            main.PROVIDER_CACHES["youtube"], "probe", "youtube", hanging_fetch, "Python", 3))
+        await asyncio.sleep(0.01)
+        assert breaker.allow() is False  # the probe is in flight
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    original = (main.YOUTUBE_API_KEY, main.BREAKERS["youtube"], main.QUOTA)
+    main.YOUTUBE_API_KEY, main.BREAKERS["youtube"], main.QUOTA = "test-key", breaker, QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    try:
+        asyncio.run(cancel_probe())
+    finally:
+        main.YOUTUBE_API_KEY, main.BREAKERS["youtube"], main.QUOTA = original
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    print("✅ A cancelled probe records no outcome and lets the next call probe")
+
+
+def test_dead_provider_is_short_circuited():
+    print("\n🧪 Testing short-circuit to fallback links")
+    upstream = []
+
+    def timeout_get(url, params=None, timeout=8):
+        upstream.append(params["q"])
+        raise requests.exceptions.Timeout("read timed out")
+
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.BREAKERS["youtube"], main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = timeout_get, "test-key", QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    main.BREAKERS["youtube"] = CircuitBreaker("youtube", window=10, min_calls=3, failure_rate=0.5)
+    main.PROVIDER_CACHES["youtube"].clear()
+    fallbacks = {reason: main.PROVIDER_FALLBACKS._values.get(("youtube", reason), 0)
+                 for reason in ("error", "breaker_open")}
+    try:
+        skills = [f"Skill {i}" for i in range(10)]
+        results = [main.get_youtube_links(skill) for skill in skills]
+        state = main.BREAKERS["youtube"].stats()
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.BREAKERS["youtube"], main.QUOTA = original
+
+    assert len(upstream) == 3
+    assert state["state"] == OPEN and state["short_circuited"] == 7
+    assert results[9] == main.get_youtube_fallback("Skill 9")
+    assert main.PROVIDER_FALLBACKS._values[("youtube", "error")] == fallbacks["error"] + 3
+    assert main.PROVIDER_FALLBACKS._values[("youtube", "breaker_open")] == fallbacks["breaker_open"] + 7
+    print(f"✅ {len(upstream)} timeouts, then fallback links without calling the API (counted as breaker_open)")
+
+
+def test_client_errors_do_not_trip():
+    print("\n🧪 Testing 4xx answers")
+    assert main.is_upstream_failure(main.ProviderError("books", "timeout")) is True
+    assert main.is_upstream_failure(main.ProviderError("books", "server error", status=503)) is True
+    assert main.is_upstream_failure(main.ProviderError("books", "bad request", status=400)) is False
+    assert main.is_upstream_failure(main.ProviderError("youtube", "quota", status=403, quota_exceeded=True)) is False
+    print("✅ Only timeouts, connection errors and 5xx count as failures")
+
+
+if __name__ == "__main__":
+    test_trips_on_failure_rate()
+    test_trips_on_slow_calls()
+    test_half_open_single_probe()
+    test_cancelled_probe_frees_the_slot()
+    test_cancelled_upstream_call_releases_the_probe()
+    test_dead_provider_is_short_circuited()
+    test_client_errors_do_not_trip()
+    print("\n🎉 Circuit breaker tests completed!")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Concurrent fan-out test for the playlist backend
+Runs the provider fan-out directly (no server or API keys needed)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+
+
+def slow_lookup(delay):
+    """Build a fake provider lookup that sleeps before answering"""
+    def lookup(skill, max_results=3):
+        time.sleep(delay)
+        return [{"title": f"{skill} result"}]
+    return lookup
+
+
+def fallback(skill, max_results=3):
+    return [{"title": f"{skill} fallback"}]
+
+
+def test_lookups_run_concurrently():
+    """Five skills x three providers should take about one call, not fifteen"""
+    print("🧪 Testing concurrent fan-out")
+    original = main.PROVIDERS
+    main.PROVIDERS = tuple((field, slow_lookup(0.2), fallback) for field, _, _ in original)
+    try:
+        skills = ["Python", "SQL", "Statistics", "Machine Learning", "Data Visualization"]
+        start = time.time()
+        results = main.fetch_skill_resources(skills, deadline=5)
+        elapsed = time.time() - start
+    finally:
+        main.PROVIDERS = original
+
+    print(f"⏱️ {len(skills) * 3} lookups took {elapsed:.2f}s")
+    assert elapsed < 1.0
+    assert [r["skill"] for r in results] == skills
+    assert list(results[0].keys()) == ["skill", "videos", "books", "certifications"]
+    assert results[0]["videos"] == [{"title": "Python result"}]
+    print("✅ Fan-out is concurrent and keeps response order")
+
+
+def test_deadline_uses_fallback():
+    """Lookups still running at the deadline are answered from the fallback builders"""
+    print("\n🧪 Testing fan-out deadline")
+    original = main.PROVIDERS
+    main.PROVIDERS = (
+        ("videos", slow_lookup(0), fallback),
+        ("books", slow_lookup(1.0), fallback),
+        ("certifications", slow_lookup(0), fallback),
+    )
+    try:
+        start = time.time()
+        results = main.fetch_skill_resources(["SQL"], deadline=0.2)
+        elapsed = time.time() - start
+    finally:
+        main.PROVIDERS = original
+
+    assert elapsed < 0.8
+    assert results[0]["videos"] == [{"title": "SQL result"}]
+    assert results[0]["books"] == [{"title": "SQL fallback"}]
+    print(f"✅ Slow provider replaced by fallback after {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    test_lookups_run_concurrently()
+    test_deadline_uses_fallback()
+    print("\n🎉 Fan-out tests completed!")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Hot-path microbenchmark test
+Runs every case of benchmarks/bench_hot_paths.py once with tiny parameters,
+checks the recorded fixtures still parse like live responses and that
+--compare flags a slowdown
+"""
+
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "backend"))
+sys.path.insert(0, os.path.join(HERE, "benchmarks"))
+
+import main
+from bench_hot_paths import CASES, RecordedResponse, compare, load_fixture, run
+
+
+def test_fixtures_parse():
+    print("🧪 Testing recorded provider fixtures")
+    videos = main.parse_youtube_response(RecordedResponse(load_fixture("youtube_search")), "Python")
+    books = main.parse_books_response(RecordedResponse(load_fixture("books_volumes")), "Python")
+    certifications = main.parse_certifications_response(RecordedResponse(load_fixture("kg_search")), "Python", 3)
+    assert len(videos) == 3 and videos[0]["url"].startswith("https://www.youtube.com/watch?v=")
+    assert len(books) == 3 and all(len(b["description"]) <= 203 for b in books)
+    assert len(certifications) == 3 and "Monty Python" not in [c["title"] for c in certifications]
+    print(f"✅ {len(videos)} videos, {len(books)} books, {len(certifications)} certifications")
+
+
+def test_every_case_runs():
+    print("\n🧪 Testing every benchmark case")
+    index, fuzzy = main.CAREER_INDEX, main.CAREER_FUZZY
+    args = argparse.Namespace(catalog_sizes=[40], skill_counts=[4], filter=None, repeat=1, min_time=0.001)
+    results = run(args)["results"]
+    assert len(results) == len(CASES)
+    assert all(result["min_us"] > 0 for result in results.values())
+    assert main.CAREER_INDEX is index and main.CAREER_FUZZY is fuzzy
+    assert main.resolve_career("data scientist") == "data scientist"
+    print(f"✅ {len(results)} cases timed, main's catalog restored afterwards")
+
+
+def test_compare_flags_regressions():
+    print("\n🧪 Testing baseline comparison")
+    baseline = {"results": {"skill_gap[skills=5]": {"min_us": 10.0}, "gone": {"min_us": 1.0}}}
+    results = {"results": {"skill_gap[skills=5]": {"min_us": 13.0}, "new": {"min_us": 1.0}}}
+    assert compare(results, baseline, 0.2) == {
+        "skill_gap[skills=5]": {"before_us": 10.0, "after_us": 13.0, "ratio": 1.3, "regressed": True}}
+    assert not compare(results, baseline, 0.5)["skill_gap[skills=5]"]["regressed"]
+    print("✅ 30% slower is a regression at a 20% threshold, not at 50%")
+
+
+if __name__ == "__main__":
+    test_fixtures_parse()
+    test_every_case_runs()
+    test_compare_flags_regressions()
+    print("\n🎉 Hot-path benchmark tests completed!")
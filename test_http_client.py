@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client test
+Checks keep-alive connection reuse and the retry time budget against
+throwaway local servers
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import http_client
+from async_http_client import async_http_get
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 (Retry-After: 30) to the first `failures` calls, then 200; `delay` seconds each."""
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    delay = 0.0
+    calls = 0
+
+    def do_GET(self):
+        FlakyHandler.calls += 1
+        time.sleep(FlakyHandler.delay)
+        if FlakyHandler.calls <= FlakyHandler.failures:
+            self.send_response(503)
+            self.send_header("Retry-After", "30" if FlakyHandler.calls > 1 else "0")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"items": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answers 200 after `delay` seconds, tracking the most requests handled at once."""
+    protocol_version = "HTTP/1.1"
+    delay = 0.3
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with SlowHandler.lock:
+            SlowHandler.active += 1
+            SlowHandler.peak = max(SlowHandler.peak, SlowHandler.active)
+        time.sleep(SlowHandler.delay)
+        with SlowHandler.lock:
+            SlowHandler.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connections_are_reused():
+    """Five sequential calls to one host should pay for a single connection"""
+    print("🧪 Testing pooled connection reuse")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/search"
+
+    http_client.close_session()
+    try:
+        for i in range(5):
+            r = http_client.http_get(url, params={"q": f"skill {i}"}, timeout=5)
+            assert r.status_code == 200
+
+        stats = http_client.pool_stats()
+        print(f"📊 Pool stats: {json.dumps(stats)}")
+        assert stats["requests"] == 5
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 4
+        print("✅ Keep-alive connection reused across calls")
+    finally:
+        http_client.close_session()
+        server.shutdown()
+        server.server_close()
+
+
+def test_retries_stay_within_the_call_budget():
+    """A 503 is retried once; a long Retry-After or a slow upstream ends the call at the budget"""
+    print("\n🧪 Testing the retry time budget")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/search"
+    os.environ["HTTP_CALL_BUDGET_SECONDS"] = "1"
+
+    def call(get):
+        FlakyHandler.calls = 0
+        start = time.perf_counter()
+        try:
+            status = get(url, timeout=8).status_code
+        except requests.exceptions.Timeout:
+            status = "timeout"
+        return status, FlakyHandler.calls, time.perf_counter() - start
+
+    def async_get(url, timeout):
+        return asyncio.run(async_http_get(url, timeout=timeout))
+
+    http_client.close_session()
+    try:
+        for get in (http_client.http_get, async_get):
+            FlakyHandler.failures, FlakyHandler.delay = 1, 0.0
+            assert call(get)[:2] == (200, 2)
+            FlakyHandler.failures = 3  # the retry gets Retry-After: 30
+            status, calls, seconds = call(get)
+            assert (status, calls) == (503, 2) and seconds < 1
+            FlakyHandler.failures, FlakyHandler.delay = 0, 3.0
+            status, calls, seconds = call(get)
+            assert status == "timeout" and seconds < 2
+        print("✅ One retry after a 503, no 30s Retry-After wait, slow calls cut at the 1s budget")
+    finally:
+        del os.environ["HTTP_CALL_BUDGET_SECONDS"]
+        http_client.close_session()
+        server.shutdown()
+        server.server_close()
+
+
+def test_connections_per_host_are_capped():
+    """With HTTP_POOL_MAXSIZE=2, six concurrent calls share two connections; a call
+    that can't get one within its budget times out"""
+    print("\n🧪 Testing the per-host connection cap")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/search"
+    os.environ["HTTP_POOL_MAXSIZE"] = "2"
+    SlowHandler.peak = 0
+
+    statuses = []
+    http_client.close_session()
+    try:
+        threads = [threading.Thread(target=lambda: statuses.append(http_client.http_get(url, timeout=5).status_code))
+                   for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = http_client.pool_stats()
+        assert statuses == [200] * 6
+        assert SlowHandler.peak == 2 and stats["new_connections"] == 2
+
+        blockers = [threading.Thread(target=http_client.http_get, args=(url,)) for _ in range(2)]
+        for t in blockers:
+            t.start()
+        time.sleep(0.05)
+        start = time.perf_counter()
+        try:
+            http_client.http_get(url, timeout=0.1)
+            raise AssertionError("expected a timeout")
+        except requests.exceptions.Timeout:
+            waited = time.perf_counter() - start
+        for t in blockers:
+            t.join()
+        assert waited < 0.25
+        print(f"✅ 6 calls over {stats['new_connections']} connections; a call with no free one timed out "
+              f"after {waited * 1000:.0f}ms")
+    finally:
+        del os.environ["HTTP_POOL_MAXSIZE"]
+        http_client.close_session()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_connections_are_reused()
+    test_retries_stay_within_the_call_budget()
+    test_connections_per_host_are_capped()
+    print("\n🎉 HTTP client tests completed!")
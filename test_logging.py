@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Structured logging test
+Checks the JSON log lines, request IDs across fan-out threads, per-key sampling
+and that a full log queue drops records instead of blocking the caller
+"""
+
+import io
+import json
+import logging
+import os
+import queue
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+from structured_logging import (JsonFormatter, NonBlockingQueueHandler, Sampler, flush_logs, get_logger,
+                                reset_request_id, set_request_id)
+
+
+def captured(fn):
+    """Run fn with stdout captured; returns the log lines written meanwhile."""
+    flush_logs()
+    saved, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        fn()
+        flush_logs()
+        return sys.stdout.getvalue().splitlines()
+    finally:
+        sys.stdout = saved
+
+
+def test_json_lines():
+    print("🧪 Testing JSON log lines")
+    log = get_logger("test")
+    formatter = JsonFormatter()
+    record = logging.LogRecord("backend.test", logging.WARNING, __file__, 1, "Found %d videos", (3,), None)
+    record.request_id, record.fields = "abc123", {"provider": "youtube"}
+    entry = json.loads(formatter.format(record))
+    assert entry["severity"] == "WARNING" and entry["message"] == "Found 3 videos"
+    assert entry["request_id"] == "abc123" and entry["provider"] == "youtube"
+
+    def emit():
+        token = set_request_id("req-1")
+        try:
+            log.warning("Quota: %s exhausted", "youtube", provider="youtube")
+        finally:
+            reset_request_id(token)
+
+    lines = captured(emit)
+    print(f"   {lines[-1]}")
+    assert any('"request_id": "req-1"' in line and "Quota: youtube exhausted" in line for line in lines)
+    print("✅ Severity, message, request ID and fields in every line")
+
+
+def test_request_id_reaches_fanout_threads():
+    print("\n🧪 Testing request IDs in fan-out threads")
+    log = get_logger("test")
+
+    def lookup(skill, max_results=3):
+        log.warning("looked up %s", skill)
+        return []
+
+    original = main.PROVIDERS
+    main.PROVIDERS = tuple((field, lookup, fallback) for field, _, fallback in original)
+    app = Flask(__name__)
+    headers = {}
+
+    def run():
+        payload = {"career": "DevOps", "known_skills": ["logging-test"]}
+        with app.test_request_context("/", method="POST", json=payload, headers={"X-Request-ID": "trace-42"}):
+            main.invalidate_response_cache()
+            headers.update(main.career_playlist(request)[2])
+
+    try:
+        lines = [line for line in captured(run) if "looked up" in line]
+    finally:
+        main.PROVIDERS = original
+    assert headers["X-Request-ID"] == "trace-42"
+    assert lines and all('"request_id": "trace-42"' in line for line in lines)
+    print(f"✅ {len(lines)} lookup lines from pool threads carry the caller's X-Request-ID")
+
+
+def test_sampling():
+    print("\n🧪 Testing per-key sampling")
+    sampler = Sampler(every=10)
+    kept = [sampler.take("youtube.found") for _ in range(25)]
+    other = sampler.take("books.found")
+    assert sum(kept) == 3 and kept[0] and other
+    assert sampler.sampled_out == 22
+    print("✅ 1 in 10 per key, first occurrence always written")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    print("\n🧪 Testing a full log queue")
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.Logger("blocked")
+    logger.addHandler(handler)
+    start = time.perf_counter()
+    for i in range(100):
+        logger.warning("line %d", i)
+    elapsed = time.perf_counter() - start
+    assert handler.queue.qsize() == 1 and handler.dropped == 99
+    assert elapsed < 0.5
+    print(f"✅ 99 records dropped in {elapsed * 1000:.1f}ms without waiting for the writer")
+
+
+if __name__ == "__main__":
+    test_json_lines()
+    test_request_id_reaches_fanout_threads()
+    test_sampling()
+    test_full_queue_drops_instead_of_blocking()
+    print("\n🎉 Structured logging tests completed!")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Metrics test
+Checks the Prometheus text output, per-request Server-Timing headers (including
+spans recorded on fan-out threads) and that a disabled registry records nothing
+"""
+
+import contextvars
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+from metrics import Metrics
+
+
+def test_render_format():
+    print("🧪 Testing Prometheus text format")
+    registry = Metrics()
+    hits = registry.counter("hits_total", "Hits", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    hits.inc('/"x"')
+    hits.inc('/"x"', amount=2)
+    latency.observe(0.05, "fanout")
+    latency.observe(0.5, "fanout")
+    latency.observe(3.0, "fanout")
+    text = registry.render()
+    print(text)
+    assert '# TYPE hits_total counter' in text
+    assert 'hits_total{route="/\\"x\\""} 3' in text
+    assert 'latency_seconds_bucket{stage="fanout",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="fanout",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{stage="fanout",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="fanout"} 3' in text
+    print("✅ Counters, cumulative buckets and escaped labels")
+
+
+def test_spans_from_threads_reach_request():
+    print("\n🧪 Testing spans recorded on worker threads")
+    registry = Metrics()
+    stage = registry.histogram("stage_seconds", "Stage", ("stage",))
+
+    def lookup():
+        with registry.span(stage, "youtube"):
+            pass
+
+    with registry.request() as timings:
+        # Fan-out threads run in a copy of the request's context, as main.py submits them
+        workers = [threading.Thread(target=contextvars.copy_context().run, args=(lookup,)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    header = timings.header()
+    print(f"   Server-Timing: {header}")
+    assert header.startswith('youtube;dur=') and 'desc="3 calls"' in header and "total;dur=" in header
+    print("✅ Three thread spans folded into one Server-Timing entry")
+
+
+def test_playlist_server_timing_and_endpoint():
+    print("\n🧪 Testing Server-Timing on playlists and GET /metrics")
+    app = Flask(__name__)
+    payload = {"career": "DevOps", "known_skills": ["Docker"]}
+    main.invalidate_response_cache()
+    with app.test_request_context("/", method="POST", json=payload):
+        _, status, miss = main.career_playlist(request)
+    with app.test_request_context("/", method="POST", json=payload):
+        _, _, hit = main.career_playlist(request)
+    with app.test_request_context("/metrics", method="GET"):
+        text, metrics_status, headers = main.career_playlist(request)
+    print(f"   miss: {miss['Server-Timing']}")
+    print(f"   hit:  {hit['Server-Timing']}")
+    assert status == 200 and "fanout;dur=" in miss["Server-Timing"]
+    assert hit["Server-Timing"].startswith("cache;dur=0.0")
+    assert metrics_status == 200 and headers["Content-Type"].startswith("text/plain")
+    assert 'playlist_request_seconds_count{cache="hit"}' in text
+    assert 'playlist_stage_seconds_count{stage="fanout"}' in text
+    assert 'cache_hits_total{cache="response"}' in text
+    assert 'circuit_breaker_open{provider="youtube"} 0' in text
+    print("✅ Server-Timing header set and stage histograms exported")
+
+
+def test_provider_cache_hits_exported():
+    print("\n🧪 Testing provider cache counters in /metrics")
+    cache = main.PROVIDER_CACHES["youtube"]
+    key = main.provider_cache_key("metrics-test skill", 3)
+    before = cache.stats()["hits"]
+    cache.set(key, [{"title": "cached"}])
+    try:
+        assert cache.get_entry(key)[0] == [{"title": "cached"}]
+    finally:
+        cache.delete(key)
+    app = Flask(__name__)
+    with app.test_request_context("/metrics", method="GET"):
+        text, _, _ = main.career_playlist(request)
+    assert f'cache_hits_total{{cache="youtube"}} {before + 1}' in text
+    print(f"✅ Memory-tier hit counted: cache_hits_total{{cache=\"youtube\"}} {before + 1}")
+
+
+def test_disabled_registry_is_noop():
+    print("\n🧪 Testing METRICS=0")
+    registry = Metrics(enabled=False)
+    counter = registry.counter("calls_total", "Calls")
+    stage = registry.histogram("stage_seconds", "Stage", ("stage",))
+    with registry.request() as timings:
+        with registry.span(stage, "vertex"):
+            counter.inc()
+    assert timings is None
+    assert "\ncalls_total " not in registry.render() and "_count" not in registry.render()
+
+    original = main.METRICS.enabled
+    main.METRICS.enabled = False
+    try:
+        app = Flask(__name__)
+        with app.test_request_context("/metrics", method="GET"):
+            body, status, _ = main.career_playlist(request)
+        with app.test_request_context("/", method="POST", json={"career": "DevOps"}):
+            _, _, headers = main.career_playlist(request)
+    finally:
+        main.METRICS.enabled = original
+    assert status == 404 and "disabled" in json.loads(body)["error"]
+    assert "Server-Timing" not in headers
+    print("✅ Nothing recorded, no header, /metrics answers 404")
+
+
+if __name__ == "__main__":
+    test_render_format()
+    test_spans_from_threads_reach_request()
+    test_playlist_server_timing_and_endpoint()
+    test_provider_cache_hits_exported()
+    test_disabled_registry_is_noop()
+    print("\n🎉 Metrics tests completed!")
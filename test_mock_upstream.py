@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Mock upstream and load harness test
+Checks that the mock upstream is deterministic, that its answers (including
+quota 403s and Vertex predictions) parse like Google's, and that the load
+harness keeps to its request schedule
+"""
+
+import os
+import random
+import sys
+import time
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "backend"))
+sys.path.insert(0, os.path.join(HERE, "benchmarks"))
+
+import main
+from load_test import drive, summarize_ms
+from mock_upstream import EndpointProfile, LatencySpec, MockUpstream
+from vertex_client import RestTextModel, VertexModelHolder
+
+
+def test_same_seed_same_behaviour():
+    print("🧪 Testing mock determinism")
+    profile = EndpointProfile(latency="lognormal:80,0.5", error_rate=0.3, quota_rate=0.1)
+    runs = []
+    for _ in range(2):
+        mock = MockUpstream({"books": profile}, seed=42)
+        runs.append([mock.decide("books") for _ in range(50)])
+        mock.stop()
+    other = MockUpstream({"books": profile}, seed=43)
+    different = [other.decide("books") for _ in range(50)]
+    other.stop()
+    statuses = [status for _, status in runs[0]]
+    print(f"   statuses: 200 x{statuses.count(200)}, 503 x{statuses.count(503)}, 403 x{statuses.count(403)}")
+    assert runs[0] == runs[1] and runs[0] != different
+    assert {200, 503, 403} <= set(statuses)
+    assert LatencySpec("uniform:10,20").sample(random.Random(1)) <= 0.02
+    print("✅ Same seed, same latencies and errors")
+
+
+def test_responses_parse_like_google():
+    print("\n🧪 Testing mock responses against the provider parsers")
+    profiles = {"youtube": EndpointProfile(latency="0", quota_calls=1), "books": EndpointProfile(latency="0")}
+    with MockUpstream(profiles) as mock:
+        env = mock.env()
+        videos = main.parse_youtube_response(
+            requests.get(env["YOUTUBE_SEARCH_URL"], params={"q": "Python tutorial", "maxResults": 3}), "Python")
+        books = main.parse_books_response(
+            requests.get(env["BOOKS_VOLUMES_URL"], params={"q": "SQL guide", "maxResults": 2}), "SQL")
+        certifications = main.parse_certifications_response(
+            requests.get(env["KNOWLEDGE_GRAPH_SEARCH_URL"], params={"query": "AWS certification", "limit": 6}), "AWS", 3)
+        try:
+            main.parse_youtube_response(requests.get(env["YOUTUBE_SEARCH_URL"], params={"q": "Go"}), "Go")
+        except main.ProviderError as e:
+            quota_error = e
+        stats = mock.stats()
+    assert len(videos) == 3 and videos[0]["url"].startswith("https://www.youtube.com/watch?v=")
+    assert len(books) == 2 and len(certifications) == 3
+    assert quota_error.status == 403 and quota_error.quota_exceeded
+    assert stats["youtube"] == {"calls": 2, "statuses": {"200": 1, "403": 1}}
+    print("✅ Videos, books and certifications parsed; the second YouTube call hit the quota")
+
+
+def test_vertex_predict():
+    print("\n🧪 Testing the mock Vertex endpoint")
+    with MockUpstream({"vertex": EndpointProfile(latency="0")}) as mock:
+        holder = VertexModelHolder("mock", "us-central1", library_available=False)
+        holder.set_factory(lambda: RestTextModel(mock.env()["VERTEX_PREDICT_URL"]))
+        first = holder.predict("List 5 essential skills required to become a Beekeeper.", max_output_tokens=256)
+        second = holder.predict("List 5 essential skills required to become a Beekeeper.", max_output_tokens=256)
+    print(f"   {first.text}")
+    assert first.text == second.text and first.text.startswith("[")
+    print("✅ Deterministic JSON array of skills")
+
+
+def test_drive_keeps_schedule():
+    print("\n🧪 Testing the fixed-RPS driver")
+
+    class SlowTarget:
+        def send(self, payload):
+            time.sleep(0.1)
+            return 200
+
+    marks = []
+    start = time.perf_counter()
+    run = drive(SlowTarget(), [{}] * 30, rps=50, warmup=0.2, max_inflight=16, on_measure_start=lambda: marks.append(1))
+    elapsed = time.perf_counter() - start
+    latency = summarize_ms([latency for latency, _, _ in run["results"]])
+    print(f"   {len(run['results'])} measured in {elapsed:.2f}s, p50 {latency['p50']}ms")
+    assert len(run["results"]) == 20 and marks == [1]
+    # Open loop: 30 requests at 50/s take ~0.6s plus one response, not 30 x 100ms
+    assert elapsed < 1.5 and 95 <= latency["p50"] < 300
+    print("✅ Requests sent on schedule while earlier ones were still running")
+
+
+if __name__ == "__main__":
+    test_same_seed_same_behaviour()
+    test_responses_parse_like_google()
+    test_vertex_predict()
+    test_drive_keeps_schedule()
+    print("\n🎉 Mock upstream tests completed!")
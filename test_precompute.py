@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Precompute job test
+Runs the job against fake providers in a temporary directory
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from precompute import load_precomputed, run_precompute
+
+CATALOG = {
+    "data scientist": ["Python", "SQL", "Statistics"],
+    "data analyst": ["SQL", "Excel", "python"],
+}
+
+
+class QuotaError(Exception):
+    quota_exceeded = True
+
+
+def fake_fetch(calls, fail_after=None):
+    def fetch(skill, max_results):
+        if fail_after is not None and len(calls) >= fail_after:
+            raise QuotaError("quota exceeded")
+        calls.append(skill)
+        return [{"title": f"{skill} {i}", "url": "https://example.com"} for i in range(max_results)]
+    return fetch
+
+
+def test_unique_skills_rate_limited():
+    print("🧪 Testing precompute run")
+    calls, sleeps = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "precomputed.json.gz")
+        complete = run_precompute(CATALOG, {"youtube": fake_fetch(calls)}, output, rate=10, sleep=sleeps.append)
+        precomputed = load_precomputed(output)
+        assert not os.path.exists(output + ".checkpoint")
+
+    assert complete
+    assert calls == ["Python", "SQL", "Statistics", "Excel"]  # "python" is the same skill
+    assert len(sleeps) == 3 and all(0 <= s <= 0.1 for s in sleeps)
+    assert precomputed.get("youtube", "PYTHON", 2) == [{"title": "Python 0", "url": "https://example.com"},
+                                                        {"title": "Python 1", "url": "https://example.com"}]
+    assert precomputed.get("youtube", "Rust") is None
+    assert precomputed.get("books", "Python") is None
+    print(f"✅ {len(calls)} unique lookups, {precomputed.stats()}")
+
+
+def test_resume_after_quota_stop():
+    print("\n🧪 Testing resumable checkpoints")
+    first, second = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "precomputed.json.gz")
+        quota = lambda e: getattr(e, "quota_exceeded", False)
+        assert not run_precompute(CATALOG, {"books": fake_fetch(first, fail_after=2)}, output,
+                                  rate=0, quota_error=quota)
+        assert os.path.exists(output + ".checkpoint")
+        assert len(load_precomputed(output)) == 2
+
+        assert run_precompute(CATALOG, {"books": fake_fetch(second)}, output, rate=0, quota_error=quota)
+        precomputed = load_precomputed(output)
+
+    assert first == ["Python", "SQL"] and second == ["Statistics", "Excel"]
+    assert len(precomputed) == 4 and precomputed.complete
+    print("✅ Second run fetched only what the first one missed")
+
+
+def test_playlist_serves_from_artifact():
+    print("\n🧪 Testing lookups served from the artifact")
+    upstream = []
+
+    def fail_get(url, params=None, timeout=8):
+        upstream.append(url)
+        raise AssertionError("should not go upstream")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "precomputed.json.gz")
+        run_precompute(CATALOG, {"youtube": fake_fetch([])}, output, rate=0)
+        original = (main.PRECOMPUTED, main.http_get, main.YOUTUBE_API_KEY)
+        main.PRECOMPUTED, main.http_get, main.YOUTUBE_API_KEY = load_precomputed(output), fail_get, "test-key"
+        try:
+            videos = main.get_youtube_links("Statistics")
+            stats = main.PRECOMPUTED.stats()
+        finally:
+            main.PRECOMPUTED, main.http_get, main.YOUTUBE_API_KEY = original
+
+    assert upstream == []
+    assert videos[0]["title"] == "Statistics 0"
+    assert stats["hits"] == 1
+    print("✅ Catalog skill answered without an upstream call")
+
+
+def test_old_artifacts_are_ignored():
+    print("\n🧪 Testing artifact max age")
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "precomputed.json.gz")
+        run_precompute(CATALOG, {"youtube": fake_fetch([])}, output, rate=0)
+        assert len(load_precomputed(output, max_age=3600)) == 4
+        assert len(load_precomputed(output, max_age=1e-9)) == 0
+        assert len(load_precomputed(os.path.join(tmp, "missing.json.gz"))) == 0
+    print("✅ Missing or stale artifacts fall back to live lookups")
+
+
+if __name__ == "__main__":
+    test_unique_skills_rate_limited()
+    test_resume_after_quota_stop()
+    test_playlist_serves_from_artifact()
+    test_old_artifacts_are_ignored()
+    print("\n🎉 Precompute tests completed!")
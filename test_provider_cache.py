@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Provider cache test
+Checks the LRU/TTL memory tier, the SQLite disk tier and provider lookups
+(no server or API keys needed - upstream calls are faked)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from cache import SQLiteCache, TTLCache, TieredCache
+from quota import ProviderBudget, QuotaManager
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+
+def test_memory_tier_lru_and_ttl():
+    print("🧪 Testing memory tier eviction and expiry")
+    cache = TTLCache(max_entries=2)
+    cache.set("a", [1], ttl=60)
+    cache.set("b", [2], ttl=60)
+    cache.get("a")
+    cache.set("c", [3], ttl=60)
+    assert cache.get("b") is None  # least recently used was evicted
+    assert cache.get("a") == [1]
+    cache.set("d", [4], ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1
+    print(f"✅ Memory tier stats: {stats}")
+
+
+def test_disk_tier_survives_restart():
+    print("\n🧪 Testing disk tier persistence")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        first = TieredCache(60, TTLCache(), SQLiteCache(path, "youtube"))
+        first.set("python|3", [{"title": "Python"}])
+
+        restarted = TieredCache(60, TTLCache(), SQLiteCache(path, "youtube"))
+        assert restarted.get("python|3") == [{"title": "Python"}]
+        assert restarted.memory.get("python|3") == [{"title": "Python"}]  # promoted
+        assert TieredCache(60, TTLCache(), SQLiteCache(path, "books")).get("python|3") is None
+        restarted.disk._conn.close()
+        first.disk._conn.close()
+    print("✅ Disk tier answers after a restart, namespaced per provider")
+
+
+def test_lookups_hit_cache():
+    print("\n🧪 Testing cached YouTube lookups")
+    calls = []
+
+    def fake_get(url, params=None, timeout=8):
+        calls.append(params["q"])
+        return FakeResponse({"items": [
+            {"id": {"videoId": "abc"}, "snippet": {"title": "Python in 10 minutes", "thumbnails": {}}}
+        ]})
+
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = fake_get, "test-key", QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    main.PROVIDER_CACHES["youtube"].clear()
+    try:
+        first = main.get_youtube_links("Python")
+        second = main.get_youtube_links("  python ")
+        other_size = main.get_youtube_links("Python", max_results=5)
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+        main.PROVIDER_CACHES["youtube"].clear()
+
+    assert first == second
+    assert first[0]["url"] == "https://www.youtube.com/watch?v=abc"
+    assert len(calls) == 2  # "Python" once, plus the max_results=5 variant
+    assert other_size == first
+    print(f"✅ {len(calls)} upstream calls for 3 lookups")
+
+
+def test_failures_are_not_cached():
+    print("\n🧪 Testing fallback results are not cached")
+    main.PROVIDER_CACHES["books"].clear()
+    original_key = main.GOOGLE_BOOKS_API_KEY
+    main.GOOGLE_BOOKS_API_KEY = None
+    try:
+        books = main.get_google_books("SQL")
+    finally:
+        main.GOOGLE_BOOKS_API_KEY = original_key
+    assert books == main.get_books_fallback("SQL")
+    assert len(main.PROVIDER_CACHES["books"].memory) == 0
+    print("✅ Fallback links served without polluting the cache")
+
+
+if __name__ == "__main__":
+    test_memory_tier_lru_and_ttl()
+    test_disk_tier_survives_restart()
+    test_lookups_hit_cache()
+    test_failures_are_not_cached()
+    print("\n🎉 Provider cache tests completed!")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Quota budget test
+Uses a fake clock for the token bucket, a fake upstream for quota 403s and
+two budgets on one SQLite ledger for workers sharing the quota
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from quota import ProviderBudget, QuotaManager, SQLiteQuotaLedger
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class QuotaResponse:
+    status_code = 403
+
+    def json(self):
+        return {"error": {"message": "The request cannot be completed because you have exceeded your quota."}}
+
+
+def test_burst_then_spread_over_the_day():
+    print("🧪 Testing token bucket admission")
+    clock = FakeClock()
+    budget = ProviderBudget("youtube", daily_units=10000, cost=100, soft_limit=0.9, burst_calls=5, clock=clock)
+    admitted = sum(budget.try_acquire() for _ in range(10))
+    assert admitted == 5  # burst only
+    assert budget.denied_rate == 5
+
+    # Remaining budget is spread over the rest of the quota day
+    seconds_left = budget.stats()["resets_in_seconds"]
+    per_call = seconds_left / ((9000 - 500) / 100)
+    clock.now += per_call * 1.01
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+    print(f"✅ Burst of 5, then one call every {per_call:.0f}s")
+
+
+def test_soft_limit_stops_calls():
+    print("\n🧪 Testing soft limit")
+    clock = FakeClock()
+    budget = ProviderBudget("books", daily_units=10, cost=1, soft_limit=0.5, burst_calls=100, clock=clock)
+    results = [budget.try_acquire() for _ in range(8)]
+    assert results.count(True) == 5
+    assert budget.stats()["denied_budget"] == 3
+    print("✅ Calls refused past 50% of the daily quota")
+
+
+def test_window_reset():
+    print("\n🧪 Testing quota window reset")
+    clock = FakeClock()
+    budget = ProviderBudget("youtube", daily_units=10000, cost=100, clock=clock)
+    budget.mark_exhausted()
+    assert budget.try_acquire() is False
+    clock.now += budget.stats()["resets_in_seconds"] + 1
+    assert budget.try_acquire() is True
+    assert budget.stats()["spent_units"] == 100
+    print("✅ Exhausted flag and spend reset with the new quota day")
+
+
+def test_quota_403_stops_further_calls():
+    print("\n🧪 Testing quota 403 handling")
+    upstream = []
+
+    def quota_get(url, params=None, timeout=8):
+        upstream.append(params["q"])
+        return QuotaResponse()
+
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY = quota_get, "test-key"
+    main.QUOTA = QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    main.PROVIDER_CACHES["youtube"].clear()
+    fallbacks = main.PROVIDER_FALLBACKS._values.get(("youtube", "quota"), 0)
+    try:
+        skills = ["Python", "SQL", "Statistics", "Machine Learning"]
+        results = [main.get_youtube_links(skill) for skill in skills]
+        exhausted = main.QUOTA.is_exhausted("youtube")
+        denied = main.QUOTA.stats()["youtube"]["denied_exhausted"]
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+
+    assert len(upstream) == 1
+    assert exhausted
+    assert denied == 0  # later lookups skip the upstream path before asking the budget
+    assert main.PROVIDER_FALLBACKS._values[("youtube", "quota")] == fallbacks + 3
+    assert results[3] == main.get_youtube_fallback("Machine Learning")
+    print("✅ One 403, then fallback links without calling the API")
+
+
+def test_workers_share_the_ledger():
+    print("\n🧪 Testing a quota shared by two workers")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "quota.db")
+        clock = FakeClock()
+        # One ledger connection per worker process, as after a fork
+        workers = [ProviderBudget("youtube", daily_units=1000, cost=100, soft_limit=1.0, burst_calls=100,
+                                  clock=clock, ledger=SQLiteQuotaLedger(path)) for _ in range(2)]
+        admitted = [sum(worker.try_acquire() for _ in range(8)) for worker in workers]
+        assert admitted == [8, 2]
+        assert workers[1].stats()["denied_budget"] == 6 and workers[0].stats()["spent_units"] == 800
+
+        clock.now += workers[0].stats()["resets_in_seconds"] + 1
+        assert workers[0].try_acquire() is True
+        workers[0].mark_exhausted()
+        assert workers[1].try_acquire() is False and workers[1].is_exhausted()
+        assert workers[1].stats()["denied_exhausted"] == 1
+    print("✅ 10 calls between both workers per day; one worker's quota 403 stops the other")
+
+
+def test_budget_refusals_are_counted_as_such():
+    print("\n🧪 Testing fallbacks for calls refused by the budget")
+    upstream = []
+
+    class VideosResponse:
+        status_code = 200
+
+        def json(self):
+            return {"items": [{"id": {"videoId": "abc"}, "snippet": {"title": "Intro"}}]}
+
+        def raise_for_status(self):
+            pass
+
+    def videos_get(url, params=None, timeout=8):
+        upstream.append(params["q"])
+        return VideosResponse()
+
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY = videos_get, "test-key"
+    main.QUOTA = QuotaManager([ProviderBudget("youtube", daily_units=200, cost=100, soft_limit=1.0)])
+    main.PROVIDER_CACHES["youtube"].clear()
+    fallbacks = {reason: main.PROVIDER_FALLBACKS._values.get(("youtube", reason), 0)
+                 for reason in ("error", "quota_budget")}
+    try:
+        results = [main.get_youtube_links(skill) for skill in ("Go", "Rust", "Zig", "Nim")]
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+
+    assert len(upstream) == 2
+    assert results[3] == main.get_youtube_fallback("Nim")
+    assert main.PROVIDER_FALLBACKS._values[("youtube", "quota_budget")] == fallbacks["quota_budget"] + 2
+    assert main.PROVIDER_FALLBACKS._values.get(("youtube", "error"), 0) == fallbacks["error"]
+    print("✅ Two calls, then two fallbacks counted as quota_budget, not error")
+
+
+if __name__ == "__main__":
+    test_burst_then_spread_over_the_day()
+    test_soft_limit_stops_calls()
+    test_window_reset()
+    test_quota_403_stops_further_calls()
+    test_workers_share_the_ledger()
+    test_budget_refusals_are_counted_as_such()
+    print("\n🎉 Quota tests completed!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Whole-response cache test for career_playlist
+Calls the function directly with Flask request contexts (no server needed)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+from precompute import PrecomputedResources
+from skills_store import LearnedSkills, MemorySkillsStore
+
+app = Flask(__name__)
+
+
+def post(payload, headers=None):
+    with app.test_request_context("/", method="POST", json=payload, headers=headers or {}):
+        return main.career_playlist(request)
+
+
+def counting_fanout(calls):
+    original = main.fetch_skill_resources
+
+    def fanout(skills, deadline=None):
+        calls.append(list(skills))
+        return original(skills, deadline)
+    return fanout
+
+
+def test_repeat_requests_skip_the_pipeline():
+    print("🧪 Testing response cache hits")
+    calls = []
+    original = main.fetch_skill_resources
+    main.fetch_skill_resources = counting_fanout(calls)
+    main.invalidate_response_cache()
+    try:
+        body1, status1, headers1 = post({"career": "Data Scientist", "known_skills": ["Python", "SQL"]})
+        body2, status2, headers2 = post({"career": "data scientist", "known_skills": ["sql", "PYTHON"]})
+    finally:
+        main.fetch_skill_resources = original
+
+    assert status1 == status2 == 200
+    assert len(calls) == 1
+    first, second = json.loads(body1), json.loads(body2)
+    assert first["career"] == "Data Scientist" and second["career"] == "data scientist"
+    assert second["known_skills"] == ["sql", "PYTHON"]
+    assert first["skills_to_learn"] == second["skills_to_learn"]
+    assert headers1["ETag"] != headers2["ETag"]  # different echo, different representation
+    print("✅ Second request served from cache with its own career/known_skills echo")
+
+
+def test_cached_body_matches_uncached_serialization():
+    print("\n🧪 Testing cached body is byte-identical JSON")
+    main.invalidate_response_cache()
+    payload = {"career": "DevOps", "known_skills": ["Linux"]}
+    body, _, _ = post(payload)
+    cached_body, _, _ = post(payload)
+    assert body == cached_body
+    assert body == json.dumps(json.loads(body))
+    print("✅ Cached response matches json.dumps output")
+
+
+def test_if_none_match_returns_304():
+    print("\n🧪 Testing ETag revalidation")
+    main.invalidate_response_cache()
+    payload = {"career": "Web Developer", "known_skills": []}
+    _, _, headers = post(payload)
+    body, status, _ = post(payload, {"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == ""
+    _, status, _ = post(payload, {"If-None-Match": '"stale"'})
+    assert status == 200
+    print("✅ Matching If-None-Match answered with 304")
+
+
+def test_invalidation():
+    print("\n🧪 Testing explicit invalidation")
+    calls = []
+    original = main.fetch_skill_resources
+    main.fetch_skill_resources = counting_fanout(calls)
+    main.invalidate_response_cache()
+    try:
+        post({"career": "Chef"})
+        main.invalidate_response_cache()
+        post({"career": "Chef"})
+    finally:
+        main.fetch_skill_resources = original
+    assert len(calls) == 2
+    print("✅ Invalidation forces a rebuild")
+
+
+def test_skill_table_changes_invalidate():
+    print("\n🧪 Testing invalidation on skill table changes")
+    calls = []
+    original = (main.fetch_skill_resources, main.PRECOMPUTED, main.LEARNED_SKILLS)
+    main.fetch_skill_resources = counting_fanout(calls)
+    main.LEARNED_SKILLS = LearnedSkills(MemorySkillsStore(), ttl=3600, on_write=main.LEARNED_SKILLS.on_write)
+    main.invalidate_response_cache()
+    try:
+        post({"career": "Chef"})
+        main.LEARNED_SKILLS.get("puppeteer", lambda: ["Marionettes"])
+        post({"career": "Chef"})
+        main.PRECOMPUTED = PrecomputedResources()
+        main.warm_precomputed()
+        post({"career": "Chef"})
+        post({"career": "Chef"})
+    finally:
+        main.fetch_skill_resources, main.PRECOMPUTED, main.LEARNED_SKILLS = original
+    assert len(calls) == 3
+    print("✅ Stored Vertex skills and a precomputed reload both force a rebuild")
+
+
+if __name__ == "__main__":
+    test_repeat_requests_skip_the_pipeline()
+    test_cached_body_matches_uncached_serialization()
+    test_if_none_match_returns_304()
+    test_invalidation()
+    test_skill_table_changes_invalidate()
+    print("\n🎉 Response cache tests completed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Production serving test
+Drives the ASGI app directly (no server needed) and checks the gunicorn settings
+"""
+
+import asyncio
+import json
+import os
+import runpy
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND)
+
+import main
+from asgi import app
+from refresher import BackgroundRefresher
+
+
+def call(method, path, payload=None, headers=None, query=""):
+    """One request through the ASGI app; returns (status, headers, [body chunks])."""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+        "root_path": "", "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in
+                    {"content-type": "application/json", **(headers or {})}.items()],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    response_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    chunks = [m["body"] for m in sent[1:] if m.get("body")]
+    return start["status"], response_headers, chunks
+
+
+def test_asgi_playlist():
+    print("🧪 Testing playlist over ASGI")
+    main.invalidate_response_cache()
+    status, headers, chunks = call("POST", "/", {"career": "DevOps", "known_skills": ["Linux"]})
+    data = json.loads(b"".join(chunks))
+    assert status == 200 and headers["content-type"] == "application/json"
+    assert headers["access-control-allow-origin"] == "*" and "etag" in headers
+    assert data["career"] == "DevOps" and "Linux" not in [s["skill"] for s in data["skills_to_learn"]]
+
+    status, _, _ = call("POST", "/", {"career": "DevOps", "known_skills": ["Linux"]},
+                        headers={"If-None-Match": headers["etag"]})
+    assert status == 304
+    print(f"✅ {len(data['skills_to_learn'])} skills, ETag revalidation answered 304")
+
+
+def test_asgi_stream_is_chunked():
+    print("\n🧪 Testing NDJSON stream over ASGI")
+    main.invalidate_response_cache()
+    status, headers, chunks = call("POST", "/", {"career": "Data Scientist", "known_skills": []}, query="stream=ndjson")
+    events = [json.loads(chunk) for chunk in chunks]
+    assert status == 200 and headers["content-type"] == "application/x-ndjson"
+    assert events[0]["event"] == "career" and events[-1]["event"] == "done"
+    assert len(chunks) == len(events[0]["skills"]) + 2  # one body message per event
+    print(f"✅ {len(chunks)} events sent as separate chunks")
+
+
+def test_asgi_routes():
+    print("\n🧪 Testing OPTIONS, /stats, /ready and /batch")
+    status, headers, _ = call("OPTIONS", "/")
+    assert status == 200 and "POST" in headers["access-control-allow-methods"]
+    status, _, chunks = call("GET", "/stats")
+    assert status == 200 and "breakers" in json.loads(b"".join(chunks))
+    status, _, _ = call("GET", "/ready")
+    assert status in (200, 503)
+    status, _, chunks = call("POST", "/batch", {"careers": ["DevOps", "Nurse"]})
+    assert status == 200 and json.loads(b"".join(chunks))["total_careers"] == 2
+    status, _, _ = call("POST", "/batch", {"careers": []})
+    assert status == 400
+    print("✅ Same endpoints and status codes as the Flask server")
+
+
+def test_refresher_shutdown():
+    print("\n🧪 Testing refresher shutdown")
+    refresher = BackgroundRefresher(max_workers=1)
+    refresher.shutdown()
+    assert refresher.submit("key", lambda: None) is False
+    print("✅ No refreshes are scheduled once shutdown has begun")
+
+
+def test_gunicorn_settings():
+    print("\n🧪 Testing gunicorn.conf.py")
+    env = {"PORT": "9000", "WEB_CONCURRENCY": "3", "SERVER_THREADS": "8", "KEEP_ALIVE": "20",
+           "GRACEFUL_TIMEOUT": "10", "SERVER_WORKER_CLASS": "asgi"}
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    try:
+        conf = runpy.run_path(os.path.join(BACKEND, "gunicorn.conf.py"))
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k)
+            else:
+                os.environ[k] = v
+    assert conf["bind"] == "0.0.0.0:9000" and conf["workers"] == 3 and conf["threads"] == 8
+    assert conf["keepalive"] == 20 and conf["graceful_timeout"] == 10
+    assert conf["wsgi_app"] == "asgi:app" and conf["worker_class"] == "uvicorn_worker.UvicornWorker"
+    assert conf["preload_app"] is False
+    print("✅ Workers, threads, keep-alive and worker class come from the environment")
+
+
+if __name__ == "__main__":
+    test_asgi_playlist()
+    test_asgi_stream_is_chunked()
+    test_asgi_routes()
+    test_refresher_shutdown()
+    test_gunicorn_settings()
+    print("\n🎉 Serving tests completed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Request coalescing test
+Fires identical lookups concurrently against a slow fake upstream
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from quota import ProviderBudget, QuotaManager
+from singleflight import SingleFlight
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"items": [{"id": {"videoId": "go1"}, "snippet": {"title": "Go basics", "thumbnails": {}}}]}
+
+    def raise_for_status(self):
+        pass
+
+
+def run_concurrently(target, count=20):
+    results = []
+    barrier = threading.Barrier(count)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(target())
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_identical_calls_share_one_execution():
+    print("🧪 Testing single flight")
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "done"
+
+    results = run_concurrently(lambda: flight.do("key", slow))
+    assert results == ["done"] * 20
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 19
+    print(f"✅ 20 callers, 1 execution ({flight.stats()})")
+
+
+def test_errors_reach_every_waiter():
+    print("\n🧪 Testing shared failures")
+    flight = SingleFlight()
+
+    def broken():
+        time.sleep(0.1)
+        raise ValueError("upstream down")
+
+    results = run_concurrently(lambda: flight.do("key", broken), count=5)
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["in_flight"] == 0
+    print("✅ Every waiter saw the leader's exception")
+
+
+def test_provider_lookups_are_coalesced():
+    print("\n🧪 Testing coalesced YouTube lookups")
+    upstream = []
+
+    def slow_get(url, params=None, timeout=8):
+        upstream.append(params["q"])
+        time.sleep(0.2)
+        return FakeResponse()
+
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = slow_get, "test-key", QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    main.PROVIDER_CACHES["youtube"].clear()
+    try:
+        results = run_concurrently(lambda: main.get_youtube_links("Go"))
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.QUOTA = original
+        main.PROVIDER_CACHES["youtube"].clear()
+
+    assert len(upstream) == 1
+    assert all(r[0]["url"] == "https://www.youtube.com/watch?v=go1" for r in results)
+    print(f"✅ 20 concurrent lookups, {len(upstream)} upstream call")
+
+
+if __name__ == "__main__":
+    test_identical_calls_share_one_execution()
+    test_errors_reach_every_waiter()
+    test_provider_lookups_are_coalesced()
+    print("\n🎉 Coalescing tests completed!")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Canonical skill ID test
+Checks that skill spellings and aliases ("ML", "machine learning") share an ID,
+that the skill gap and response cache compare skills by ID, and that the skill
+aliases travel from catalog.json through the snapshot
+"""
+
+import json
+import os
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND)
+
+from flask import Flask, request
+
+import main
+from skill_index import SkillIndex
+from snapshot import load_catalog
+
+app = Flask(__name__)
+
+
+def test_spellings_share_an_id():
+    print("🧪 Testing canonical skill IDs")
+    index = SkillIndex(["Machine Learning", "JavaScript", "SQL", "sql"], {"ML": "Machine Learning", "JS": "JavaScript"})
+    assert len(index) == 3
+    assert index.key("ML") == index.key("machine  learning") == index.key("MACHINE LEARNING") == 0
+    assert index.key("js") == index.key("JavaScript") == 1
+    assert index.key("Rust") == "rust" and len(index) == 3  # unknown names don't grow the table
+    assert index.canonical("ml") == "machine learning"
+    assert index.gap(["Machine Learning", "SQL", "JavaScript", "Rust"], ["ml", "js", "RUST"]) == ["SQL"]
+    print("✅ Case, whitespace and aliases fold to one ID; unknown skills compare by text")
+
+
+def test_catalog_aliases_reach_the_snapshot():
+    print("\n🧪 Testing skill aliases in the catalog snapshot")
+    with open(os.path.join(BACKEND, "catalog.json"), encoding="utf-8") as f:
+        source = json.load(f)
+    catalog = load_catalog(os.path.join(BACKEND, "catalog.snap"), os.path.join(BACKEND, "catalog.json"))
+    assert catalog.skill_aliases == source["skill_aliases"]
+    assert main.skill_gap(main.FALLBACK_SKILLS["data scientist"], ["ML", "python3", "sql"]) == \
+        ["Statistics", "Data Visualization"]
+    print(f"✅ {len(catalog.skill_aliases)} skill aliases loaded; 'ML' and 'python3' close the gap")
+
+
+def test_response_cache_shares_bodies_across_spellings():
+    print("\n🧪 Testing response cache keys by skill ID")
+    assert main.response_cache_key("Data Scientist", ["ML", "JS"]) == \
+        main.response_cache_key("data scientist", ["javascript", "Machine Learning", "ml"])
+    calls = []
+    original = main.fetch_skill_resources
+
+    def fanout(skills, deadline=None):
+        calls.append(list(skills))
+        return original(skills, deadline)
+
+    main.fetch_skill_resources = fanout
+    main.invalidate_response_cache()
+    bodies = []
+    try:
+        for known in (["Machine Learning", "Python"], ["ml", "PY"]):
+            with app.test_request_context("/", method="POST", json={"career": "Data Scientist", "known_skills": known}):
+                body, status, _ = main.career_playlist(request)
+            assert status == 200
+            bodies.append(json.loads(body))
+    finally:
+        main.fetch_skill_resources = original
+    assert len(calls) == 1 and "Machine Learning" not in calls[0]
+    assert bodies[0]["skills_to_learn"] == bodies[1]["skills_to_learn"]
+    assert bodies[1]["known_skills"] == ["ml", "PY"]
+    print("✅ 'ml'/'PY' served from the body cached for 'Machine Learning'/'Python'")
+
+
+if __name__ == "__main__":
+    test_spellings_share_an_id()
+    test_catalog_aliases_reach_the_snapshot()
+    test_response_cache_shares_bodies_across_spellings()
+    print("\n🎉 Skill index tests completed!")
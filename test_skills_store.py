@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Learned skills store test
+Checks persistence, stampede protection and TTL refresh with a fake generator
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from skills_store import LearnedSkills, MemorySkillsStore, SQLiteSkillsStore
+
+
+def slow_generator(calls, skills=("Observability", "Automation"), delay=0.2):
+    def generate():
+        calls.append(1)
+        time.sleep(delay)
+        return list(skills)
+    return generate
+
+
+def run_concurrently(target, count=10):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_first_requests_generate_once():
+    print("🧪 Testing stampede protection in one process")
+    calls = []
+    learned = LearnedSkills(MemorySkillsStore(), ttl=3600)
+    generate = slow_generator(calls)
+    results = run_concurrently(lambda: learned.get("site reliability engineer", generate))
+    assert len(calls) == 1
+    assert all(r == ["Observability", "Automation"] for r in results)
+    print(f"✅ 10 concurrent requests, 1 generation ({learned.stats()})")
+
+
+def test_store_is_shared_and_persistent():
+    print("\n🧪 Testing SQLite store across instances")
+    calls = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skills.db")
+        worker_a = LearnedSkills(SQLiteSkillsStore(path), ttl=3600, wait_timeout=5)
+        worker_b = LearnedSkills(SQLiteSkillsStore(path), ttl=3600, wait_timeout=5)
+        generate = slow_generator(calls, delay=0.5)
+
+        results = []
+        threads = [threading.Thread(target=lambda w=w: results.append(w.get("prompt engineer", generate)))
+                   for w in (worker_a, worker_b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1  # the lease lets only one "process" generate
+        assert results[0] == results[1]
+
+        restarted = LearnedSkills(SQLiteSkillsStore(path), ttl=3600)
+        assert restarted.get("prompt engineer", slow_generator(calls)) == ["Observability", "Automation"]
+        assert len(calls) == 1
+        for w in (worker_a, worker_b, restarted):
+            w.store._conn.close()
+    print("✅ Generated once, reused by other workers and after restart")
+
+
+def test_failed_generation_is_not_stored():
+    print("\n🧪 Testing failed generation")
+    learned = LearnedSkills(MemorySkillsStore(), ttl=3600)
+    assert learned.get("astronaut", lambda: None) is None
+    assert learned.store.get("astronaut") is None
+    print("✅ Nothing stored when Vertex fails")
+
+
+def test_stale_entries_refresh_in_background():
+    print("\n🧪 Testing TTL refresh")
+    calls = []
+    learned = LearnedSkills(MemorySkillsStore(), ttl=0.05)
+    learned.get("florist", slow_generator(calls, skills=["Old"], delay=0))
+    time.sleep(0.1)
+    stale = learned.get("florist", slow_generator(calls, skills=["New"], delay=0.1))
+    assert stale == ["Old"]  # served immediately
+    time.sleep(0.3)
+    assert learned.store.get("florist")[0] == ["New"]
+    assert len(calls) == 2
+    print("✅ Stale skills served while one refresh runs")
+
+
+def test_vertex_is_only_called_once_per_career():
+    print("\n🧪 Testing call_vertex_extract_skills with the store")
+    prompts = []
+
+    class FakeModel:
+        def predict(self, prompt, **kwargs):
+            prompts.append(prompt)
+            return '["Terraform", "Kubernetes"]'
+
+    original_store, original_factory = main.LEARNED_SKILLS, main.VERTEX_MODEL._factory
+    main.LEARNED_SKILLS = LearnedSkills(MemorySkillsStore(), ttl=3600)
+    main.VERTEX_MODEL.set_factory(FakeModel)
+    try:
+        first = main.call_vertex_extract_skills("Platform Reliability Wizard")
+        second = main.call_vertex_extract_skills("platform reliability wizard")
+    finally:
+        main.LEARNED_SKILLS = original_store
+        main.VERTEX_MODEL.set_factory(original_factory)
+    assert first == second == ["Terraform", "Kubernetes"]
+    assert len(prompts) == 1
+    print("✅ Second request answered from the store")
+
+
+if __name__ == "__main__":
+    test_concurrent_first_requests_generate_once()
+    test_store_is_shared_and_persistent()
+    test_failed_generation_is_not_stored()
+    test_stale_entries_refresh_in_background()
+    test_vertex_is_only_called_once_per_career()
+    print("\n🎉 Learned skills store tests completed!")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Catalog snapshot test
+Round-trips careers, aliases and resources through the binary format
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND)
+
+import main
+from precompute import load_precomputed
+from snapshot import Snapshot, build_snapshot, load_catalog, source_digest, write_snapshot
+
+CAREERS = {"zoologist": ["Biology", "Field Work"], "data scientist": ["Python", "SQL"], "ärzt": ["Medizin"]}
+ALIASES = {"zoo": "zoologist", "ds": "data scientist"}
+RESOURCES = {"youtube": {"python": [{"title": "Python", "url": "https://example.com/p", "duration": 95,
+                                     "tags": ["intro"]}]}}
+
+
+def test_round_trip():
+    print("🧪 Testing snapshot round trip")
+    snap = Snapshot(build_snapshot(CAREERS, ALIASES, RESOURCES, meta={"source": "x"}))
+    assert list(snap.careers) == list(CAREERS)  # source order kept
+    assert dict(snap.careers) == CAREERS
+    assert dict(snap.aliases) == ALIASES
+    assert "ärzt" in snap.careers and "doctor" not in snap.careers
+    assert snap.careers.get("missing") is None
+    assert snap.resources["youtube"]["python"] == RESOURCES["youtube"]["python"]
+    assert snap.resources.get("books") is None
+    assert snap.meta == {"source": "x"}
+    print(f"✅ {snap.stats()}")
+
+
+def test_strings_are_interned():
+    print("\n🧪 Testing string interning")
+    careers = {f"career {i}": ["Python", "SQL", "Communication"] for i in range(1000)}
+    data = build_snapshot(careers, {})
+    snap = Snapshot(data)
+    assert snap.stats()["strings"] == 1000 + 3 + 1  # careers, shared skills, meta
+    assert len(data) < len(json.dumps(careers))
+    print(f"✅ 1000 careers in {len(data)} bytes (JSON: {len(json.dumps(careers))})")
+
+
+def test_committed_snapshot_matches_source():
+    print("\n🧪 Testing catalog.snap is up to date")
+    snap = Snapshot.open(os.path.join(BACKEND, "catalog.snap"))
+    with open(os.path.join(BACKEND, "catalog.json"), encoding="utf-8") as f:
+        source = json.load(f)
+    assert snap.meta["source"] == source_digest(os.path.join(BACKEND, "catalog.json"))
+    assert dict(snap.careers) == source["careers"] and dict(snap.aliases) == source["aliases"]
+    assert main.FALLBACK_SKILLS["data scientist"] == source["careers"]["data scientist"]
+    snap.close()
+    print("✅ catalog.snap matches catalog.json (rebuild with `python snapshot.py` if this fails)")
+
+
+def test_stale_snapshot_falls_back_to_source():
+    print("\n🧪 Testing out-of-date snapshot")
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = os.path.join(tmp, "catalog.json"), os.path.join(tmp, "catalog.snap")
+        with open(source, "w") as f:
+            json.dump({"careers": CAREERS, "aliases": ALIASES}, f)
+        write_snapshot(output, source)
+        assert load_catalog(output, source).buf.__class__.__name__ == "mmap"
+        with open(source, "w") as f:
+            json.dump({"careers": {"baker": ["Bread"]}, "aliases": {}}, f)
+        catalog = load_catalog(output, source)
+    assert dict(catalog.careers) == {"baker": ["Bread"]}
+    print("✅ Edited catalog.json wins over an old snapshot")
+
+
+def test_embedded_resources_serve_precomputed_lookups():
+    print("\n🧪 Testing resources embedded in a snapshot")
+    with tempfile.TemporaryDirectory() as tmp:
+        source, artifact = os.path.join(tmp, "catalog.json"), os.path.join(tmp, "precomputed.json.gz")
+        output = os.path.join(tmp, "catalog.snap")
+        with open(source, "w") as f:
+            json.dump({"careers": CAREERS, "aliases": ALIASES}, f)
+        with gzip.open(artifact, "wt") as f:
+            json.dump({"version": 1, "generated_at": 1e12, "complete": True, "max_results": 3,
+                       "resources": RESOURCES}, f)
+        write_snapshot(output, source, artifact)
+        precomputed = load_precomputed(output)
+        assert precomputed.get("youtube", "Python", 1) == RESOURCES["youtube"]["python"]
+        assert precomputed.get("youtube", "Rust") is None
+        assert len(precomputed) == 1
+    print("✅ PRECOMPUTED_PATH can point at a .snap")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_strings_are_interned()
+    test_committed_snapshot_matches_source()
+    test_stale_snapshot_falls_back_to_source()
+    test_embedded_resources_serve_precomputed_lookups()
+    print("\n🎉 Snapshot tests completed!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Stale-while-revalidate test
+Expired provider results are served immediately and refreshed in the background
+"""
+
+import os
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from cache import TTLCache
+from quota import ProviderBudget, QuotaManager
+from refresher import BackgroundRefresher
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, video_id):
+        self.video_id = video_id
+
+    def json(self):
+        return {"items": [{"id": {"videoId": self.video_id}, "snippet": {"title": "Fresh", "thumbnails": {}}}]}
+
+    def raise_for_status(self):
+        pass
+
+
+STALE = [{"title": "Old video", "url": "https://www.youtube.com/watch?v=old"}]
+
+
+def wait_idle(refresher, timeout=2.0):
+    ends = time.monotonic() + timeout
+    while refresher.stats()["pending"] and time.monotonic() < ends:
+        time.sleep(0.01)
+
+
+def with_stale_entry(http_get, quota=None):
+    """Run get_youtube_links twice around a background refresh; returns (first, second, elapsed, stats)."""
+    refresher = BackgroundRefresher(max_workers=1, retry_after=60)
+    original = (main.http_get, main.YOUTUBE_API_KEY, main.REFRESHER, main.QUOTA)
+    main.http_get, main.YOUTUBE_API_KEY, main.REFRESHER = http_get, "test-key", refresher
+    main.QUOTA = quota if quota is not None else QuotaManager([ProviderBudget("youtube", 10000, 100)])
+    cache = main.PROVIDER_CACHES["youtube"]
+    cache.clear()
+    cache.set(main.provider_cache_key("Rust", 3), STALE, ttl=-1)  # expired a second ago
+    try:
+        started = time.perf_counter()
+        first = main.get_youtube_links("Rust")
+        elapsed = time.perf_counter() - started
+        wait_idle(refresher)
+        second = main.get_youtube_links("Rust")
+        stats = refresher.stats()
+    finally:
+        main.http_get, main.YOUTUBE_API_KEY, main.REFRESHER, main.QUOTA = original
+        cache.clear()
+    return first, second, elapsed, stats
+
+
+def test_stale_window():
+    print("🧪 Testing stale window in the memory tier")
+    cache = TTLCache(stale_ttl=60)
+    cache.set("python|3", [1], ttl=-1)
+    assert cache.get("python|3") is None
+    value, remaining = cache.get_entry("python|3")
+    assert value == [1] and remaining <= 0
+    cache.set("sql|3", [2], ttl=-61)
+    assert cache.get_entry("sql|3") is None
+    assert cache.stats()["stale_hits"] == 1
+    print("✅ Expired entries readable via get_entry until the stale window ends")
+
+
+def test_stale_served_while_refreshing():
+    print("\n🧪 Testing background refresh")
+
+    def slow_get(url, params=None, timeout=8):
+        time.sleep(0.2)
+        return FakeResponse("new")
+
+    first, second, elapsed, stats = with_stale_entry(slow_get)
+    assert first == STALE
+    assert elapsed < 0.1
+    assert second[0]["url"] == "https://www.youtube.com/watch?v=new"
+    assert stats["succeeded"] == 1
+    print(f"✅ Stale value in {elapsed * 1000:.1f}ms, fresh value after the refresh")
+
+
+def test_failed_refresh_keeps_last_good_value():
+    print("\n🧪 Testing failed refresh")
+
+    def timeout_get(url, params=None, timeout=8):
+        raise requests.exceptions.Timeout("read timed out")
+
+    first, second, _, stats = with_stale_entry(timeout_get)
+    assert first == second == STALE
+    assert stats["failed"] == 1 and stats["backed_off"] == 1
+    print("✅ Last good value kept; no retry storm after the failure")
+
+
+def test_low_quota_skips_refresh():
+    print("\n🧪 Testing quota-aware refresh")
+    calls = []
+
+    def counting_get(url, params=None, timeout=8):
+        calls.append(url)
+        return FakeResponse("new")
+
+    budget = ProviderBudget("youtube", daily_units=1000, cost=100, soft_limit=1.0)
+    for _ in range(9):
+        budget.try_acquire()  # 10% headroom left, below REFRESH_QUOTA_RESERVE
+    first, second, _, stats = with_stale_entry(counting_get, QuotaManager([budget]))
+    assert first == second == STALE
+    assert calls == [] and stats["scheduled"] == 0
+    print("✅ Refresh skipped when the quota is nearly spent")
+
+
+def test_refresher_dedupes_and_bounds():
+    print("\n🧪 Testing refresher bounds")
+    refresher = BackgroundRefresher(max_workers=1, max_pending=2)
+    release = threading.Event()
+    assert refresher.submit("a", release.wait) is True
+    assert refresher.submit("a", release.wait) is False
+    assert refresher.submit("b", release.wait) is True
+    assert refresher.submit("c", release.wait) is False
+    release.set()
+    wait_idle(refresher)
+    stats = refresher.stats()
+    assert stats["deduplicated"] == 1 and stats["dropped"] == 1 and stats["succeeded"] == 2
+    print(f"✅ {stats}")
+
+
+if __name__ == "__main__":
+    test_stale_window()
+    test_stale_served_while_refreshing()
+    test_failed_refresh_keeps_last_good_value()
+    test_low_quota_skips_refresh()
+    test_refresher_dedupes_and_bounds()
+    print("\n🎉 Stale-while-revalidate tests completed!")
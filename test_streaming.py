@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Streaming response test for career_playlist
+Uses a fake upstream where one skill is slow, so completion order differs from list order
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+
+app = Flask(__name__)
+
+
+def post(payload, path="/", headers=None):
+    with app.test_request_context(path, method="POST", json=payload, headers=headers or {}):
+        return main.career_playlist(request)
+
+
+def slow_first_skill(delays):
+    """Replace the providers with fakes that sleep per skill."""
+    def lookup(skill, max_results=3):
+        time.sleep(delays.get(skill, 0))
+        return [{"title": f"{skill} resource", "url": "https://example.com"}]
+    return tuple((field, lookup, fallback) for field, _, fallback in main.PROVIDERS)
+
+
+def test_ndjson_emits_skills_in_completion_order():
+    print("🧪 Testing NDJSON stream")
+    original = main.PROVIDERS
+    main.PROVIDERS = slow_first_skill({"Python": 0.3})
+    main.invalidate_response_cache()
+    try:
+        started = time.perf_counter()
+        body, status, headers = post({"career": "Data Scientist", "known_skills": []}, path="/?stream=ndjson")
+        lines, first_skill_at = [], None
+        for chunk in body:
+            lines.append(json.loads(chunk))
+            if lines[-1]["event"] == "skill" and first_skill_at is None:
+                first_skill_at = time.perf_counter() - started
+        total = time.perf_counter() - started
+    finally:
+        main.PROVIDERS = original
+
+    assert status == 200 and headers["Content-Type"] == "application/x-ndjson"
+    head, skills, done = lines[0], lines[1:-1], lines[-1]
+    assert head["event"] == "career" and head["skills"] == main.call_vertex_extract_skills("Data Scientist")
+    assert done["event"] == "done"
+    assert sorted(s["index"] for s in skills) == list(range(len(head["skills"])))
+    assert skills[-1]["skill"] == "Python"  # slowest skill arrives last
+    assert first_skill_at < 0.2 < total
+    print(f"✅ First skill after {first_skill_at * 1000:.0f}ms, whole stream {total * 1000:.0f}ms")
+
+
+def test_sse_via_accept_header_and_cache_fill():
+    print("\n🧪 Testing SSE stream and response cache")
+    main.invalidate_response_cache()
+    payload = {"career": "DevOps", "known_skills": ["Linux"]}
+    body, status, headers = post(payload, headers={"Accept": "text/event-stream"})
+    events = "".join(body).strip().split("\n\n")
+    assert headers["Content-Type"] == "text/event-stream"
+    assert events[0].startswith("event: career\ndata: ")
+    assert events[-1] == "event: done\ndata: {}"
+
+    # The finished stream fills the response cache used by the JSON mode
+    streamed = [json.loads(e.split("data: ", 1)[1]) for e in events[1:-1]]
+    cached, _, _ = post(payload)
+    assert len(json.loads(cached)["skills_to_learn"]) == len(streamed)
+    print(f"✅ {len(events)} SSE events; JSON request answered from the cache")
+
+
+def test_plain_requests_are_unchanged():
+    print("\n🧪 Testing non-streaming requests")
+    main.invalidate_response_cache()
+    body, status, headers = post({"career": "DevOps", "known_skills": []})
+    assert headers["Content-Type"] == "application/json"
+    assert "skills_to_learn" in json.loads(body)
+    print("✅ JSON response without the stream flag")
+
+
+if __name__ == "__main__":
+    test_ndjson_emits_skills_in_completion_order()
+    test_sse_via_accept_header_and_cache_fill()
+    test_plain_requests_are_unchanged()
+    print("\n🎉 Streaming tests completed!")
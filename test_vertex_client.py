@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Vertex model holder test
+Uses an injected fake model, so no Google Cloud credentials are needed
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import main
+from skills_store import LearnedSkills, MemorySkillsStore
+from vertex_client import VertexModelHolder
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, text='["Observability", "Incident Response", "Automation"]'):
+        self.text = text
+        self.prompts = []
+
+    def predict(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return FakeResponse(self.text)
+
+
+def test_model_is_built_once():
+    print("🧪 Testing one-time model initialisation")
+    builds = []
+
+    def factory():
+        builds.append(1)
+        return FakeModel()
+
+    holder = VertexModelHolder("project", "us-central1")
+    holder.set_factory(factory)
+    threads = [threading.Thread(target=holder.predict, args=("prompt",)) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    health = holder.health()
+    assert len(builds) == 1
+    assert health["initialized"] and health["predictions"] == 20
+    print(f"✅ 20 concurrent predictions, 1 model build ({health})")
+
+
+def test_failed_init_is_not_retried_immediately():
+    print("\n🧪 Testing init retry backoff")
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise RuntimeError("no credentials")
+
+    holder = VertexModelHolder("project", "us-central1", retry_after=60)
+    holder.set_factory(broken)
+    for _ in range(3):
+        try:
+            holder.predict("prompt")
+        except RuntimeError:
+            pass
+    assert len(attempts) == 1
+    assert holder.health()["last_error"] == "no credentials"
+    assert holder.warm_up() is False
+    print("✅ Failed init is remembered instead of retried per request")
+
+
+def test_extract_skills_uses_shared_model():
+    print("\n🧪 Testing call_vertex_extract_skills with a fake model")
+    fake = FakeModel()
+    original_store, original_factory = main.LEARNED_SKILLS, main.VERTEX_MODEL._factory
+    main.LEARNED_SKILLS = LearnedSkills(MemorySkillsStore(), ttl=3600)
+    main.VERTEX_MODEL.set_factory(lambda: fake)
+    try:
+        skills = main.call_vertex_extract_skills("Quantum Basket Weaver")
+        again = main.call_vertex_extract_skills("Underwater Sommelier")
+    finally:
+        main.LEARNED_SKILLS = original_store
+        main.VERTEX_MODEL.set_factory(original_factory)
+
+    assert skills == ["Observability", "Incident Response", "Automation"]
+    assert again == skills
+    assert len(fake.prompts) == 2
+    print(f"✅ Skills from fake model: {skills}")
+
+
+def test_sdk_is_not_imported_at_startup():
+    print("\n🧪 Testing lazy Vertex SDK import")
+    backend = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+    check = "import sys, main; print('google.cloud.aiplatform' in sys.modules, 'grpc' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", check], cwd=backend, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False False"
+    print("✅ import main leaves google.cloud.aiplatform and grpc unloaded")
+
+
+if __name__ == "__main__":
+    test_model_is_built_once()
+    test_failed_init_is_not_retried_immediately()
+    test_extract_skills_uses_shared_model()
+    test_sdk_is_not_imported_at_startup()
+    print("\n🎉 Vertex client tests completed!")
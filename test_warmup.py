@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Startup warm-up test
+Runs the warm-up steps with a fake preconnect (no network needed), and forks
+after a warm-up the way functions_framework's workers do
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from flask import Flask, request
+
+import main
+from warmup import WarmUp
+
+app = Flask(__name__)
+
+
+def get_ready():
+    with app.test_request_context("/ready", method="GET"):
+        return main.career_playlist(request)
+
+
+def test_steps_run_once_and_failures_are_reported():
+    print("🧪 Testing warm-up steps")
+    calls = []
+    warm = WarmUp()
+    warm.add("ok", lambda: calls.append("ok") or {"n": 1})
+    warm.add("broken", lambda: 1 / 0)
+    warm.add("after", lambda: calls.append("after"))
+    report = warm.run()
+    warm.run()
+    assert calls == ["ok", "after"]
+    assert report["ready"] and report["steps"]["ok"]["detail"] == {"n": 1}
+    assert report["steps"]["broken"]["ok"] is False and "division" in report["steps"]["broken"]["error"]
+    print("✅ Each step ran once; a failing step doesn't block readiness")
+
+
+def test_ready_endpoint_while_pending():
+    print("\n🧪 Testing /ready")
+    release = threading.Event()
+    original = main.WARMUP
+    main.WARMUP = WarmUp()
+    main.WARMUP.add("slow", release.wait)
+    try:
+        assert get_ready()[1] == 200  # no warm-up started: nothing to wait for
+        thread = main.WARMUP.run_in_background()
+        body, status, _ = get_ready()
+        assert status == 503 and json.loads(body)["ready"] is False
+        release.set()
+        thread.join()
+        assert get_ready()[1] == 200
+    finally:
+        main.WARMUP = original
+    print("✅ 503 while warming up, 200 once ready")
+
+
+def test_main_warm_up_preconnects_configured_providers():
+    print("\n🧪 Testing main warm-up steps")
+    hosts = []
+    original = (main.WARMUP, main.preconnect, main.YOUTUBE_API_KEY)
+    main.preconnect = lambda urls: hosts.extend(urls) or {u.split("/")[2]: 0.01 for u in urls}
+    main.YOUTUBE_API_KEY = "test-key"
+    main.WARMUP = WarmUp()
+    for name, fn in original[0].steps:
+        main.WARMUP.add(name, fn)
+    try:
+        report = main.warm_up()
+    finally:
+        main.WARMUP, main.preconnect, main.YOUTUBE_API_KEY = original
+
+    assert all(step["ok"] for step in report["steps"].values())
+    assert main.YOUTUBE_SEARCH_URL in hosts
+    assert report["steps"]["catalog"]["detail"]["careers"] == len(main.FALLBACK_SKILLS)
+    assert report["steps"]["fanout_pool"]["detail"]["workers"] == main.FANOUT_MAX_WORKERS
+    print(f"✅ Ready in {report['seconds']}s: {', '.join(report['steps'])}")
+
+
+def test_server_warm_up_honours_warm_up_off():
+    print("\n🧪 Testing WARM_UP=off for servers")
+    calls = []
+    original = (main.WARMUP, main.WARM_UP_OFF)
+    main.WARMUP = WarmUp()
+    main.WARMUP.add("step", lambda: calls.append("step"))
+    try:
+        main.WARM_UP_OFF = True
+        assert main.server_warm_up() is None and not calls
+        assert get_ready()[1] == 200
+        main.WARM_UP_OFF = False
+        assert main.server_warm_up()["ready"] and calls == ["step"]
+    finally:
+        main.WARMUP, main.WARM_UP_OFF = original
+    print("✅ Servers skip the warm-up with WARM_UP=off and run it otherwise")
+
+
+def test_fork_after_warm_up():
+    print("\n🧪 Testing a worker forked after the warm-up")
+    original = (main.WARMUP, main.preconnect)
+    main.preconnect = lambda urls: {}
+    main.WARMUP = WarmUp()
+    for name, fn in original[0].steps:
+        main.WARMUP.add(name, fn)
+    try:
+        main.warm_up()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Child: the parent's fan-out threads don't exist here
+            main.YOUTUBE_API_KEY = main.GOOGLE_BOOKS_API_KEY = main.GOOGLE_KNOWLEDGE_GRAPH_API_KEY = None
+            start = time.perf_counter()
+            main.fetch_skill_resources(["Python"], deadline=3)
+            os.write(write_end, f"{time.perf_counter() - start:.3f} {main.WARMUP.started}".encode())
+            os._exit(0)
+        os.close(write_end)
+        seconds, warmed = os.read(read_end, 100).decode().split()
+        os.waitpid(pid, 0)
+        os.close(read_end)
+    finally:
+        main.WARMUP, main.preconnect = original
+
+    assert float(seconds) < 1, f"forked worker waited {seconds}s for the fan-out pool"
+    assert warmed == "False"  # the child warms itself up, on its first request
+    print(f"✅ Lookup in the forked worker took {float(seconds) * 1000:.0f}ms")
+
+
+def test_warm_up_waits_for_the_first_request():
+    print("\n🧪 Testing WARM_UP=blocking without a server")
+    calls = []
+    original = (main.WARMUP, main.WARM_UP_MODE)
+    main.WARMUP = WarmUp()
+    main.WARMUP.add("step", lambda: calls.append("step"))
+    try:
+        main.WARM_UP_MODE = "blocking"
+        assert not calls  # nothing ran at import
+        assert get_ready()[1] == 200 and calls == ["step"]
+        get_ready()
+        assert calls == ["step"]
+    finally:
+        main.WARMUP, main.WARM_UP_MODE = original
+    print("✅ The first request runs the warm-up, once")
+
+
+if __name__ == "__main__":
+    test_steps_run_once_and_failures_are_reported()
+    test_ready_endpoint_while_pending()
+    test_main_warm_up_preconnects_configured_providers()
+    test_server_warm_up_honours_warm_up_off()
+    test_fork_after_warm_up()
+    test_warm_up_waits_for_the_first_request()
+    print("\n🎉 Warm-up tests completed!")